@@ -0,0 +1,153 @@
+"""Thread-scaling benchmark for wassima.
+
+Measure how the throughput of the public API scales with the number of
+threads. On a free-threaded interpreter (e.g. CPython 3.13t / 3.14t) the
+lock-free read path should scale close to linearly with the number of cores.
+
+The "stress" scenario hammers every mutating entry point at once
+(``register_ca``, ``set_cache_ttl``) alongside readers and context factories,
+then verify the store is still consistent afterward.
+
+Usage:
+    python bin/benchmark.py
+    python bin/benchmark.py --threads 1,2,4,8,16 --duration 3
+    python bin/benchmark.py --scenario stress
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import threading
+import time
+import typing
+
+import wassima
+
+
+def _gil_status() -> str:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+
+    if is_gil_enabled is None:
+        return "enabled (not a free-threaded build)"
+
+    return "enabled" if is_gil_enabled() else "disabled"
+
+
+def run_scenario(target: typing.Callable[[], object], threads: int, duration: float) -> int:
+    """Hammer ``target`` from ``threads`` threads during ``duration`` seconds.
+    Return the total amount of completed calls."""
+    barrier = threading.Barrier(threads + 1)
+    stop = threading.Event()
+    counts = [0] * threads
+
+    def worker(idx: int) -> None:
+        n = 0
+        barrier.wait()
+        while not stop.is_set():
+            for _ in range(100):
+                target()
+            n += 100
+        counts[idx] = n
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+
+    for w in workers:
+        w.start()
+
+    barrier.wait()
+    time.sleep(duration)
+    stop.set()
+
+    for w in workers:
+        w.join()
+
+    return sum(counts)
+
+
+_SAMPLE_CA = wassima.root_der_certificates(hybrid_store=True)[0]
+
+
+def _stress_mix() -> typing.Callable[[], object]:
+    """Mostly reads, with a sprinkle of writers and context creation."""
+    tick = iter(range(1 << 62))
+
+    def target() -> object:
+        n = next(tick)
+
+        if n % 1000 == 0:
+            wassima.set_cache_ttl(wassima.DEFAULT_CACHE_TTL_SECONDS)
+            return None
+        if n % 100 == 0:
+            return wassima.create_default_ssl_context()
+        if n % 10 == 0:
+            wassima.register_ca(_SAMPLE_CA)
+            return None
+
+        return wassima.root_der_certificates()
+
+    return target
+
+
+SCENARIOS: dict[str, typing.Callable[[], typing.Callable[[], object]]] = {
+    "root_der_certificates": lambda: wassima.root_der_certificates,
+    "root_pem_certificates": lambda: wassima.root_pem_certificates,
+    "root_der_certificates(hybrid_store=True)": lambda: lambda: wassima.root_der_certificates(hybrid_store=True),
+    "register_ca": lambda: lambda: wassima.register_ca(_SAMPLE_CA),
+    "create_default_ssl_context": lambda: wassima.create_default_ssl_context,
+    "stress": _stress_mix,
+}
+
+QUICK_SCENARIOS = ("root_der_certificates", "root_pem_certificates", "root_der_certificates(hybrid_store=True)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--threads",
+        default=",".join(str(n) for n in (1, 2, 4, 8) if n <= (os.cpu_count() or 1) * 2),
+        help="comma separated list of thread counts to try",
+    )
+    parser.add_argument("--duration", type=float, default=2.0, help="seconds spent per measure")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=("all", *SCENARIOS),
+        help="scenario to run, may be repeated (default: the warm read scenarios)",
+    )
+
+    args = parser.parse_args()
+    thread_counts = [int(n) for n in args.threads.split(",") if n.strip()]
+
+    print(f"> Python {sys.version.split()[0]} ({sys.implementation.name}), GIL {_gil_status()}")
+    print(f"> {os.cpu_count()} CPU(s) available, wassima {wassima.__version__}")
+
+    selected = args.scenario or QUICK_SCENARIOS
+
+    if "all" in selected:
+        selected = tuple(SCENARIOS)
+
+    for name in selected:
+        target = SCENARIOS[name]()
+        target()  # warm the cache, we only measure the steady state.
+
+        print(f"\n## {name}")
+
+        baseline: float | None = None
+
+        for threads in thread_counts:
+            throughput = run_scenario(target, threads, args.duration) / args.duration
+
+            if baseline is None:
+                baseline = throughput
+
+            print(f"\t{threads:>3} thread(s): {throughput:>14,.0f} calls/s (x{throughput / baseline:.2f})")
+
+    # Whatever happened above, the store must remain consistent.
+    certificates = wassima.root_der_certificates()
+    assert len(certificates) == len(set(certificates)), "duplicate certificate detected"
+
+
+if __name__ == "__main__":
+    main()
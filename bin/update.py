@@ -1,11 +1,42 @@
+"""Regenerate the embedded CCADB trust anchors, in ``src/wassima/_os``:
+
+- ``_embed.py``, the PEM bundle along with its parser,
+- ``_embed.der``, the same certificates pre-decoded, behind an offset table,
+- ``_embed_index.py``, their fingerprints and metadata.
+
+Usage:
+    python bin/update.py
+    python bin/update.py --csv IncludedCACertificateReportPEMCSV.csv --date 2026-01-01
+    python bin/update.py --verify
+
+Given a local CCADB report (``--csv``) and a reference date (``--date``), nothing is
+downloaded and the output is reproducible byte for byte. The artifacts are verified
+to agree with each other once written, ``--verify`` only runs that step.
+"""
+
 from __future__ import annotations
 
+import argparse
 import csv
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import ssl
+import sys
 import typing
 from dataclasses import dataclass
-from datetime import UTC, datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
+
+# The in-tree DER reader, rather than whatever wassima happens to be installed.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from wassima import _bundle, _der  # noqa: E402
+from wassima._certificate import Certificate  # noqa: E402
 
-import urllib3
+if typing.TYPE_CHECKING:
+    from types import ModuleType
 
 # Update this manually in case CCADB switch issuer / chain of trust.
 # DigiCertGlobalRootCA.pem
@@ -35,14 +66,28 @@ MrY=
 
 CCADB_UPSTREAM_CSV = "https://ccadb.my.salesforce-sites.com/mozilla/IncludedCACertificateReportPEMCSV"
 
+EMBED_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "wassima", "_os")
+
 PYTHON_SRC_HEADER = """# DO NOT EDIT THIS FILE
 # IT IS AUTOMATICALLY GENERATED
 # LICENSED UNDER BOTH MIT AND "Community Data License Agreement - Permissive - Version 2.0" LICENSE
+from __future__ import annotations
+
+import os
 import ssl
 
+from .._bundle import SNAPSHOT_MAGIC, read_snapshot
+
 CCADB_BUNDLE: str = \"\"\"
 """
-PYTHON_SRC_FOOTER = """def root_der_certificates() -> list[bytes]:
+PYTHON_SRC_FOOTER = """
+#: The same certificates, pre-decoded, in a file next to this module. Same layout
+#: as the trust store snapshots, see SNAPSHOT_MAGIC in wassima._bundle.
+CCADB_DER_RESOURCE: str = "_embed.der"
+CCADB_DER_MAGIC: bytes = SNAPSHOT_MAGIC
+
+
+def _pem_bundle_certificates() -> list[bytes]:
     certificates: list[bytes] = []
 
     line_ending = "\\n"
@@ -58,15 +103,57 @@ PYTHON_SRC_FOOTER = """def root_der_certificates() -> list[bytes]:
             pem_reconstructed = "".join([chunk[start_marker:], boundary])
 
             try:
-                certificates.append(
-                    ssl.PEM_cert_to_DER_cert(pem_reconstructed)
-                )
+                certificates.append(ssl.PEM_cert_to_DER_cert(pem_reconstructed))
             except ValueError:  # Defensive: malformed base64?
                 continue  # just skip it... don't crash everything.
 
     return certificates
+
+
+def _der_resource_certificates() -> list[bytes]:
+    return read_snapshot(os.path.join(os.path.dirname(__file__), CCADB_DER_RESOURCE))
+
+
+def root_der_certificates() -> list[bytes]:
+    # Slicing the pre-decoded certificates out is much cheaper than decoding the PEM bundle.
+    try:
+        return _der_resource_certificates()
+    except (OSError, ValueError):
+        return _pem_bundle_certificates()
 """
 
+PYTHON_INDEX_HEADER = """# DO NOT EDIT THIS FILE
+# IT IS AUTOMATICALLY GENERATED
+# LICENSED UNDER BOTH MIT AND "Community Data License Agreement - Permissive - Version 2.0" LICENSE
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class EmbeddedRoot(NamedTuple):
+    \"\"\"Precomputed metadata of an embedded CCADB root. Fingerprints are lowercase
+    hexadecimal, validity bounds are POSIX timestamps.\"\"\"
+
+    owner: str
+    common_name: str
+    sha256_fingerprint: str
+    sha1_fingerprint: str
+    not_before: int
+    not_after: int
+    public_key: str
+
+
+#: One entry per certificate of ``CCADB_BUNDLE``, in the same order.
+CCADB_INDEX: tuple[EmbeddedRoot, ...] = (
+"""
+
+#: Named elliptic curves, by OID.
+EC_CURVES = {
+    "1.2.840.10045.3.1.7": "P-256",
+    "1.3.132.0.34": "P-384",
+    "1.3.132.0.35": "P-521",
+}
+
 
 @dataclass
 class CertificateRecord:
@@ -108,15 +195,27 @@ class CertificateRecord:
     pem_info: str
 
 
-def decode_stream_to_unicode(response: urllib3.HTTPResponse) -> typing.Iterator[str]:
-    for data in response:
-        yield data.decode()
+def download_ccadb_csv() -> typing.Iterator[str]:
+    import urllib3
+
+    with urllib3.PoolManager(ca_cert_data=CCADB_TRUST_ANCHOR) as pm:
+        resp = pm.urlopen(
+            "GET",
+            CCADB_UPSTREAM_CSV,
+            redirect=False,
+            retries=False,
+            preload_content=False,
+        )
+
+        assert resp.status == 200
+        assert "text/csv" in resp.headers["content-type"]
+
+        # Whole lines only, so that a multi-byte character never straddles two chunks.
+        yield from resp.data.decode().splitlines(keepends=True)
 
 
-def parse_ccadb_csv(
-    response: urllib3.HTTPResponse,
-) -> typing.Iterator[CertificateRecord]:
-    for row in csv.DictReader(decode_stream_to_unicode(response)):
+def parse_ccadb_csv(lines: typing.Iterable[str]) -> typing.Iterator[CertificateRecord]:
+    for row in csv.DictReader(lines):
         yield CertificateRecord(
             owner=row["Owner"],
             certificate_issuer_organization=row["Certificate Issuer Organization"],
@@ -157,7 +256,7 @@ def parse_ccadb_csv(
         )
 
 
-if __name__ == "__main__":
+def select_trust_anchors(records: typing.Iterable[CertificateRecord], current_date: datetime) -> list[CertificateRecord]:
     to_be_inserted_ca: list[CertificateRecord] = []
 
     expired_count = 0
@@ -165,84 +264,239 @@ if __name__ == "__main__":
     unsuitable_trust_bit_count = 0
     manually_untrusted_count = 0
 
-    with urllib3.PoolManager(ca_cert_data=CCADB_TRUST_ANCHOR) as pm:
-        resp = pm.urlopen(
-            "GET",
-            CCADB_UPSTREAM_CSV,
-            redirect=False,
-            retries=False,
-            preload_content=False,
-        )
+    for ca in records:
+        # CHECKS
+        # 1) Eligible for websites (server auth)
+        # 2) Within dates (i.e. not expired, currently valid)
+        # 3) Not invalid for TLS soon
 
-        assert resp.status == 200
-        assert "text/csv" in resp.headers["content-type"]
+        print(f"> Assert if '{ca.common_name_or_certificate_name}' can be inserted in trust store")
 
-        current_date = datetime.now(tz=UTC)
+        if "websites" not in ca.trust_bits.lower():
+            unsuitable_trust_bit_count += 1
+            print("\t>! Not trusted for SERVER AUTH")
+            continue
 
-        for ca in parse_ccadb_csv(resp):
-            # CHECKS
-            # 1) Eligible for websites (server auth)
-            # 2) Within dates (i.e. not expired, currently valid)
-            # 3) Not invalid for TLS soon
+        valid_from = datetime.fromisoformat(f"{ca.valid_from_gmt.replace('.', '-')}T00:00:00+00:00")
+        valid_to = datetime.fromisoformat(f"{ca.valid_to_gmt.replace('.', '-')}T00:00:00+00:00")
 
-            print(f"> Assert if '{ca.common_name_or_certificate_name}' can be inserted in trust store")
+        if valid_from > current_date:
+            not_yet_valid_count += 1
+            print("\t>! Not yet valid")
+            continue
 
-            if "websites" not in ca.trust_bits.lower():
-                unsuitable_trust_bit_count += 1
-                print("\t>! Not trusted for SERVER AUTH")
-                continue
+        if current_date > valid_to:
+            expired_count += 1
+            print("\t>! Not longer valid")
+            continue
 
-            valid_from = datetime.fromisoformat(f"{ca.valid_from_gmt.replace('.', '-')}T00:00:00+00:00")
-            valid_to = datetime.fromisoformat(f"{ca.valid_to_gmt.replace('.', '-')}T00:00:00+00:00")
+        if ca.distrust_for_tls_after_date:
+            no_longer_tls_acceptable_after = datetime.fromisoformat(
+                f"{ca.distrust_for_tls_after_date.replace('.', '-')}T00:00:00+00:00"
+            )
 
-            if valid_from > current_date:
-                not_yet_valid_count += 1
-                print("\t>! Not yet valid")
-                continue
+            # there is a grace period of 398 days
+            # This grace period allows extant certificates issued before the distrust date to
+            # remain valid for their lifetime.
+            no_longer_tls_acceptable_after += timedelta(days=398)
 
-            if current_date > valid_to:
-                expired_count += 1
-                print("\t>! Not longer valid")
+            if current_date > no_longer_tls_acceptable_after:
+                manually_untrusted_count += 1
+                print("\t>! Manually untrusted for TLS")
                 continue
 
-            if ca.distrust_for_tls_after_date:
-                no_longer_tls_acceptable_after = datetime.fromisoformat(
-                    f"{ca.distrust_for_tls_after_date.replace('.', '-')}T00:00:00+00:00"
-                )
+        print("\t> OK")
+        to_be_inserted_ca.append(ca)
 
-                # there is a grace period of 398 days
-                # This grace period allows extant certificates issued before the distrust date to
-                # remain valid for their lifetime.
-                no_longer_tls_acceptable_after += timedelta(days=398)
+    print(f"> {len(to_be_inserted_ca)} Trust Anchors Selected!")
+    print(f"> {expired_count} expired CAs")
+    print(f"> {not_yet_valid_count} not yet valid CAs")
+    print(f"> {manually_untrusted_count} manually untrusted for TLS CAs")
+    print(f"> {unsuitable_trust_bit_count} unsuitable for server auth CAs")
+
+    return to_be_inserted_ca
+
+
+def public_key_type(certificate: Certificate) -> str:
+    """Short description of the subject public key, e.g. ``RSA 4096`` or ``EC P-384``."""
+    spki = certificate.subject_public_key_info
+    _, start, end = _der.read_tlv(spki)
+    (_, _, algorithm_start, algorithm_end), (_, _, key_start, key_end) = _der.iter_elements(spki, start, end)
+
+    if certificate.public_key_algorithm == "rsaEncryption":
+        # BIT STRING (without its "unused bits" byte) wrapping RSAPublicKey ::= SEQUENCE { modulus, exponent }
+        rsa_public_key = spki[key_start + 1 : key_end]
+        _, rsa_start, rsa_end = _der.read_tlv(rsa_public_key)
+        (_, _, modulus_start, modulus_end), _ = _der.iter_elements(rsa_public_key, rsa_start, rsa_end)
 
-                if current_date > no_longer_tls_acceptable_after:
-                    manually_untrusted_count += 1
-                    print("\t>! Manually untrusted for TLS")
-                    continue
+        return f"RSA {int.from_bytes(rsa_public_key[modulus_start:modulus_end], 'big').bit_length()}"
 
-            print("\t> OK")
-            to_be_inserted_ca.append(ca)
+    if certificate.public_key_algorithm == "id-ecPublicKey":
+        _, (_, _, curve_start, curve_end) = _der.iter_elements(spki, algorithm_start, algorithm_end)
+        curve = _der.decode_oid(spki[curve_start:curve_end])
 
-    with open("./src/wassima/_os/_embed.py", "w") as fp:
+        return f"EC {EC_CURVES.get(curve, curve)}"
+
+    return certificate.public_key_algorithm
+
+
+def embedded_root(owner: str, common_name: str, der: bytes) -> tuple[str, str, str, str, int, int, str]:
+    """The index entry of a certificate, see ``EmbeddedRoot``."""
+    certificate = Certificate(der)
+
+    return (
+        owner,
+        common_name,
+        certificate.sha256_fingerprint,
+        certificate.sha1_fingerprint,
+        int(certificate.not_before.timestamp()),
+        int(certificate.not_after.timestamp()),
+        public_key_type(certificate),
+    )
+
+
+def write_embed_module(path: str, trust_anchors: list[CertificateRecord]) -> list[bytes]:
+    """Write the PEM bundle module, return the DER certificates it holds (in order)."""
+    certificates: list[bytes] = []
+
+    with open(path, "w", encoding="utf-8", newline="\n") as fp:
         fp.write(PYTHON_SRC_HEADER)
 
-        for ca in to_be_inserted_ca:
-            fp.write(
-                f"# Owner: {ca.owner}\n"
-                f"# Organization: {ca.certificate_issuer_organization}\n"
-                f"# Common Name: {ca.common_name_or_certificate_name}\n"
-                f"# SHA-256: {ca.sha256_fingerprint}\n"
+        for ca in trust_anchors:
+            comments = (
+                f"# Owner: {ca.owner}",
+                f"# Organization: {ca.certificate_issuer_organization}",
+                f"# Common Name: {ca.common_name_or_certificate_name}",
+                f"# SHA-256: {ca.sha256_fingerprint}",
             )
+            pem = ca.pem_info[1:-1].replace("\\n", "\n")
 
-            fp.write(ca.pem_info[1:-1].replace("\\n", "\n"))
+            fp.write("".join(f"{comment.rstrip()}\n" for comment in comments))
+            fp.write(pem)
             fp.write("\n\n")
 
+            certificates.append(ssl.PEM_cert_to_DER_cert(pem))
+
         fp.write('"""\n\n')
 
         fp.write(PYTHON_SRC_FOOTER)
 
-    print(f"> {len(to_be_inserted_ca)} Trust Anchors Saved!")
-    print(f"> {expired_count} expired CAs")
-    print(f"> {not_yet_valid_count} not yet valid CAs")
-    print(f"> {manually_untrusted_count} manually untrusted for TLS CAs")
-    print(f"> {unsuitable_trust_bit_count} unsuitable for server auth CAs")
+    return certificates
+
+
+def write_der_resource(path: str, certificates: list[bytes]) -> None:
+    """Write the pre-decoded certificates, see ``CCADB_DER_RESOURCE``."""
+    with open(path, "wb") as fp:
+        fp.write(_bundle.dump_snapshot(certificates))
+
+
+def write_embed_index(path: str, roots: list[tuple[str, str, bytes]]) -> None:
+    """Write the metadata index of the embedded roots, given as (owner, common name, DER)
+    in the order of ``CCADB_BUNDLE``. The output is already formatted as ruff would."""
+    with open(path, "w", encoding="utf-8", newline="\n") as fp:
+        fp.write(PYTHON_INDEX_HEADER)
+
+        for owner, common_name, der in roots:
+            fields = [
+                field if isinstance(field, int) else json.dumps(field, ensure_ascii=False)
+                for field in embedded_root(owner, common_name, der)
+            ]
+
+            fp.write("    EmbeddedRoot(\n")
+            fp.write("".join(f"        {field},\n" for field in fields))
+            fp.write("    ),\n")
+
+        fp.write(")\n")
+
+
+def write_artifacts(directory: str, trust_anchors: list[CertificateRecord]) -> None:
+    os.makedirs(directory, exist_ok=True)
+
+    certificates = write_embed_module(os.path.join(directory, "_embed.py"), trust_anchors)
+
+    write_der_resource(os.path.join(directory, "_embed.der"), certificates)
+    write_embed_index(
+        os.path.join(directory, "_embed_index.py"),
+        [(ca.owner, ca.common_name_or_certificate_name, der) for ca, der in zip(trust_anchors, certificates)],
+    )
+
+
+def _load_module(path: str) -> ModuleType:
+    # As a member of wassima._os, as the generated modules import from the package.
+    spec = importlib.util.spec_from_file_location(f"wassima._os._update{os.path.basename(path)[:-3]}", path)
+    assert spec is not None and spec.loader is not None
+
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def verify_artifacts(directory: str) -> int:
+    """Check that the PEM module, the DER resource and the index hold the same certificates,
+    in the same order. Return their count, raise ValueError on the first disagreement."""
+    embed = _load_module(os.path.join(directory, "_embed.py"))
+    index = _load_module(os.path.join(directory, "_embed_index.py"))
+
+    certificates = embed._pem_bundle_certificates()
+    declared = re.findall(r"^# SHA-256: ([0-9A-F]+)$", embed.CCADB_BUNDLE, re.MULTILINE)
+
+    if len(certificates) != embed.CCADB_BUNDLE.count("-----BEGIN CERTIFICATE-----"):
+        raise ValueError("the PEM bundle holds certificates that cannot be decoded")
+
+    if [hashlib.sha256(der).hexdigest().upper() for der in certificates] != declared:
+        raise ValueError("the PEM bundle does not match its SHA-256 comments")
+
+    if embed._der_resource_certificates() != certificates:
+        raise ValueError("the DER resource does not match the PEM bundle")
+
+    if len(index.CCADB_INDEX) != len(certificates):
+        raise ValueError("the index does not have one entry per certificate")
+
+    for entry, der in zip(index.CCADB_INDEX, certificates):
+        if tuple(entry) != embedded_root(entry.owner, entry.common_name, der):
+            raise ValueError(f"the index entry of {entry.common_name!r} does not match its certificate")
+
+    return len(certificates)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Regenerate the embedded CCADB trust anchors.")
+    parser.add_argument("--csv", help="read this CCADB report (IncludedCACertificateReportPEMCSV) instead of downloading it")
+    parser.add_argument(
+        "--date",
+        type=date.fromisoformat,
+        help="reference date (YYYY-MM-DD) of the validity and distrust checks (default: today)",
+    )
+    parser.add_argument("--output", default=EMBED_DIRECTORY, help="where to write the artifacts (default: src/wassima/_os)")
+    parser.add_argument("--verify", action="store_true", help="only check that the existing artifacts agree")
+
+    args = parser.parse_args(argv)
+
+    if not args.verify:
+        if args.date is None:
+            current_date = datetime.now(tz=timezone.utc)
+        else:
+            current_date = datetime(args.date.year, args.date.month, args.date.day, tzinfo=timezone.utc)
+
+        if args.csv:
+            with open(args.csv, encoding="utf-8", newline="") as fp:
+                trust_anchors = select_trust_anchors(parse_ccadb_csv(fp), current_date)
+        else:
+            trust_anchors = select_trust_anchors(parse_ccadb_csv(download_ccadb_csv()), current_date)
+
+        write_artifacts(args.output, trust_anchors)
+
+    try:
+        count = verify_artifacts(args.output)
+    except (OSError, ValueError) as e:
+        print(f"> Verification failed: {e}")
+        return 1
+
+    print(f"> {count} Trust Anchors verified!")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
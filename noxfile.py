@@ -5,7 +5,7 @@ import os
 import nox
 
 
-@nox.session(python=["3.7", "3.8", "3.9", "3.10", "3.11", "3.12", "3.13", "3.14", "3.15", "pypy"])
+@nox.session(python=["3.7", "3.8", "3.9", "3.10", "3.11", "3.12", "3.13", "3.14", "3.15", "3.13t", "3.14t", "pypy"])
 def test(session: nox.Session) -> None:
     # Install deps and the package itself.
     session.install("-r", "requirements-dev.txt")
@@ -5,12 +5,21 @@ It aims to provide a pythonic way to retrieve root CAs from your system without
 
 from __future__ import annotations
 
+import hashlib
+import math
+import os
 import ssl
 import time
-from functools import wraps
-from threading import RLock
-from typing import TYPE_CHECKING, Any
+import warnings
+from concurrent.futures import Future
+from functools import partial, wraps
+from threading import Event, RLock, Thread, current_thread
+from typing import TYPE_CHECKING, Any, overload
+from weakref import WeakKeyDictionary
 
+from . import _bundle, _daemon, _der
+from ._certificate import Certificate
+from ._index import CertificateIndex
 from ._os import (
     IS_BSD,
     IS_LINUX,
@@ -18,29 +27,49 @@ from ._os import (
 from ._os import (
     root_der_certificates as _root_der_certificates,
 )
+from ._os import (
+    trust_store_metadata as _trust_store_metadata,
+)
 from ._os._embed import root_der_certificates as fallback_der_certificates
 from ._version import VERSION, __version__
 
 if TYPE_CHECKING:
-    from typing import Callable, Protocol, TypeVar
+    from typing import Callable, Generator, Iterable, Iterator, Literal, Protocol, TextIO, TypeVar
 
     from typing_extensions import ParamSpec
 
+    from ._os._embed_index import EmbeddedRoot
+
     _P = ParamSpec("_P")
     _R = TypeVar("_R", covariant=True)
+    _C = TypeVar("_C", bound=ssl.SSLContext)
 
     class _CachedFunc(Protocol[_P, _R]):
         def __call__(self, *args: _P.args, **kwargs: _P.kwargs) -> _R: ...
         def cache_clear(self) -> None: ...
+        def cache_keys(self) -> list[tuple[Any, ...]]: ...
+        def cache_peek(self, key: tuple[Any, ...]) -> _R | None: ...
+        def cache_generation(self) -> int: ...
+        def cache_publish(
+            self, key: tuple[Any, ...], value: Any, expires_at: float, if_generation: int | None = None
+        ) -> bool: ...
+        def cache_transform(self, transform: Callable[[tuple[Any, ...], Any], Any]) -> None: ...
 
 
 # Mozilla TLS recommendations for ciphers
 # General-purpose servers with a variety of clients, recommended for almost all systems.
 MOZ_INTERMEDIATE_CIPHERS: str = "ECDHE-ECDSA-AES128-GCM-SHA256:ECDHE-RSA-AES128-GCM-SHA256:ECDHE-ECDSA-AES256-GCM-SHA384:ECDHE-RSA-AES256-GCM-SHA384:ECDHE-ECDSA-CHACHA20-POLY1305:ECDHE-RSA-CHACHA20-POLY1305:DHE-RSA-AES128-GCM-SHA256:DHE-RSA-AES256-GCM-SHA384:DHE-RSA-CHACHA20-POLY1305"  # noqa: E501
+# Thread-safety notes (this package is free-threading compatible): module-level
+# state is either immutable once published (cache entries), only mutated under a
+# lock (registered CAs, TTL updates) or assigned with a single atomic rebinding.
+# Readers never hold a lock; they work on a snapshot (e.g. ``tuple(...)``).
+
 #: Contain user custom CAs
 _MANUALLY_REGISTERED_CA: list[bytes] = []
 #: Lock for shared register-ca
 _USER_APPEND_CA_LOCK = RLock()
+#: Serialize TTL updates with the invalidation that follows them
+_CACHE_TTL_LOCK = RLock()
 
 #: Default cache TTL (seconds). Twelve hours. The cache is automatically
 #: invalidated after this duration so that, e.g., a fresh CA being added to
@@ -52,34 +81,178 @@ DEFAULT_CACHE_TTL_SECONDS: int = 43200
 
 _CACHE_TTL_SECONDS: int = DEFAULT_CACHE_TTL_SECONDS
 
+#: Drop certificates outside of their validity period, see set_validity_filter
+_VALIDITY_FILTER: bool = False
+#: Per hybrid_store flavor, when (wall clock) the next filtered certificate lapses or becomes valid.
+#: Copy-on-write: scans may run concurrently (e.g. iter_der_certificates), readers iterate it lock-free.
+_NEXT_VALIDITY_CHANGE: dict[bool, float] = {}
+_NEXT_VALIDITY_CHANGE_LOCK = RLock()
+#: Keep a single variant of the roots reissued with the same subject and key, see set_reissued_roots_collapse
+_COLLAPSE_REISSUED_ROOTS: bool = False
+
+#: Environment variable giving the path of a snapshot written by ``python -m wassima freeze``,
+#: served instead of the live trust store, see use_frozen_trust_store
+FROZEN_TRUST_STORE_ENV: str = "WASSIMA_FROZEN_TRUST_STORE"
+#: The frozen trust store in use, if any, see use_frozen_trust_store
+_FROZEN_TRUST_STORE: list[bytes] | None = None
+#: Snapshot given by FROZEN_TRUST_STORE_ENV, not loaded yet (done on first use)
+_FROZEN_TRUST_STORE_PATH: str | None = os.environ.get(FROZEN_TRUST_STORE_ENV) or None
+_FROZEN_TRUST_STORE_LOCK = RLock()
+
+_MISSING = object()
+
+
+class _CacheEntry:
+    """An immutable cached result. Never mutated once published, so readers
+    may use it without holding any lock."""
+
+    __slots__ = ("value", "expires_at")
+
+    def __init__(self, value: Any, expires_at: float) -> None:
+        self.value = value
+        self.expires_at = expires_at
+
+
+def _cache_deadline(now: float) -> float:
+    """When should a result computed at ``now`` (monotonic clock) expire?"""
+    if _BACKGROUND_REFRESHER is not None:
+        # The background refresher owns the refresh lifecycle: request
+        # threads must never pay for a rescan.
+        return math.inf
+
+    # A frozen trust store never changes, only the validity filter may expire it.
+    deadline = math.inf if _FROZEN_TRUST_STORE is not None else now + _CACHE_TTL_SECONDS
+
+    next_changes = _NEXT_VALIDITY_CHANGE  # snapshot
+
+    if next_changes:
+        # Refresh exactly when a root lapses (or becomes valid), not up to a TTL later.
+        # Past changes were already accounted for by the entries computed before them.
+        wall_now = time.time()
+        upcoming = [t - wall_now for t in next_changes.values() if t > wall_now]
+        if upcoming:
+            deadline = min(deadline, now + min(upcoming))
+
+    return deadline
 
-def _ttl_lru_cache(func: Callable[_P, _R]) -> _CachedFunc[_P, _R]:
-    """A minimal, thread-safe memorizing decorator with a per-call-site TTL."""
-    sentinel = object()
-    cache: dict[Any, Any] = {}
-    state: dict[str, float] = {"expires_at": 0.0}
+
+def _ttl_lru_cache(func: Callable[_P, _R], deadline: Callable[[float], float] | None = None) -> _CachedFunc[_P, _R]:
+    """A minimal, thread-safe memorizing decorator with a per-call-site TTL.
+    Results expire at ``deadline(now)``, :func:`_cache_deadline` unless given.
+
+    Warm reads are lock-free. Cached results live in immutable
+    :class:`_CacheEntry` objects held by a mapping that is never mutated after
+    being published; a refresh builds a new mapping under the lock and
+    publishes it with a single reference assignment (atomic, even on
+    free-threaded builds). Only misses and invalidations synchronize.
+
+    Keys are normalized to the full positional argument tuple, so that
+    ``f()``, ``f(False)`` and ``f(hybrid_store=False)`` share one entry. That
+    tuple is also the key accepted by the ``cache_*`` helpers.
+    """
+    code = func.__code__
+    names = code.co_varnames[: code.co_argcount]
+    defaults: tuple[Any, ...] = func.__defaults__ or ()
+    defaults = (_MISSING,) * (len(names) - len(defaults)) + defaults
+    parameters = tuple(zip(names, defaults))
+
+    entries: dict[Any, _CacheEntry] = {}
+    generation = 0
     lock = RLock()
 
     @wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> Any:
-        key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+        nonlocal entries
+
+        if not kwargs:
+            key = args + defaults[len(args) :]
+        elif len(args) + len(kwargs) <= len(names) and all(k in names[len(args) :] for k in kwargs):
+            key = args + tuple(kwargs.get(name, default) for name, default in parameters[len(args) :])
+        else:
+            return func(*args, **kwargs)  # Defensive: let the call raise the appropriate TypeError
+
+        entry = entries.get(key)
+        if entry is not None and time.monotonic() < entry.expires_at:
+            return entry.value
+
         with lock:
+            # Another thread may have refreshed while we were waiting.
             now = time.monotonic()
-            if now >= state["expires_at"]:
-                cache.clear()
-                state["expires_at"] = now + _CACHE_TTL_SECONDS
-            result = cache.get(key, sentinel)
-            if result is sentinel:
-                result = func(*args, **kwargs)
-                cache[key] = result
+            entry = entries.get(key)
+            if entry is not None and now < entry.expires_at:
+                return entry.value
+
+            result = func(*key)  # type: ignore[call-arg]
+
+            # Copy-on-write: drop expired siblings, then swap the reference.
+            refreshed = {k: e for k, e in entries.items() if now < e.expires_at}
+            refreshed[key] = _CacheEntry(result, (deadline or _cache_deadline)(now))
+            entries = refreshed
+
             return result
 
     def cache_clear() -> None:
+        nonlocal entries, generation
+
+        with lock:
+            entries = {}
+            generation += 1
+
+    def cache_keys() -> list[tuple[Any, ...]]:
+        now = time.monotonic()
+        return [k for k, e in entries.items() if now < e.expires_at]
+
+    def cache_peek(key: tuple[Any, ...]) -> Any:
+        """Return the live cached value for ``key`` or ``None``. Never computes."""
+        entry = entries.get(key)
+        if entry is not None and time.monotonic() < entry.expires_at:
+            return entry.value
+        return None
+
+    def cache_generation() -> int:
+        """Bumped on every invalidation. See ``cache_publish``."""
+        return generation
+
+    def cache_publish(key: tuple[Any, ...], value: Any, expires_at: float, if_generation: int | None = None) -> bool:
+        """Publish a value computed elsewhere (e.g. by the background refresher).
+
+        If ``if_generation`` is given and the cache was invalidated since it was
+        read, the value is considered outdated and dropped.
+        """
+        nonlocal entries
+
+        with lock:
+            if if_generation is not None and if_generation != generation:
+                return False
+            refreshed = dict(entries)
+            refreshed[key] = _CacheEntry(value, expires_at)
+            entries = refreshed
+            return True
+
+    def cache_transform(transform: Callable[[tuple[Any, ...], Any], Any]) -> None:
+        """Replace every live cached value by ``transform(key, value)``, or drop it if that
+        gives ``None``. Expiries are kept. Counts as an invalidation (see ``cache_generation``)."""
+        nonlocal entries, generation
+
         with lock:
-            cache.clear()
-            state["expires_at"] = 0.0
+            now = time.monotonic()
+            refreshed = {}
+
+            for key, entry in entries.items():
+                if now < entry.expires_at:
+                    value = transform(key, entry.value)
+                    if value is not None:
+                        refreshed[key] = entry if value is entry.value else _CacheEntry(value, entry.expires_at)
+
+            entries = refreshed
+            generation += 1
 
     wrapper.cache_clear = cache_clear  # type: ignore[attr-defined]
+    wrapper.cache_keys = cache_keys  # type: ignore[attr-defined]
+    wrapper.cache_peek = cache_peek  # type: ignore[attr-defined]
+    wrapper.cache_generation = cache_generation  # type: ignore[attr-defined]
+    wrapper.cache_publish = cache_publish  # type: ignore[attr-defined]
+    wrapper.cache_transform = cache_transform  # type: ignore[attr-defined]
     return wrapper  # type: ignore[return-value]
 
 
@@ -95,9 +268,252 @@ def set_cache_ttl(seconds: int) -> None:
         raise TypeError("cache TTL must be an int (seconds)")
     if seconds < 0:
         raise ValueError("cache TTL cannot be negative")
-    _CACHE_TTL_SECONDS = seconds
-    root_der_certificates.cache_clear()
-    root_pem_certificates.cache_clear()
+    with _CACHE_TTL_LOCK:
+        _CACHE_TTL_SECONDS = seconds
+        root_der_certificates.cache_clear()
+        root_pem_certificates.cache_clear()
+
+
+def set_validity_filter(enabled: bool) -> None:
+    """
+    Opt in (or out) of dropping certificates outside of their validity period, i.e.
+    expired or not yet valid, from everything wassima returns. Registered CAs included.
+    Only the DER validity fields are parsed to decide.
+
+    While enabled, cached results also expire when the next certificate lapses
+    (or becomes valid), if that happens before the cache TTL.
+    Any pending cached result is dropped immediately.
+    """
+    global _VALIDITY_FILTER, _NEXT_VALIDITY_CHANGE
+    if not isinstance(enabled, bool):
+        raise TypeError("validity filter must be a bool")
+    with _CACHE_TTL_LOCK:
+        # A scan publishes its next change while holding the cache lock: never
+        # wait for the cache lock while holding _NEXT_VALIDITY_CHANGE_LOCK.
+        with _NEXT_VALIDITY_CHANGE_LOCK:
+            _VALIDITY_FILTER = enabled
+            _NEXT_VALIDITY_CHANGE = {}
+
+        root_der_certificates.cache_clear()
+        root_pem_certificates.cache_clear()
+
+
+def set_reissued_roots_collapse(enabled: bool) -> None:
+    """
+    Opt in (or out) of keeping a single variant of the trust anchors sharing both subject
+    and public key, e.g. a root reissued with a new validity period or new extensions,
+    found in the OS trust store and in the CCADB bundle. They are interchangeable to
+    validate a chain, loading all of them only costs memory and chain building time.
+
+    The variant kept is the one valid for the longest time from now on: currently valid
+    first, then the latest expiry. Certificates that cannot be read are always kept.
+    Any pending cached result is dropped immediately.
+    """
+    global _COLLAPSE_REISSUED_ROOTS
+    if not isinstance(enabled, bool):
+        raise TypeError("reissued roots collapse must be a bool")
+    with _CACHE_TTL_LOCK:
+        _COLLAPSE_REISSUED_ROOTS = enabled
+        root_der_certificates.cache_clear()
+        root_pem_certificates.cache_clear()
+
+
+def use_frozen_trust_store(path: str | os.PathLike[str] | None) -> None:
+    """
+    Serve the trust store from a snapshot written by ``python -m wassima freeze``, for
+    images whose trust store cannot change once built (e.g. distroless, read-only).
+    :func:`root_der_certificates`, and everything built upon it, then returns the snapshot
+    (plus the embedded CCADB bundle with ``hybrid_store=True``, and the registered CAs):
+    the OS trust store is never scanned and cached results never expire.
+
+    Pass ``None`` to go back to the live trust store. Setting ``WASSIMA_FROZEN_TRUST_STORE``
+    to the path of the snapshot does the same at startup, without any code change.
+    Raise ``OSError`` or ``ValueError`` if the snapshot cannot be read.
+    """
+    global _FROZEN_TRUST_STORE, _FROZEN_TRUST_STORE_PATH
+
+    certificates = None if path is None else _bundle.read_snapshot(path)
+
+    with _CACHE_TTL_LOCK:
+        # A cold scan may load WASSIMA_FROZEN_TRUST_STORE while holding the cache
+        # lock: never wait for the cache lock while holding _FROZEN_TRUST_STORE_LOCK.
+        with _FROZEN_TRUST_STORE_LOCK:
+            _FROZEN_TRUST_STORE = certificates
+            _FROZEN_TRUST_STORE_PATH = None
+
+        root_der_certificates.cache_clear()
+        root_pem_certificates.cache_clear()
+
+
+def _frozen_trust_store() -> list[bytes] | None:
+    """The frozen trust store in use, loading the one given by ``WASSIMA_FROZEN_TRUST_STORE`` on first use."""
+    global _FROZEN_TRUST_STORE, _FROZEN_TRUST_STORE_PATH
+
+    if _FROZEN_TRUST_STORE_PATH is None:
+        return _FROZEN_TRUST_STORE
+
+    with _FROZEN_TRUST_STORE_LOCK:
+        path = _FROZEN_TRUST_STORE_PATH
+
+        if path is not None:
+            try:
+                _FROZEN_TRUST_STORE = _bundle.read_snapshot(path)
+            except (OSError, ValueError) as e:
+                warnings.warn(
+                    f"wassima ignores {FROZEN_TRUST_STORE_ENV}={path!r} and uses the live trust store: {e}",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+
+            _FROZEN_TRUST_STORE_PATH = None
+
+    return _FROZEN_TRUST_STORE
+
+
+def _collapse_reissued_roots(certificates: Iterable[bytes]) -> list[bytes]:
+    """Keep the best variant per (subject, public key), see set_reissued_roots_collapse."""
+    now = time.time()
+    best: dict[Any, tuple[tuple[bool, float, bytes], bytes]] = {}
+
+    for der in certificates:
+        certificate = Certificate(der)
+
+        try:
+            key: Any = (certificate.subject_der, certificate.subject_public_key_info)
+            not_before, not_after = certificate.not_before.timestamp(), certificate.not_after.timestamp()
+        except ValueError:
+            best[der] = ((False, 0.0, der), der)
+            continue
+
+        # Max wins. Ties are broken on the DER itself, so that the outcome is deterministic.
+        rank = (not_before <= now <= not_after, not_after, der)
+        current = best.get(key)
+
+        if current is None or rank > current[0]:
+            best[key] = (rank, der)
+
+    return [der for _, der in best.values()]
+
+
+def _validity_period(der: bytes) -> tuple[float, float] | None:
+    """Return the validity period of a DER certificate as timestamps. ``None`` if it
+    cannot be read: let OpenSSL be the judge of it then."""
+    certificate = Certificate(der)
+
+    try:
+        return certificate.not_before.timestamp(), certificate.not_after.timestamp()
+    except ValueError:
+        return None
+
+
+def _validity_window_elapsed(hybrid_store: bool) -> bool:
+    """Did a certificate lapse (or become valid) since the last filtered scan?"""
+    return time.time() >= _NEXT_VALIDITY_CHANGE.get(hybrid_store, math.inf)
+
+
+def _iter_trust_anchors(hybrid_store: bool) -> Iterator[bytes]:
+    """Yield every trust anchor once, see :func:`_iter_all_trust_anchors`,
+    minus those outside of their validity period if asked to."""
+    global _NEXT_VALIDITY_CHANGE
+
+    if not _VALIDITY_FILTER:
+        yield from _iter_all_trust_anchors(hybrid_store)
+        return
+
+    now = time.time()
+    next_change = math.inf
+
+    for der in _iter_all_trust_anchors(hybrid_store):
+        period = _validity_period(der)
+
+        if period is None:
+            yield der
+            continue
+
+        not_before, not_after = period
+
+        if now < not_before:
+            next_change = min(next_change, not_before)
+            continue
+
+        if now > not_after:
+            continue
+
+        next_change = min(next_change, not_after)
+
+        yield der
+
+    with _NEXT_VALIDITY_CHANGE_LOCK:
+        if _VALIDITY_FILTER:
+            _NEXT_VALIDITY_CHANGE = {**_NEXT_VALIDITY_CHANGE, hybrid_store: next_change}
+
+
+def _iter_all_trust_anchors(hybrid_store: bool) -> Iterator[bytes]:
+    """Yield every trust anchor once, source after source (OS trust store, CCADB
+    bundle, manually registered CAs), as soon as each source is scanned."""
+    # Track what was yielded so far so that manually-registered CAs
+    # can avoid yielding a DER that is already present.
+    seen: set[bytes] = set()
+
+    yield from _iter_system_trust_anchors(hybrid_store, seen)
+
+    for cert in tuple(_MANUALLY_REGISTERED_CA):  # snapshot
+        if cert not in seen:
+            seen.add(cert)
+            yield cert
+
+
+def _iter_system_trust_anchors(hybrid_store: bool, seen: set[bytes]) -> Iterator[bytes]:
+    """Yield the OS trust store, then the CCADB bundle if needed, adding to ``seen`` whatever is yielded.
+
+    When a node-local daemon is reachable (see ``python -m wassima serve``), both are
+    replaced by the snapshot it serves. A frozen trust store (see
+    :func:`use_frozen_trust_store`) replaces the OS trust store, and the daemon."""
+    frozen = _frozen_trust_store()
+    served = _daemon.fetch_snapshot(hybrid_store) if frozen is None else None
+
+    if frozen is not None:
+        certificates = frozen
+    elif served is not None:
+        _daemon.watch(_on_daemon_change)
+        certificates = served
+    else:
+        certificates = _root_der_certificates()
+
+    # The OS-specific backends (and the daemon) already guarantee a duplicate-free list.
+    yield from certificates
+
+    # Track what was yielded so far so that any extension below (CCADB
+    # fallback, hybrid bundle) can avoid yielding a DER that is already present.
+    seen.update(certificates)
+
+    # The daemon already merged the CCADB bundle, if needed.
+    if served is None:
+        force_hybrid = hybrid_store
+
+        if frozen is None and (IS_LINUX or IS_BSD):
+            from ._os._linux import is_trust_store_stale
+
+            if is_trust_store_stale():
+                force_hybrid = True
+
+        if not certificates or force_hybrid:
+            for cert in fallback_der_certificates():
+                if cert not in seen:
+                    seen.add(cert)
+                    yield cert
+
+
+def _system_trust_anchors(hybrid_store: bool) -> list[bytes]:
+    """A fresh scan of the OS trust store (and CCADB bundle), registered CAs excluded. Never cached."""
+    return list(_iter_system_trust_anchors(hybrid_store, set()))
+
+
+def _on_daemon_change(hybrid_store: bool, fingerprint: str) -> None:
+    """The node-local daemon tells us the trust store changed: fetch the new snapshot,
+    swap it in and notify our own listeners, like a local refresh would."""
+    if root_der_certificates.cache_peek((hybrid_store,)) is not None:
+        _refresh_trust_store_for(hybrid_store, None)
 
 
 @_ttl_lru_cache
@@ -110,41 +526,21 @@ def root_der_certificates(hybrid_store: bool = False) -> list[bytes]:
     enabled on Linux/BSD when the system trust store appears to be stale
     (older than 3 years without update).
 
-    The OS-specific backends already guarantee a duplicate-free list; this
-    function only re-deduplicates when extra sources (CCADB fallback, hybrid
-    bundle, user-registered CAs) are merged on top.
-    """
-    certificates = _root_der_certificates()
-
-    force_hybrid = hybrid_store
-
-    if IS_LINUX or IS_BSD:
-        from ._os._linux import is_trust_store_stale
-
-        if is_trust_store_stale():
-            force_hybrid = True
+    The list is returned in a canonical order (sorted by DER bytes), so that
+    the same trust set always yields the same list, bundle and fingerprint,
+    whatever the discovery order was.
 
-    # Track what's already in the resulting list so that any extension
-    # below (CCADB fallback, hybrid bundle, manually-registered CAs) can
-    # avoid re-adding a DER that is already present.
-    if not certificates:
-        certificates = fallback_der_certificates()
-    elif force_hybrid:
-        seen = set(certificates)
-        certificates = list(certificates)
-        for cert in fallback_der_certificates():
-            if cert not in seen:
-                seen.add(cert)
-                certificates.append(cert)
-
-    manually_registered = tuple(_MANUALLY_REGISTERED_CA)  # snapshot
+    CAs found by a rescan (e.g. added to the OS trust store since the previous one) are
+    also loaded right away into the SSLContexts previously returned by
+    :func:`create_default_ssl_context` and :func:`shared_ssl_context`.
+    """
+    if _COLLAPSE_REISSUED_ROOTS:
+        certificates = sorted(_collapse_reissued_roots(_iter_trust_anchors(hybrid_store)))
+    else:
+        certificates = sorted(_iter_trust_anchors(hybrid_store))
 
-    if manually_registered:
-        seen = set(certificates)
-        for cert in manually_registered:
-            if cert not in seen:
-                seen.add(cert)
-                certificates.append(cert)
+    # Only additions reach them: OpenSSL cannot unload a CA.
+    _load_into_issued_ssl_contexts(bool(hybrid_store), certificates)
 
     return certificates
 
@@ -175,59 +571,1521 @@ def generate_ca_bundle(hybrid_store: bool = False) -> str:
     return "\n\n".join(root_pem_certificates(hybrid_store=hybrid_store))
 
 
+def iter_der_certificates(hybrid_store: bool = False) -> Iterator[bytes]:
+    """
+    Iterate over the root certificates of :func:`root_der_certificates` without waiting
+    for the whole trust store to be loaded: when nothing is cached yet, certificates are
+    yielded as each source is scanned (OS trust store, then CCADB bundle, then your own CAs),
+    without duplicates. Fully consuming it caches the result like :func:`root_der_certificates`.
+
+    Only a cached snapshot is served in the canonical order. Otherwise, certificates come
+    in discovery order. Use :func:`root_der_certificates` if you depend on the order.
+    """
+    key = (bool(hybrid_store),)
+    certificates = root_der_certificates.cache_peek(key)
+
+    if certificates is None and _COLLAPSE_REISSUED_ROOTS:
+        # A better variant may come from any later source: nothing can be yielded before the end.
+        certificates = root_der_certificates(key[0])
+
+    if certificates is not None:
+        yield from certificates
+        return
+
+    generation = root_der_certificates.cache_generation()
+    scanned = []
+
+    for certificate in _iter_trust_anchors(key[0]):
+        scanned.append(certificate)
+        yield certificate
+
+    root_der_certificates.cache_publish(key, sorted(scanned), _cache_deadline(time.monotonic()), generation)
+
+
+def iter_pem_certificates(hybrid_store: bool = False) -> Iterator[str]:
+    """
+    Like :func:`iter_der_certificates`, PEM encoded.
+    """
+    certificates = root_pem_certificates.cache_peek((bool(hybrid_store),))
+
+    if certificates is not None:
+        yield from certificates
+        return
+
+    for certificate in iter_der_certificates(hybrid_store):
+        yield ssl.DER_cert_to_PEM_cert(certificate)
+
+
+def write_ca_bundle(fileobj: TextIO, hybrid_store: bool = False) -> int:
+    """
+    Write the CA bundle of :func:`generate_ca_bundle` into a (text) file object, one
+    certificate at a time, without building the whole bundle in memory first.
+    Certificates come in the order of :func:`iter_pem_certificates`.
+    Return how many certificates were written.
+
+    See :func:`root_der_certificates` for the meaning of ``hybrid_store``.
+    """
+    count = 0
+
+    for certificate in iter_pem_certificates(hybrid_store):
+        if count:
+            fileobj.write("\n\n")
+        fileobj.write(certificate)
+        count += 1
+
+    return count
+
+
 def register_ca(pem_or_der_certificate: bytes | str) -> None:
     """
     You may register your own CA certificate in addition to your system trust store.
+
+    It is also loaded right away into the SSLContexts previously returned by
+    :func:`create_default_ssl_context` and :func:`shared_ssl_context`. Except the
+    ``lazy=True`` ones: they keep reading the :func:`ca_directory` they were created
+    with, create a new one to trust it. See :func:`register_cas` to register many at once. ``ValueError`` is raised
+    (and nothing registered) if OpenSSL cannot load the certificate.
+    """
+    if isinstance(pem_or_der_certificate, str):
+        pem_or_der_certificate = ssl.PEM_cert_to_DER_cert(pem_or_der_certificate)
+
+    _register_certificates([pem_or_der_certificate])
+
+
+def register_cas(*sources: bytes | str | os.PathLike[str] | Iterable[bytes]) -> int:
+    """
+    Register many CA certificates at once, e.g. a corporate bundle. Each source may be:
+
+    - PEM content (``str`` or ``bytes``) holding any number of certificates,
+    - DER content (``bytes``), possibly several concatenated certificates,
+    - an iterable of DER certificates,
+    - the path of a PEM or DER file,
+    - the path of a directory, whose files are all loaded (those holding anything but certificates
+      OpenSSL can load, e.g. keys or CRLs, are skipped).
+
+    The batch is applied atomically: cached results are updated in place, without
+    rescanning the trust store, and issued SSLContexts receive the new CAs at once
+    (see :func:`register_ca`).
+    Return how many CAs were not registered already. ``ValueError`` is raised (and nothing
+    registered) if a source cannot be read as certificates, or OpenSSL cannot load one of them.
     """
+    certificates: list[bytes] = []
+
+    for source in sources:
+        certificates.extend(_read_ca_source(source))
+
+    return _register_certificates(certificates)
+
+
+def _read_ca_file(path: str | os.PathLike[str]) -> list[bytes]:
+    with open(path, "rb") as f:
+        data = f.read()
+
+    return _der.pem_certificates(data) if b"-----BEGIN" in data else _der.split_certificates(data)
+
+
+def _read_ca_source(source: bytes | str | os.PathLike[str] | Iterable[bytes]) -> list[bytes]:
+    if isinstance(source, bytes):
+        return _der.pem_certificates(source) if b"-----BEGIN" in source else _der.split_certificates(source)
+
+    if isinstance(source, str) and "-----BEGIN" in source:
+        return _der.pem_certificates(source.encode("ascii", "replace"))
+
+    if isinstance(source, (str, os.PathLike)):
+        if not os.path.isdir(source):
+            try:
+                return _read_ca_file(source)
+            except FileNotFoundError as e:
+                raise ValueError(f"neither PEM content nor the path of a CA file or directory: {source!r}") from e
+
+        certificates: list[bytes] = []
+
+        for entry in sorted(os.scandir(source), key=lambda e: e.name):
+            if not entry.is_file():
+                continue
+
+            # Each file on its own: a DER key or CRL is framed like a certificate.
+            try:
+                found = _read_ca_file(entry.path)
+                if found:
+                    _ensure_loadable(found)
+            except ValueError:  # e.g. a CRL or a README alongside the certificates
+                continue
+
+            certificates.extend(found)
+
+        return certificates
+
+    return [bytes(der) for der in source]
+
+
+def _register_certificates(certificates: Iterable[bytes]) -> int:
     with _USER_APPEND_CA_LOCK:
-        if isinstance(pem_or_der_certificate, str):
-            pem_or_der_certificate = ssl.PEM_cert_to_DER_cert(pem_or_der_certificate)
+        registered = set(_MANUALLY_REGISTERED_CA)
+        added = [der for der in dict.fromkeys(certificates) if der not in registered]
 
-        if pem_or_der_certificate not in _MANUALLY_REGISTERED_CA:
-            _MANUALLY_REGISTERED_CA.append(pem_or_der_certificate)
+        if not added:
+            return 0
 
-            root_pem_certificates.cache_clear()
+        # Before anything is touched: all or nothing.
+        _ensure_loadable(added)
+
+        _MANUALLY_REGISTERED_CA.extend(added)
+
+        if _VALIDITY_FILTER or _COLLAPSE_REISSUED_ROOTS:
+            now = time.time()
+            periods = [(der, _validity_period(der)) for der in added]
+            added_valid = [
+                der for der, period in periods if not _VALIDITY_FILTER or period is None or period[0] <= now <= period[1]
+            ]
+
+            # The next validity change may move, or a variant be superseded: let the next call rescan.
+            # Order matters: PEM is derived from DER. Clearing PEM first would let a
+            # concurrent reader re-cache PEM from the not-yet-cleared DER entry.
             root_der_certificates.cache_clear()
+            root_pem_certificates.cache_clear()
+        else:
+            added_valid = added
+            _merge_into_cached_snapshots(added)
+
+        _load_into_issued_ssl_contexts(None, added_valid)
+
+    return len(added)
+
+
+def _ensure_loadable(certificates: list[bytes]) -> None:
+    """Raise ``ValueError`` unless OpenSSL loads every one of ``certificates``, tried on a scratch context."""
+    try:
+        ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT).load_verify_locations(cadata=_cadata(certificates))
+    except ssl.SSLError as e:
+        raise ValueError(f"not a certificate OpenSSL can load: {e}") from e
+
+
+def _merge_into_cached_snapshots(added: list[bytes]) -> None:
+    """Add freshly registered CAs to the cached snapshots, as a rescan would, without rescanning."""
+    merged: dict[tuple[Any, ...], tuple[list[bytes], list[bytes]] | None] = {}
+
+    def merge_der(key: tuple[Any, ...], certificates: list[bytes]) -> list[bytes]:
+        present = set(certificates)
+        missing = [der for der in added if der not in present]
+
+        if not missing:
+            merged[key] = None
+            return certificates
+
+        result = sorted(certificates + missing)
+        merged[key] = (certificates, result)
+
+        return result
+
+    def merge_pem(key: tuple[Any, ...], pem_certificates: list[str]) -> list[str] | None:
+        if key not in merged:
+            return None  # Defensive: the DER entry expired meanwhile, recompute both
+
+        change = merged[key]
+
+        if change is None:
+            return pem_certificates
+
+        previous, result = change
+
+        if len(previous) != len(pem_certificates):
+            return None  # Defensive: already derived from the merged DER, recompute it
+
+        pem_by_der = dict(zip(previous, pem_certificates))
+
+        return [pem_by_der.get(der) or ssl.DER_cert_to_PEM_cert(der) for der in result]
 
+    # Order matters: PEM is derived from DER. Updating PEM first would let a
+    # concurrent reader re-cache PEM from the not-yet-updated DER entry.
+    root_der_certificates.cache_transform(merge_der)
+    root_pem_certificates.cache_transform(merge_pem)
 
-def create_default_ssl_context(hybrid_store: bool = False) -> ssl.SSLContext:
+
+#: hybrid_store -> (DER snapshot, its fingerprint)
+_SNAPSHOT_FINGERPRINTS: dict[bool, tuple[list[bytes], str]] = {}
+
+
+def _snapshot_fingerprint(hybrid_store: bool) -> tuple[list[bytes], str]:
+    """Return the current DER snapshot along with its fingerprint, both
+    guaranteed to describe the same content."""
+    hybrid_store = bool(hybrid_store)
+    certificates = root_der_certificates(hybrid_store)
+
+    cached = _SNAPSHOT_FINGERPRINTS.get(hybrid_store)
+
+    if cached is not None and cached[0] is certificates:
+        return cached
+
+    cached = (certificates, _fingerprint(certificates))
+    _SNAPSHOT_FINGERPRINTS[hybrid_store] = cached
+
+    return cached
+
+
+_SNAPSHOT_CERTIFICATES: dict[bool, tuple[list[bytes], list[Certificate]]] = {}
+
+
+def _snapshot_certificates(hybrid_store: bool) -> tuple[list[bytes], list[Certificate]]:
+    """Return the current DER snapshot along with its :class:`Certificate` wrappers."""
+    hybrid_store = bool(hybrid_store)
+    certificates = root_der_certificates(hybrid_store)
+
+    cached = _SNAPSHOT_CERTIFICATES.get(hybrid_store)
+
+    if cached is not None and cached[0] is certificates:
+        return cached
+
+    cached = (certificates, [Certificate(der) for der in certificates])
+    _SNAPSHOT_CERTIFICATES[hybrid_store] = cached
+
+    return cached
+
+
+def root_certificates(hybrid_store: bool = False) -> list[Certificate]:
     """
-    Instantiate a native SSLContext (client purposes) that ships with your system root CAs.
-    In addition to that, assign it the default OpenSSL ciphers suite and set
-    TLS 1.2 as the minimum supported version. Also disable commonName check and enforce
-    hostname altName verification. The Mozilla Recommended Cipher Suite is used instead of system default.
+    Like :func:`root_der_certificates`, each DER wrapped in a lazily parsed :class:`Certificate`
+    exposing its subject, issuer, validity, subject key identifier, etc.
+
+    The wrappers are made once per trust store snapshot and then handed out again, so
+    whatever was decoded from a given certificate is decoded only once.
+    """
+    return list(_snapshot_certificates(hybrid_store)[1])
+
+
+def embedded_roots() -> tuple[EmbeddedRoot, ...]:
+    """
+    Metadata of the embedded CCADB roots (see ``hybrid_store``), in the order of the bundle:
+    owner, common name, SHA-256 and SHA-1 fingerprints, validity bounds (POSIX timestamps)
+    and public key type, e.g. ``RSA 4096`` or ``EC P-384``.
+
+    It was computed when the bundle was generated, so nothing is parsed nor hashed here.
+    """
+    from ._os._embed_index import CCADB_INDEX
+
+    return CCADB_INDEX
+
+
+_SNAPSHOT_INDEXES: dict[bool, tuple[list[bytes], CertificateIndex]] = {}
+
+
+def trust_store_index(hybrid_store: bool = False) -> CertificateIndex:
+    """
+    Return a :class:`CertificateIndex` over :func:`root_certificates`, answering
+    "is this DER a trust anchor?", "which roots have this subject, this key identifier
+    or this fingerprint?" in constant time. Registered CAs are included, and so is the
+    CCADB bundle when merged (see ``hybrid_store``).
+
+    It is built once per trust store snapshot and rebuilt only when the store changes,
+    so fetch it again rather than keeping it around.
 
     See :func:`root_der_certificates` for the meaning of ``hybrid_store``.
     """
-    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    hybrid_store = bool(hybrid_store)
+    certificates, wrapped = _snapshot_certificates(hybrid_store)
 
-    ctx.load_verify_locations(cadata=generate_ca_bundle(hybrid_store=hybrid_store))
+    cached = _SNAPSHOT_INDEXES.get(hybrid_store)
 
-    ctx.minimum_version = ssl.TLSVersion.TLSv1_2
-    ctx.set_ciphers(MOZ_INTERMEDIATE_CIPHERS)
-    ctx.verify_mode = ssl.CERT_REQUIRED
+    if cached is not None and cached[0] is certificates:
+        return cached[1]
 
-    try:
-        ctx.hostname_checks_common_name = False
-    except AttributeError:
-        pass
+    index = CertificateIndex(wrapped)
+    _SNAPSHOT_INDEXES[hybrid_store] = (certificates, index)
 
-    try:
-        ctx.check_hostname = True
-    except AttributeError:  # Defensive: very old 3.7 branch
-        pass
+    return index
 
-    return ctx
+
+def trust_store_fingerprint(hybrid_store: bool = False) -> str:
+    """
+    Return a stable fingerprint of your trust store content: the hexadecimal SHA-256
+    over the sorted set of DER certificates, as returned by :func:`root_der_certificates`.
+
+    Two processes, or two hosts, trusting the same set of CAs get the same fingerprint.
+    Use it as a cache key for anything derived from the trust store (SSLContexts,
+    on-disk bundles, ...) and skip rebuilding it when nothing changed.
+
+    See :func:`root_der_certificates` for the meaning of ``hybrid_store``.
+    """
+    return _snapshot_fingerprint(hybrid_store)[1]
+
+
+#: fingerprint -> path of an on-disk CA bundle known to hold the matching content
+_BUNDLE_FILES: dict[str, str] = {}
+_BUNDLE_FILES_LOCK = RLock()
+
+
+def where(hybrid_store: bool = False) -> str:
+    """
+    Return the path of a CA bundle file, the on-disk version of :func:`generate_ca_bundle`,
+    like ``certifi.where()`` does. For tools that expect a file: subprocesses (curl, git),
+    ``REQUESTS_CA_BUNDLE``, OpenSSL ``cafile=``, etc.
+
+    The file is named after the trust store fingerprint and lives in a per-user cache
+    directory (override it with the ``WASSIMA_CACHE_DIR`` environment variable).
+    It is written once, atomically, and then shared by every process trusting the
+    same set of CAs. A new file appears only when the trust store content changes.
+    Never modify it.
+
+    See :func:`root_der_certificates` for the meaning of ``hybrid_store``.
+    """
+    certificates, fingerprint = _snapshot_fingerprint(hybrid_store)
+
+    path = _BUNDLE_FILES.get(fingerprint)
+
+    if path is not None and os.path.exists(path):
+        return path
+
+    with _BUNDLE_FILES_LOCK:
+        content = "\n\n".join(ssl.DER_cert_to_PEM_cert(c) for c in certificates).encode("ascii")
+        path = os.path.join(_bundle.cache_directory(), f"ca-bundle-{fingerprint[:32]}.pem")
+
+        # Another process may have written it already. Check, never blindly trust, it.
+        if not _bundle.has_content(path, content):
+            _bundle.write_atomically(path, content)
+
+        _BUNDLE_FILES[fingerprint] = path
+
+    return path
+
+
+_CA_DIRECTORIES: dict[str, str] = {}
+
+
+def ca_directory(hybrid_store: bool = False) -> str:
+    """
+    Return the path of a hashed CA directory, as ``c_rehash`` lays them out, for OpenSSL
+    ``capath=``. It holds one PEM file per certificate, named after its subject name hash
+    (``<hash>.<n>``), so that OpenSSL only loads the CAs a given handshake actually
+    needs, when it needs them. See ``create_default_ssl_context(lazy=True)``.
+
+    It is content-addressed and shared like the file from :func:`where`. Never modify it.
+    Certificates whose subject cannot be read are left out.
+
+    See :func:`root_der_certificates` for the meaning of ``hybrid_store``.
+    """
+    certificates, fingerprint = _snapshot_fingerprint(hybrid_store)
+
+    path = _CA_DIRECTORIES.get(fingerprint)
+
+    if path is not None and os.path.isdir(path):
+        return path
+
+    with _BUNDLE_FILES_LOCK:
+        files: dict[str, bytes] = {}
+
+        for certificate in certificates:
+            try:
+                name_hash = _der.subject_name_hash(certificate)
+            except ValueError:  # Unreadable, OpenSSL could not look it up by subject either.
+                continue
+
+            n = 0
+            # Several CAs may share a subject (e.g. cross-signed, renewed).
+            while f"{name_hash}.{n}" in files:
+                n += 1
+            files[f"{name_hash}.{n}"] = ssl.DER_cert_to_PEM_cert(certificate).encode("ascii")
+
+        path = os.path.join(_bundle.cache_directory(), f"capath-{fingerprint[:32]}")
+
+        if not _bundle.has_directory_content(path, files):
+            _bundle.write_directory_atomically(path, files)
+
+        _CA_DIRECTORIES[fingerprint] = path
+
+    return path
+
+
+def trust_store_token() -> str:
+    """
+    Return an opaque token describing the current state of your system trust store.
+    It is computed from directory, file (or registry keys) metadata only: nothing
+    is read nor parsed, so it is cheap enough to be polled frequently.
+
+    Keep it along with what you loaded, then ask :func:`trust_store_changed` later
+    on and reload only when it says so. CAs registered with :func:`register_ca`
+    are accounted for too.
+    """
+    frozen = _frozen_trust_store()
+    metadata: Any = _trust_store_metadata()[0] if frozen is None else ("frozen", len(frozen))
+
+    return hashlib.sha256(repr((metadata, len(_MANUALLY_REGISTERED_CA))).encode()).hexdigest()
+
+
+def trust_store_changed(token: str) -> bool:
+    """
+    Tell whether the trust store changed since ``token`` was obtained
+    through :func:`trust_store_token`. Metadata only, see the latter.
+    """
+    return trust_store_token() != token
+
+
+#: Whether OpenSSL accepts concatenated DER certificates as ``cadata=``, see _cadata
+_DER_CADATA: bool | None = None
+
+
+def _cadata(certificates: Iterable[bytes]) -> str | bytes:
+    """Make ``certificates`` ready for ``load_verify_locations(cadata=...)``. Concatenated DER
+    is preferred, no PEM round trip. Python 3.7 built against OpenSSL 3 mistakes the end of
+    DER data for an error: it is given PEM then, found out once with a known good CA."""
+    global _DER_CADATA
+
+    if _DER_CADATA is None:
+        try:
+            ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT).load_verify_locations(cadata=fallback_der_certificates()[0])
+        except ssl.SSLError:  # Defensive: depends on the Python and OpenSSL builds
+            _DER_CADATA = False
+        else:
+            _DER_CADATA = True
+
+    if _DER_CADATA:
+        return b"".join(certificates)
+
+    return "\n".join(ssl.DER_cert_to_PEM_cert(der) for der in certificates)  # Defensive: see above
+
+
+def _new_client_context(
+    cadata: str | bytes | None = None,
+    capath: str | None = None,
+    context_class: type[_C] = ssl.SSLContext,  # type: ignore[assignment]
+) -> _C:
+    """Build a client SSLContext trusting ``cadata`` (or ``capath``) with the wassima defaults.
+    When neither is given, no CA is loaded (yet)."""
+    ctx = context_class(ssl.PROTOCOL_TLS_CLIENT)
+
+    if cadata is not None or capath is not None:
+        ctx.load_verify_locations(cadata=cadata, capath=capath)
+
+    ctx.minimum_version = ssl.TLSVersion.TLSv1_2
+    ctx.set_ciphers(MOZ_INTERMEDIATE_CIPHERS)
+    ctx.verify_mode = ssl.CERT_REQUIRED
+
+    try:
+        ctx.hostname_checks_common_name = False
+    except AttributeError:
+        pass
+
+    try:
+        ctx.check_hostname = True
+    except AttributeError:  # Defensive: very old 3.7 branch
+        pass
+
+    return ctx
+
+
+class _DeferredSSLContext(ssl.SSLContext):
+    """A client context whose trust anchors are only loaded when it is first used
+    (``wrap_socket``, ``wrap_bio``, or when asked which CAs it trusts). Exactly once,
+    whatever the number of threads racing for it."""
+
+    _wassima_hybrid_store: bool
+    _wassima_lock: RLock
+    _wassima_loaded: bool
+
+    def _load_trust_anchors(self) -> None:
+        if self._wassima_loaded:
+            return
+
+        with self._wassima_lock:
+            if self._wassima_loaded:  # Defensive: another thread loaded them meanwhile
+                return
+
+            _, cadata, certificates = _snapshot_cadata(self._wassima_hybrid_store)
+            self.load_verify_locations(cadata=cadata)
+            _track_ssl_context(self, self._wassima_hybrid_store, certificates)
+
+            self._wassima_loaded = True
+
+    def wrap_socket(self, *args: Any, **kwargs: Any) -> ssl.SSLSocket:
+        self._load_trust_anchors()
+        return super().wrap_socket(*args, **kwargs)
+
+    def wrap_bio(self, *args: Any, **kwargs: Any) -> ssl.SSLObject:
+        self._load_trust_anchors()
+        return super().wrap_bio(*args, **kwargs)
+
+    def get_ca_certs(self, binary_form: bool = False) -> Any:
+        self._load_trust_anchors()
+        return super().get_ca_certs(binary_form)
+
+    def cert_store_stats(self) -> dict[str, int]:
+        self._load_trust_anchors()
+        return super().cert_store_stats()
+
+
+def create_default_ssl_context(hybrid_store: bool = False, lazy: bool = False, deferred: bool = False) -> ssl.SSLContext:
+    """
+    Instantiate a native SSLContext (client purposes) that ships with your system root CAs.
+    In addition to that, assign it the default OpenSSL ciphers suite and set
+    TLS 1.2 as the minimum supported version. Also disable commonName check and enforce
+    hostname altName verification. The Mozilla Recommended Cipher Suite is used instead of system default.
+
+    When ``lazy`` is ``True``, no CA is loaded upfront: the context points at
+    :func:`ca_directory` and OpenSSL loads the CAs it needs during handshakes.
+    Construction is much cheaper, but ``get_ca_certs()`` only lists what was loaded so far.
+
+    When ``deferred`` is ``True``, the context is configured at once but the trust store is
+    neither scanned nor loaded until the context is first used (``wrap_socket``, ``wrap_bio``),
+    so that clients built at startup and never used cost next to nothing.
+
+    See :func:`root_der_certificates` for the meaning of ``hybrid_store``.
+    """
+    if lazy and deferred:
+        raise ValueError("lazy and deferred are mutually exclusive")
+
+    if lazy:
+        return _new_client_context(capath=ca_directory(hybrid_store=hybrid_store))
+
+    if deferred:
+        ctx = _new_client_context(context_class=_DeferredSSLContext)
+        ctx._wassima_hybrid_store = bool(hybrid_store)
+        ctx._wassima_lock = RLock()
+        ctx._wassima_loaded = False
+
+        return ctx
+
+    certificates = root_der_certificates(hybrid_store)
+    ctx = _new_client_context("\n\n".join(root_pem_certificates(hybrid_store)))
+
+    _track_ssl_context(ctx, bool(hybrid_store), certificates)
+
+    return ctx
+
+
+#: Every context wassima loaded CAs into -> (hybrid_store, the CAs it trusts)
+_ISSUED_SSL_CONTEXTS: WeakKeyDictionary[ssl.SSLContext, tuple[bool, frozenset[bytes]]] = WeakKeyDictionary()
+_ISSUED_SSL_CONTEXTS_LOCK = RLock()
+
+
+def _track_ssl_context(ctx: ssl.SSLContext, hybrid_store: bool, certificates: Iterable[bytes]) -> None:
+    with _ISSUED_SSL_CONTEXTS_LOCK:
+        _ISSUED_SSL_CONTEXTS[ctx] = (hybrid_store, frozenset(certificates))
+
+
+def _load_into_issued_ssl_contexts(hybrid_store: bool | None, certificates: Iterable[bytes]) -> None:
+    """Add to every context issued for ``hybrid_store`` (``None`` for all of them) the
+    ``certificates`` it does not trust yet. OpenSSL cannot unload a CA: removals are
+    never applied to a live context. A context failing to load them is reported, and
+    left as it was, without preventing the others from receiving them."""
+    certificates = frozenset(certificates)
+
+    with _ISSUED_SSL_CONTEXTS_LOCK:
+        for ctx, (flavor, trusted) in list(_ISSUED_SSL_CONTEXTS.items()):
+            if hybrid_store is not None and flavor != hybrid_store:
+                continue
+
+            added = certificates - trusted
+
+            if not added:
+                continue
+
+            try:
+                ctx.load_verify_locations(cadata=_cadata(sorted(added)))
+            except ssl.SSLError as e:
+                warnings.warn(
+                    f"wassima could not load {len(added)} new CA(s) into {ctx!r}: {e!r}",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+                continue
+
+            _ISSUED_SSL_CONTEXTS[ctx] = (flavor, trusted | added)
+
+
+def _fingerprint(certificates: Iterable[bytes]) -> str:
+    """SHA-256 over the sorted DER set, regardless of order or duplicates.
+    DER is self-delimiting, so a plain concatenation is unambiguous."""
+    digest = hashlib.sha256()
+
+    for der in sorted(set(certificates)):
+        digest.update(der)
+
+    return digest.hexdigest()
+
+
+#: hybrid_store -> (DER snapshot it was built from, its fingerprint, the shared context)
+_SHARED_SSL_CONTEXTS: dict[bool, tuple[list[bytes], str, ssl.SSLContext]] = {}
+_SHARED_SSL_CONTEXTS_LOCK = RLock()
+
+
+def _refresh_shared_ssl_context(
+    hybrid_store: bool, certificates: list[bytes], fingerprint: str | None = None
+) -> ssl.SSLContext:
+    """Bind the shared context to ``certificates``. Only rebuild it if the content changed."""
+    if fingerprint is None:
+        fingerprint = _fingerprint(certificates)
+
+    with _SHARED_SSL_CONTEXTS_LOCK:
+        cached = _SHARED_SSL_CONTEXTS.get(hybrid_store)
+
+        if cached is not None and cached[1] == fingerprint:
+            ctx = cached[2]
+        elif cached is not None and set(cached[0]).issubset(certificates):
+            # Only additions: load them into the live context, warm sessions survive.
+            ctx = cached[2]
+            _load_into_issued_ssl_contexts(hybrid_store, certificates)
+        else:
+            ctx = _new_client_context("\n\n".join(ssl.DER_cert_to_PEM_cert(c) for c in certificates))
+            _track_ssl_context(ctx, hybrid_store, certificates)
+
+        _SHARED_SSL_CONTEXTS[hybrid_store] = (certificates, fingerprint, ctx)
+
+    return ctx
+
+
+def shared_ssl_context(hybrid_store: bool = False, progressive: bool = False) -> ssl.SSLContext:
+    """
+    Return a process-wide SSLContext configured like :func:`create_default_ssl_context`.
+    It is built once per trust store content and handed to every caller, thus it
+    MUST NOT be mutated (e.g. ``load_cert_chain``). Create your own context for that.
+
+    The context is only rebuilt when the trust store content actually changes.
+    When the background refresher is running (see :func:`start_background_refresh`),
+    that happens off the request path and trust store listeners are notified.
+
+    When ``progressive`` is ``True`` and the trust store was not loaded yet, do not wait
+    for it: the trust store is scanned in a background thread while a context trusting
+    the embedded CCADB bundle (and registered CAs) is returned right away. Once the scan
+    completes, the real shared context is handed out and trust store listeners are notified.
+    Meant for latency-sensitive boot paths (health checks, configuration fetches, etc.).
+    Later on, when the cached trust store expires, the current shared context keeps being
+    returned while the trust store is rescanned in the background.
+
+    See :func:`root_der_certificates` for the meaning of ``hybrid_store``.
+    """
+    hybrid_store = bool(hybrid_store)
+    cached = _SHARED_SSL_CONTEXTS.get(hybrid_store)
+
+    if progressive and root_der_certificates.cache_peek((hybrid_store,)) is None:
+        _start_progressive_scan(hybrid_store)
+
+        # Only on cold start: once expired, the current context is kept until the rescan completes.
+        return _embedded_ssl_context() if cached is None else cached[2]
+
+    certificates = root_der_certificates(hybrid_store)
+
+    if cached is not None and cached[0] is certificates:
+        return cached[2]
+
+    return _refresh_shared_ssl_context(hybrid_store, certificates)
+
+
+#: (registered CAs it trusts, the context made of the embedded bundle and them)
+_EMBEDDED_SSL_CONTEXT: tuple[tuple[bytes, ...], ssl.SSLContext] | None = None
+_PROGRESSIVE_SCANS: dict[bool, Thread] = {}
+_PROGRESSIVE_SCANS_LOCK = RLock()
+
+
+def _embedded_ssl_context() -> ssl.SSLContext:
+    """A context trusting the embedded CCADB bundle, plus registered CAs. No scan needed.
+    Built once, and again only if the registered CAs changed: the embedded bundle never does."""
+    global _EMBEDDED_SSL_CONTEXT
+
+    registered = tuple(_MANUALLY_REGISTERED_CA)  # snapshot
+    cached = _EMBEDDED_SSL_CONTEXT
+
+    if cached is not None and cached[0] == registered:
+        return cached[1]
+
+    certificates = fallback_der_certificates()
+    seen = set(certificates)
+    certificates.extend(c for c in registered if c not in seen)
+
+    ctx: ssl.SSLContext = _new_client_context("\n\n".join(ssl.DER_cert_to_PEM_cert(c) for c in certificates))
+    # Only ever needed during startup, no point keeping older ones.
+    _EMBEDDED_SSL_CONTEXT = (registered, ctx)
+
+    return ctx
+
+
+def _progressive_scan(hybrid_store: bool) -> None:
+    previous = _SHARED_SSL_CONTEXTS.get(hybrid_store)
+
+    try:
+        certificates = root_der_certificates(hybrid_store)
+        fingerprint = _fingerprint(certificates)
+        _refresh_shared_ssl_context(hybrid_store, certificates, fingerprint)
+    except Exception as e:  # The next non-progressive call will surface it too.
+        warnings.warn(f"wassima trust store scan failed: {e!r}", RuntimeWarning, stacklevel=1)
+        return
+
+    _KNOWN_FINGERPRINTS[hybrid_store] = fingerprint
+
+    if previous is not None and previous[1] == fingerprint:
+        return  # A rescan after expiry, nothing changed.
+
+    # Pools holding the temporary context may now switch to the real one.
+    _notify_trust_store_listeners(hybrid_store, fingerprint)
+
+
+def _start_progressive_scan(hybrid_store: bool) -> None:
+    with _PROGRESSIVE_SCANS_LOCK:
+        scan = _PROGRESSIVE_SCANS.get(hybrid_store)
+
+        if scan is not None and scan.is_alive():
+            return
+
+        scan = Thread(target=_progressive_scan, args=(hybrid_store,), name="wassima-progressive-scan", daemon=True)
+        _PROGRESSIVE_SCANS[hybrid_store] = scan
+        scan.start()
+
+
+#: Subset contexts, keyed by the fingerprint of the CAs they trust. Oldest evicted first.
+_SUBSET_SSL_CONTEXTS: dict[str, ssl.SSLContext] = {}
+_SUBSET_SSL_CONTEXTS_LOCK = RLock()
+_SUBSET_SSL_CONTEXTS_MAXSIZE = 64
+
+
+def subset_ssl_context(
+    fingerprints: Iterable[str] | None = None,
+    subjects: Iterable[str | bytes] | None = None,
+    predicate: Callable[[Certificate], bool] | None = None,
+    hybrid_store: bool = False,
+) -> ssl.SSLContext:
+    """
+    Return a shared SSLContext configured like :func:`create_default_ssl_context` but
+    trusting only a subset of the trust store: much smaller and quicker to build
+    when a client only ever talks to services chaining up to a handful of roots.
+
+    The subset is made of the CAs matching any of the ``fingerprints`` (SHA-256 or SHA-1)
+    or ``subjects`` (see :meth:`CertificateIndex.by_subject`), or every CA when neither is
+    given, then narrowed down to those for which ``predicate(certificate)`` is true, if any.
+    ``ValueError`` is raised if nothing matches.
+
+    Contexts are memoized by the fingerprint of the subset, so that every client
+    selecting the same CAs shares a single context. As such it MUST NOT be mutated.
+
+    See :func:`root_der_certificates` for the meaning of ``hybrid_store``.
+    """
+    index = trust_store_index(hybrid_store)
+
+    if fingerprints is None and subjects is None:
+        candidates = list(index)
+    else:
+        candidates = []
+
+        for fingerprint in fingerprints or ():
+            certificate = index.by_fingerprint(fingerprint)
+            if certificate is not None:
+                candidates.append(certificate)
+
+        for subject in subjects or ():
+            candidates.extend(index.by_subject(subject))
+
+    if predicate is not None:
+        candidates = [certificate for certificate in candidates if predicate(certificate)]
+
+    if not candidates:
+        raise ValueError("no certificate in the trust store matches the given selection")
+
+    certificates = sorted({certificate.der for certificate in candidates})
+
+    return _memoized_ssl_context(certificates, _fingerprint(certificates))
+
+
+def _memoized_ssl_context(certificates: list[bytes], fingerprint: str) -> ssl.SSLContext:
+    """A shared context trusting exactly ``certificates``, built once per ``fingerprint``."""
+    global _SUBSET_SSL_CONTEXTS
+
+    ctx = _SUBSET_SSL_CONTEXTS.get(fingerprint)
+
+    if ctx is not None:
+        return ctx
+
+    with _SUBSET_SSL_CONTEXTS_LOCK:
+        ctx = _SUBSET_SSL_CONTEXTS.get(fingerprint)
+
+        if ctx is None:
+            ctx = _new_client_context("\n\n".join(ssl.DER_cert_to_PEM_cert(der) for der in certificates))
+
+            contexts = dict(_SUBSET_SSL_CONTEXTS)
+            contexts[fingerprint] = ctx
+
+            while len(contexts) > _SUBSET_SSL_CONTEXTS_MAXSIZE:
+                del contexts[next(iter(contexts))]
+
+            # Copy-on-write, readers above never hold the lock.
+            _SUBSET_SSL_CONTEXTS = contexts
+
+    return ctx
+
+
+class TrustOverlay:
+    """
+    The trust store plus extra CAs, for whoever holds this object only: e.g. a tenant
+    specific CA trusted while serving that tenant. Unlike :func:`register_ca`, nothing
+    global is touched, the cached trust store is merely read.
+
+    ``sources`` are read once, as :func:`register_cas` does. Results are recomputed only
+    when the trust store changes, and contexts are shared between overlays trusting the
+    same CAs (memoized by fingerprint). As such, they MUST NOT be mutated.
+
+    See :func:`root_der_certificates` for the meaning of ``hybrid_store``.
+    """
+
+    __slots__ = ("extra_certificates", "hybrid_store", "_snapshot")
+
+    _snapshot: tuple[list[bytes], list[bytes], str]
+
+    def __init__(self, *sources: bytes | str | os.PathLike[str] | Iterable[bytes], hybrid_store: bool = False) -> None:
+        certificates: list[bytes] = []
+
+        for source in sources:
+            certificates.extend(_read_ca_source(source))
+
+        self.extra_certificates: tuple[bytes, ...] = tuple(dict.fromkeys(certificates))
+        self.hybrid_store = bool(hybrid_store)
+
+    def __repr__(self) -> str:
+        return f"<TrustOverlay +{len(self.extra_certificates)} CA(s), hybrid_store={self.hybrid_store}>"
+
+    def _merged(self) -> tuple[list[bytes], list[bytes], str]:
+        base = root_der_certificates(self.hybrid_store)
+
+        try:
+            snapshot = self._snapshot
+        except AttributeError:
+            pass
+        else:
+            if snapshot[0] is base:
+                return snapshot
+
+        present = set(base)
+        extra = [der for der in self.extra_certificates if der not in present]
+
+        if extra and _VALIDITY_FILTER:
+            now = time.time()
+            periods = [(der, _validity_period(der)) for der in extra]
+            extra = [der for der, period in periods if period is None or period[0] <= now <= period[1]]
+
+        certificates = sorted(base + extra) if extra else base
+        fingerprint = _fingerprint(certificates) if extra else _snapshot_fingerprint(self.hybrid_store)[1]
+
+        # Racing threads would compute the very same thing, a single assignment is enough.
+        self._snapshot = (base, certificates, fingerprint)
+
+        return self._snapshot
+
+    def der_certificates(self) -> list[bytes]:
+        """The trust store plus the extra CAs, DER encoded, like :func:`root_der_certificates`."""
+        return list(self._merged()[1])
+
+    def pem_certificates(self) -> list[str]:
+        """The trust store plus the extra CAs, PEM encoded, like :func:`root_pem_certificates`."""
+        return [ssl.DER_cert_to_PEM_cert(der) for der in self._merged()[1]]
+
+    def fingerprint(self) -> str:
+        """Like :func:`trust_store_fingerprint`, for the trust store plus the extra CAs."""
+        return self._merged()[2]
+
+    def ssl_context(self) -> ssl.SSLContext:
+        """A shared SSLContext, configured like :func:`create_default_ssl_context`, trusting
+        the trust store plus the extra CAs."""
+        base, certificates, fingerprint = self._merged()
+
+        if certificates is base:
+            # Nothing to add (anymore), no need for another context.
+            return shared_ssl_context(self.hybrid_store)
+
+        return _memoized_ssl_context(certificates, fingerprint)
+
+
+class TrustStore:
+    """
+    An independent trust store, with its own sources, registered CAs, cache TTL and
+    SSLContexts. Meant for components that must not step on each other, e.g. in a
+    multi-tenant service: registering a CA, changing the TTL or refreshing one
+    instance leaves the others, and the module-level functions, untouched.
+
+    ``sources`` are callables returning DER certificates, merged (without duplicates)
+    in order. By default, the instance scans the system trust store on its own, on its
+    own cache lifecycle, like :func:`root_der_certificates` would (without the CAs
+    registered globally). Sharing the process-wide scan, and its cache, is explicit:
+    pass ``wassima.root_der_certificates`` as a source. Or your own loaders.
+
+    The module-level functions are not backed by a default instance: they also drive
+    what only exists once per process (the background refresher, :func:`inject`, the
+    node-local daemon client, the validity filter and the contexts they keep up to date).
+
+    See :func:`root_der_certificates` for the meaning of ``hybrid_store``, only used
+    when no ``sources`` are given.
+    """
+
+    def __init__(
+        self,
+        *sources: Callable[[], Iterable[bytes]],
+        hybrid_store: bool = False,
+        cache_ttl: int = DEFAULT_CACHE_TTL_SECONDS,
+    ) -> None:
+        self._sources = sources or (partial(_system_trust_anchors, bool(hybrid_store)),)
+        self._registered: list[bytes] = []
+        self._lock = RLock()
+        self._cache_ttl = DEFAULT_CACHE_TTL_SECONDS
+        self._last_fingerprint: str | None = None
+        self._pem: tuple[list[bytes], list[str]] | None = None
+        self._shared_ssl_context: tuple[str, ssl.SSLContext] | None = None
+
+        def load() -> tuple[list[bytes], str]:
+            certificates = dict.fromkeys(der for source in self._sources for der in source())
+            certificates.update(dict.fromkeys(self._registered))
+
+            merged = sorted(certificates)
+            self._last_fingerprint = fingerprint = _fingerprint(merged)
+
+            return merged, fingerprint
+
+        #: (DER snapshot, its fingerprint), cached like the module-level functions, on our own TTL
+        self._snapshot = _ttl_lru_cache(load, lambda now: now + self._cache_ttl)
+
+        self.set_cache_ttl(cache_ttl)
+
+    def __repr__(self) -> str:
+        return f"<TrustStore {len(self._sources)} source(s), +{len(self._registered)} CA(s), ttl={self._cache_ttl}s>"
+
+    def set_cache_ttl(self, seconds: int) -> None:
+        """Like :func:`set_cache_ttl`, for this instance only."""
+        if not isinstance(seconds, int) or isinstance(seconds, bool):
+            raise TypeError("cache TTL must be an int (seconds)")
+        if seconds < 0:
+            raise ValueError("cache TTL cannot be negative")
+
+        with self._lock:
+            self._cache_ttl = seconds
+            self._snapshot.cache_clear()
+
+    def cache_clear(self) -> None:
+        """Drop the cached snapshot of this instance, the next call reloads its sources."""
+        self._snapshot.cache_clear()
+
+    def refresh(self) -> bool:
+        """Reload the sources now. Return ``True`` if the content changed
+        (or was never loaded before)."""
+        with self._lock:
+            previous = self._last_fingerprint
+            self._snapshot.cache_clear()
+
+            return self._snapshot()[1] != previous
+
+    def der_certificates(self) -> list[bytes]:
+        """Like :func:`root_der_certificates`, for this instance."""
+        return self._snapshot()[0]
+
+    def pem_certificates(self) -> list[str]:
+        """Like :func:`root_pem_certificates`, for this instance."""
+        certificates = self._snapshot()[0]
+        cached = self._pem
+
+        if cached is not None and cached[0] is certificates:
+            return cached[1]
+
+        pem_certificates = [ssl.DER_cert_to_PEM_cert(der) for der in certificates]
+        self._pem = (certificates, pem_certificates)
+
+        return pem_certificates
+
+    def generate_ca_bundle(self) -> str:
+        """Like :func:`generate_ca_bundle`, for this instance."""
+        return "\n\n".join(self.pem_certificates())
+
+    def fingerprint(self) -> str:
+        """Like :func:`trust_store_fingerprint`, for this instance."""
+        return self._snapshot()[1]
+
+    def register_ca(self, pem_or_der_certificate: bytes | str) -> None:
+        """Like :func:`register_ca`, for this instance only."""
+        if isinstance(pem_or_der_certificate, str):
+            pem_or_der_certificate = ssl.PEM_cert_to_DER_cert(pem_or_der_certificate)
+
+        self._register([pem_or_der_certificate])
+
+    def register_cas(self, *sources: bytes | str | os.PathLike[str] | Iterable[bytes]) -> int:
+        """Like :func:`register_cas`, for this instance only."""
+        certificates: list[bytes] = []
+
+        for source in sources:
+            certificates.extend(_read_ca_source(source))
+
+        return self._register(certificates)
+
+    def _register(self, certificates: Iterable[bytes]) -> int:
+        with self._lock:
+            registered = set(self._registered)
+            added = [der for der in dict.fromkeys(certificates) if der not in registered]
+
+            if not added:
+                return 0
+
+            # Before anything is touched: all or nothing.
+            _ensure_loadable(added)
+
+            self._registered.extend(added)
+
+            def merge(key: tuple[Any, ...], snapshot: tuple[list[bytes], str]) -> tuple[list[bytes], str]:
+                present = set(snapshot[0])
+                missing = [der for der in added if der not in present]
+
+                if not missing:
+                    return snapshot
+
+                merged = sorted(snapshot[0] + missing)
+                self._last_fingerprint = fingerprint = _fingerprint(merged)
+
+                return merged, fingerprint
+
+            # Merged in place, the sources are not reloaded.
+            self._snapshot.cache_transform(merge)
+
+        return len(added)
+
+    def create_default_ssl_context(self) -> ssl.SSLContext:
+        """Like :func:`create_default_ssl_context`, trusting this instance."""
+        return _new_client_context(_cadata(self.der_certificates()))
+
+    def shared_ssl_context(self) -> ssl.SSLContext:
+        """Like :func:`shared_ssl_context`, shared by the users of this instance.
+        Rebuilt only when its content changes. It MUST NOT be mutated."""
+        certificates, fingerprint = self._snapshot()
+        cached = self._shared_ssl_context
+
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        with self._lock:
+            cached = self._shared_ssl_context
+
+            if cached is None or cached[0] != fingerprint:
+                cached = (fingerprint, _new_client_context(_cadata(certificates)))
+                self._shared_ssl_context = cached
+
+        return cached[1]
+
+
+#: hybrid_store -> (DER snapshot, the same for ``cadata=``, the same as a set)
+_SNAPSHOT_CADATA: dict[bool, tuple[list[bytes], str | bytes, frozenset[bytes]]] = {}
+
+#: The genuine ``ssl.SSLContext.load_default_certs`` while :func:`inject` is in effect
+_ORIGINAL_LOAD_DEFAULT_CERTS: Callable[..., None] | None = None
+_INJECTED_HYBRID_STORE: bool = False
+_INJECTION_LOCK = RLock()
+
+
+def _snapshot_cadata(hybrid_store: bool) -> tuple[list[bytes], str | bytes, frozenset[bytes]]:
+    """The current DER snapshot, ready to be loaded. Computed once per snapshot."""
+    certificates = root_der_certificates(hybrid_store)
+
+    cached = _SNAPSHOT_CADATA.get(hybrid_store)
+
+    if cached is not None and cached[0] is certificates:
+        return cached
+
+    cached = (certificates, _cadata(certificates), frozenset(certificates))
+    _SNAPSHOT_CADATA[hybrid_store] = cached
+
+    return cached
+
+
+def _injected_load_default_certs(self: ssl.SSLContext, purpose: ssl.Purpose = ssl.Purpose.SERVER_AUTH) -> None:
+    original = _ORIGINAL_LOAD_DEFAULT_CERTS
+
+    if original is None:  # Defensive: extracted meanwhile
+        return ssl.SSLContext.load_default_certs(self, purpose)
+
+    if purpose != ssl.Purpose.SERVER_AUTH:
+        # Verifying clients (server side) is none of our business.
+        return original(self, purpose)
+
+    hybrid_store = _INJECTED_HYBRID_STORE
+    _, cadata, certificates = _snapshot_cadata(hybrid_store)
+
+    self.load_verify_locations(cadata=cadata)
+
+    # Like the contexts wassima creates, receive the CAs added later on.
+    with _ISSUED_SSL_CONTEXTS_LOCK:
+        _ISSUED_SSL_CONTEXTS[self] = (hybrid_store, certificates)
+
+
+def inject(hybrid_store: bool = False) -> None:
+    """
+    Make every SSLContext of the process trust the wassima trust store when asked for
+    the default CAs: ``ssl.create_default_context()``, ``SSLContext.load_default_certs()``,
+    and therefore most third-party HTTP clients. Contexts load the cached DER snapshot
+    directly: the trust store is scanned once for the whole process, no PEM bundle is parsed
+    per context, and CAs added later on (see :func:`register_ca`) reach them as well.
+
+    Only client contexts (``ssl.Purpose.SERVER_AUTH``) are affected. Calling it again
+    only switches ``hybrid_store``. Undo with :func:`extract`.
+
+    See :func:`root_der_certificates` for the meaning of ``hybrid_store``.
+    """
+    global _ORIGINAL_LOAD_DEFAULT_CERTS, _INJECTED_HYBRID_STORE
+
+    with _INJECTION_LOCK:
+        _INJECTED_HYBRID_STORE = bool(hybrid_store)
+
+        if _ORIGINAL_LOAD_DEFAULT_CERTS is None:
+            _ORIGINAL_LOAD_DEFAULT_CERTS = ssl.SSLContext.load_default_certs
+            ssl.SSLContext.load_default_certs = _injected_load_default_certs  # type: ignore[method-assign]
+
+
+def extract() -> None:
+    """
+    Undo :func:`inject`: contexts created from now on load the default CAs the stdlib way.
+    Contexts created meanwhile keep trusting what they loaded. No-op if not injected.
+    """
+    global _ORIGINAL_LOAD_DEFAULT_CERTS
+
+    with _INJECTION_LOCK:
+        if _ORIGINAL_LOAD_DEFAULT_CERTS is not None:
+            ssl.SSLContext.load_default_certs = _ORIGINAL_LOAD_DEFAULT_CERTS  # type: ignore[method-assign]
+            _ORIGINAL_LOAD_DEFAULT_CERTS = None
+
+
+#: Callbacks invoked as ``callback(hybrid_store, fingerprint)`` on trust store change
+_TRUST_STORE_LISTENERS: list[Callable[[bool, str], None]] = []
+_TRUST_STORE_LISTENERS_LOCK = RLock()
+#: Last fingerprint and trust store token observed by the refresher, per hybrid_store
+_KNOWN_FINGERPRINTS: dict[bool, str] = {}
+_KNOWN_TOKENS: dict[bool, str] = {}
+
+
+def add_trust_store_listener(callback: Callable[[bool, str], None]) -> None:
+    """
+    Register a callback invoked as ``callback(hybrid_store, fingerprint)`` whenever a
+    refresh (see :func:`refresh_trust_store`) detects that the trust store content changed.
+    Typically used to rotate the SSLContext of connection pools, e.g. by fetching
+    the new :func:`shared_ssl_context`.
+
+    Callbacks run in the refreshing thread, they should be quick and must not raise.
+    """
+    with _TRUST_STORE_LISTENERS_LOCK:
+        if callback not in _TRUST_STORE_LISTENERS:
+            _TRUST_STORE_LISTENERS.append(callback)
+
+
+def remove_trust_store_listener(callback: Callable[[bool, str], None]) -> None:
+    """Unregister a callback previously given to :func:`add_trust_store_listener`."""
+    with _TRUST_STORE_LISTENERS_LOCK:
+        if callback in _TRUST_STORE_LISTENERS:
+            _TRUST_STORE_LISTENERS.remove(callback)
+
+
+def _notify_trust_store_listeners(hybrid_store: bool, fingerprint: str) -> None:
+    for callback in tuple(_TRUST_STORE_LISTENERS):
+        try:
+            callback(hybrid_store, fingerprint)
+        except Exception as e:
+            warnings.warn(
+                f"wassima trust store listener {callback!r} raised {e!r}",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+
+
+def _refresh_trust_store_for(hybrid_store: bool, token: str | None) -> bool:
+    key = (hybrid_store,)
+
+    der_generation = root_der_certificates.cache_generation()
+    pem_generation = root_pem_certificates.cache_generation()
+    previous = root_der_certificates.cache_peek(key)
+
+    def extend_lifetime() -> None:
+        # Unchanged: keep the very same objects, only extend their lifetime.
+        expires_at = _cache_deadline(time.monotonic())
+        root_der_certificates.cache_publish(key, previous, expires_at, der_generation)
+        pem_certificates = root_pem_certificates.cache_peek(key)
+        if pem_certificates is not None:
+            root_pem_certificates.cache_publish(key, pem_certificates, expires_at, pem_generation)
+
+    if (
+        previous is not None
+        and token is not None
+        and _KNOWN_TOKENS.get(hybrid_store) == token
+        and not _validity_window_elapsed(hybrid_store)
+    ):
+        # Nothing moved on disk (or in the registry) since the last scan.
+        extend_lifetime()
+        return False
+
+    # The expensive part, done without holding any cache lock.
+    certificates = root_der_certificates.__wrapped__(hybrid_store)  # type: ignore[attr-defined]
+    fingerprint = _fingerprint(certificates)
+
+    previous_fingerprint = _fingerprint(previous) if previous is not None else _KNOWN_FINGERPRINTS.get(hybrid_store)
+
+    if previous is not None and previous_fingerprint == fingerprint:
+        extend_lifetime()
+    elif root_der_certificates.cache_publish(key, certificates, _cache_deadline(time.monotonic()), der_generation):
+        root_pem_certificates.cache_publish(
+            key,
+            [ssl.DER_cert_to_PEM_cert(c) for c in certificates],
+            _cache_deadline(time.monotonic()),
+            pem_generation,
+        )
+
+        # Issued contexts already received the new CAs, when they were scanned.
+        if hybrid_store in _SHARED_SSL_CONTEXTS:
+            _refresh_shared_ssl_context(hybrid_store, certificates, fingerprint)
+    else:
+        return False  # Defensive: invalidated meanwhile (e.g. register_ca), our result is outdated.
+
+    _KNOWN_FINGERPRINTS[hybrid_store] = fingerprint
+
+    if token is not None:
+        _KNOWN_TOKENS[hybrid_store] = token
+
+    if previous_fingerprint is None or previous_fingerprint == fingerprint:
+        return False
+
+    _notify_trust_store_listeners(hybrid_store, fingerprint)
+
+    return True
+
+
+def refresh_trust_store(force: bool = False) -> bool:
+    """
+    Rescan the trust store now, for every ``hybrid_store`` flavor in use, and swap in
+    the result only if its content changed. In that case, the shared SSLContext is
+    rebuilt and trust store listeners are notified. Return ``True`` if anything changed.
+
+    The rescan is skipped entirely when :func:`trust_store_token` reports that nothing
+    changed since the previous refresh, unless ``force`` is ``True``.
+
+    This is what the background refresher runs periodically, see :func:`start_background_refresh`.
+    """
+    token = None if force else trust_store_token()
+    changed = False
+
+    for key in sorted(set(root_der_certificates.cache_keys()) | {(False,)}):
+        if _refresh_trust_store_for(bool(key[0]), token):
+            changed = True
+
+    return changed
+
+
+#: Default period (seconds) between two background refreshes.
+DEFAULT_BACKGROUND_REFRESH_INTERVAL: int = 300
+
+
+class _BackgroundRefresher(Thread):
+    def __init__(self, interval: float) -> None:
+        super().__init__(name="wassima-trust-store-refresher", daemon=True)
+        self.interval = interval
+        self.stopped = Event()
+
+    def run(self) -> None:
+        while not self.stopped.is_set():
+            try:
+                refresh_trust_store()
+            except Exception as e:  # Defensive: never let the refresher die silently
+                warnings.warn(f"wassima background refresh failed: {e!r}", RuntimeWarning, stacklevel=1)
+
+            self.stopped.wait(self.interval)
+
+
+_BACKGROUND_REFRESHER: _BackgroundRefresher | None = None
+_BACKGROUND_REFRESHER_LOCK = RLock()
+
+
+def _rearm_cache_ttl() -> None:
+    """Give the refresh lifecycle back to the TTL, keeping what is cached."""
+    expires_at = _cache_deadline(time.monotonic())
+
+    for cached_func in (root_der_certificates, root_pem_certificates):
+        generation = cached_func.cache_generation()
+        for key in cached_func.cache_keys():
+            value = cached_func.cache_peek(key)
+            if value is not None:
+                cached_func.cache_publish(key, value, expires_at, generation)
+
+
+def start_background_refresh(interval: float = DEFAULT_BACKGROUND_REFRESH_INTERVAL) -> None:
+    """
+    Start a daemon thread that calls :func:`refresh_trust_store` every ``interval`` seconds,
+    starting immediately. While it runs, cached results no longer expire on the
+    request path: the cache TTL is superseded by the refresher, so callers never pay
+    for a rescan. Calling it again restarts the refresher with the new interval.
+    """
+    global _BACKGROUND_REFRESHER
+
+    if isinstance(interval, bool) or not isinstance(interval, (int, float)):
+        raise TypeError("refresh interval must be a number (seconds)")
+    if not interval > 0:
+        raise ValueError("refresh interval must be positive")
+
+    with _BACKGROUND_REFRESHER_LOCK:
+        stop_background_refresh()
+
+        _BACKGROUND_REFRESHER = _BackgroundRefresher(interval)
+        _BACKGROUND_REFRESHER.start()
+
+
+def stop_background_refresh() -> None:
+    """
+    Stop the background refresher, if any. Cached results expire again
+    according to the cache TTL (see :func:`set_cache_ttl`).
+    """
+    global _BACKGROUND_REFRESHER
+
+    with _BACKGROUND_REFRESHER_LOCK:
+        refresher = _BACKGROUND_REFRESHER
+
+        if refresher is None:
+            return
+
+        _BACKGROUND_REFRESHER = None
+        refresher.stopped.set()
+
+        if refresher is not current_thread():
+            refresher.join()
+
+        _rearm_cache_ttl()
+
+
+def _warm_up(hybrid_store: bool, contexts: bool) -> dict[str, float]:
+    timings: dict[str, float] = {}
+    started = checkpoint = time.perf_counter()
+
+    def lap(stage: str) -> None:
+        nonlocal checkpoint
+        now = time.perf_counter()
+        timings[stage] = now - checkpoint
+        checkpoint = now
+
+    root_der_certificates(hybrid_store)
+    lap("trust_store")
+
+    root_pem_certificates(hybrid_store)
+    lap("pem_certificates")
+
+    if contexts:
+        shared_ssl_context(hybrid_store)
+        lap("ssl_context")
+
+        if _ORIGINAL_LOAD_DEFAULT_CERTS is not None:
+            _snapshot_cadata(_INJECTED_HYBRID_STORE)
+            lap("injected_cadata")
+
+    timings["total"] = checkpoint - started
+
+    return timings
+
+
+class WarmUp:
+    """A warm-up running in a background thread, see :func:`warm_up`. Join it, or await it."""
+
+    __slots__ = ("_future", "_thread")
+
+    def __init__(self, hybrid_store: bool, contexts: bool) -> None:
+        self._future: Future[dict[str, float]] = Future()
+        self._thread = Thread(target=self._run, args=(hybrid_store, contexts), name="wassima-warm-up", daemon=True)
+        self._thread.start()
+
+    def _run(self, hybrid_store: bool, contexts: bool) -> None:
+        try:
+            self._future.set_result(_warm_up(hybrid_store, contexts))
+        except BaseException as e:
+            self._future.set_exception(e)
+
+    def done(self) -> bool:
+        """Whether the trust store is loaded (or failed to), e.g. for a readiness probe."""
+        return self._future.done()
+
+    def join(self, timeout: float | None = None) -> dict[str, float]:
+        """Wait for the warm-up, return its timings or raise what it raised.
+        Raise ``concurrent.futures.TimeoutError`` if it is still running after ``timeout`` seconds."""
+        return self._future.result(timeout)
+
+    def __await__(self) -> Generator[Any, None, dict[str, float]]:
+        import asyncio
+
+        return asyncio.wrap_future(self._future).__await__()
+
+
+@overload
+def warm_up(hybrid_store: bool = ..., contexts: bool = ..., background: Literal[False] = ...) -> dict[str, float]: ...
+
+
+@overload
+def warm_up(hybrid_store: bool = ..., contexts: bool = ..., *, background: Literal[True]) -> WarmUp: ...
+
+
+def warm_up(hybrid_store: bool = False, contexts: bool = True, background: bool = False) -> dict[str, float] | WarmUp:
+    """
+    Do the work the first TLS connection would otherwise pay for, e.g. during service
+    startup: scan the trust store and fill the caches, then (unless ``contexts`` is
+    ``False``) build the shared SSLContext, and the CA data of injected contexts
+    if :func:`inject` is in effect.
+
+    Return the time spent (seconds) per stage: ``trust_store``, ``pem_certificates``,
+    ``ssl_context``, ``injected_cadata`` when done, and the ``total``.
+
+    When ``background`` is ``True``, return a :class:`WarmUp` at once instead. The work
+    goes on in a thread: ``join()`` it or ``await`` it to get the timings, ask ``done()``
+    to gate a readiness probe on the trust store being loaded.
+
+    See :func:`root_der_certificates` for the meaning of ``hybrid_store``.
+    """
+    hybrid_store = bool(hybrid_store)
+
+    if background:
+        return WarmUp(hybrid_store, contexts)
+
+    return _warm_up(hybrid_store, contexts)
+
+
+def _after_fork_in_child() -> None:
+    """Threads do not survive a fork. Without this, a child of a process running
+    the refresher would keep a cache that never expires."""
+    global _BACKGROUND_REFRESHER
+
+    if _BACKGROUND_REFRESHER is not None:
+        _BACKGROUND_REFRESHER = None
+        _rearm_cache_ttl()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
 
 
 __all__ = (
     "root_der_certificates",
     "root_pem_certificates",
+    "root_certificates",
+    "Certificate",
+    "CertificateIndex",
+    "trust_store_index",
+    "embedded_roots",
     "generate_ca_bundle",
+    "iter_der_certificates",
+    "iter_pem_certificates",
+    "write_ca_bundle",
+    "where",
+    "ca_directory",
     "create_default_ssl_context",
     "register_ca",
+    "register_cas",
     "set_cache_ttl",
+    "set_validity_filter",
+    "set_reissued_roots_collapse",
+    "use_frozen_trust_store",
+    "trust_store_fingerprint",
+    "trust_store_token",
+    "trust_store_changed",
+    "shared_ssl_context",
+    "subset_ssl_context",
+    "TrustOverlay",
+    "TrustStore",
+    "inject",
+    "extract",
+    "refresh_trust_store",
+    "start_background_refresh",
+    "stop_background_refresh",
+    "warm_up",
+    "WarmUp",
+    "add_trust_store_listener",
+    "remove_trust_store_listener",
     "DEFAULT_CACHE_TTL_SECONDS",
+    "DEFAULT_BACKGROUND_REFRESH_INTERVAL",
+    "FROZEN_TRUST_STORE_ENV",
     "__version__",
     "VERSION",
 )
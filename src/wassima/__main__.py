@@ -0,0 +1,131 @@
+"""
+Command line interface, e.g. ``python -m wassima serve`` or ``python -m wassima freeze <path>``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import sys
+
+from . import (
+    DEFAULT_BACKGROUND_REFRESH_INTERVAL,
+    FROZEN_TRUST_STORE_ENV,
+    __version__,
+    _bundle,
+    _daemon,
+    register_cas,
+    root_der_certificates,
+    use_frozen_trust_store,
+)
+
+
+def _serve(args: argparse.Namespace) -> int:
+    path = args.socket or _daemon.default_socket_path()
+
+    try:
+        server = _daemon.create_server(path, args.interval, args.mode)
+    except OSError as e:
+        print(f"wassima: {e}", file=sys.stderr)
+        return 1
+
+    def stop(signum: int, frame: object) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+
+    print(f"wassima {__version__} serving the trust store on {path}", file=sys.stderr)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+        try:
+            os.unlink(path)
+        except OSError:  # Defensive: already removed
+            pass
+
+    return 0
+
+
+def _octal(value: str) -> int:
+    return int(value, 8)
+
+
+def _freeze(args: argparse.Namespace) -> int:
+    # Freeze the live trust store, even if the environment already points at a snapshot.
+    use_frozen_trust_store(None)
+
+    try:
+        register_cas(*args.ca)
+        certificates = root_der_certificates(args.hybrid)
+        _bundle.write_atomically(os.path.abspath(args.path), _bundle.dump_snapshot(certificates))
+    except (OSError, ValueError) as e:
+        print(f"wassima: {e}", file=sys.stderr)
+        return 1
+
+    print(f"wassima {__version__} froze {len(certificates)} certificates into {args.path}", file=sys.stderr)
+
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m wassima", description="Access your OS root certificates.")
+    parser.add_argument("--version", action="version", version=__version__)
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    serve = commands.add_parser(
+        "serve",
+        help="scan the trust store once for the whole node and serve it to other processes over a Unix socket",
+        description="Scan the trust store once for the whole node and serve it to other processes over a Unix "
+        "socket. By default, only the processes of the same user find and may connect to it. To serve other "
+        "users, give a --socket path they can reach (e.g. under /run), a wider --mode (e.g. 660 for a group) "
+        f"and set ${_daemon.DAEMON_SOCKET_ENV} to that path in their environment.",
+    )
+    serve.add_argument(
+        "--socket",
+        help=f"path of the socket (default: ${_daemon.DAEMON_SOCKET_ENV}, or {_daemon.DAEMON_SOCKET_NAME} "
+        "in the wassima cache directory of the current user)",
+    )
+    serve.add_argument(
+        "--mode",
+        type=_octal,
+        default=_daemon.DEFAULT_SOCKET_MODE,
+        help=f"permissions of the socket, in octal (default: {_daemon.DEFAULT_SOCKET_MODE:o})",
+    )
+    serve.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_BACKGROUND_REFRESH_INTERVAL,
+        help="seconds between two trust store refreshes (default: %(default)s)",
+    )
+    serve.set_defaults(handler=_serve)
+
+    freeze = commands.add_parser(
+        "freeze",
+        help=f"write the trust store into a snapshot file, served instead of the live trust store "
+        f"once ${FROZEN_TRUST_STORE_ENV} gives its path (e.g. in read-only images)",
+    )
+    freeze.add_argument("path", help="where to write the snapshot")
+    freeze.add_argument("--hybrid", action="store_true", help="merge the embedded CCADB bundle")
+    freeze.add_argument(
+        "--ca",
+        action="append",
+        default=[],
+        metavar="SOURCE",
+        help="extra CAs: a PEM or DER file, or a directory of those (repeatable)",
+    )
+    freeze.set_defaults(handler=_freeze)
+
+    args = parser.parse_args(argv)
+
+    return args.handler(args)  # type: ignore[no-any-return]
+
+
+if __name__ == "__main__":  # Defensive: tested through main()
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+On-disk artifacts derived from the trust store (e.g. a CA bundle file).
+They are content-addressed: the file name is derived from what it contains, so that
+a file, once written, never changes and can be shared by every process of the user.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import struct
+import sys
+import tempfile
+
+#: Environment variable overriding where wassima writes its on-disk artifacts.
+CACHE_DIRECTORY_ENV: str = "WASSIMA_CACHE_DIR"
+
+#: Layout of the trust store snapshots (``python -m wassima freeze``), shared with the
+#: pre-decoded CCADB bundle (``_os/_embed.der``): this magic, the certificate count then
+#: count + 1 offsets into the payload (unsigned 32-bit big-endian integers), and the
+#: payload itself: the DER certificates, concatenated.
+SNAPSHOT_MAGIC: bytes = b"WSMADER1"
+
+_UINT32 = struct.Struct(">I")
+
+
+def _cache_directory_candidates() -> list[str]:
+    candidates: list[str] = []
+
+    override = os.environ.get(CACHE_DIRECTORY_ENV)
+
+    if override:
+        return [override]
+
+    home = os.path.expanduser("~")
+
+    if sys.platform == "win32":
+        local_app_data = os.environ.get("LOCALAPPDATA")
+        if local_app_data:
+            candidates.append(os.path.join(local_app_data, "wassima", "Cache"))
+    elif sys.platform == "darwin":
+        candidates.append(os.path.join(home, "Library", "Caches", "wassima"))
+    else:
+        xdg_cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(home, ".cache")
+        candidates.append(os.path.join(xdg_cache_home, "wassima"))
+
+    # Read-only or missing home directory (e.g. distroless containers).
+    getuid = getattr(os, "getuid", None)
+    owner = str(getuid()) if getuid is not None else os.environ.get("USERNAME", "default")
+    candidates.append(os.path.join(tempfile.gettempdir(), f"wassima-{owner}"))
+
+    return candidates
+
+
+def _is_usable_directory(path: str) -> bool:
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+    except OSError:
+        return False
+
+    getuid = getattr(os, "getuid", None)
+
+    # In a shared location (e.g. /tmp), never trust a directory someone else owns:
+    # it could serve us a tampered bundle.
+    if getuid is not None and os.stat(path).st_uid != getuid():
+        return False
+
+    return os.access(path, os.W_OK)
+
+
+def cache_directory() -> str:
+    """Return (and create if needed) the directory holding wassima on-disk artifacts.
+
+    Honor the ``WASSIMA_CACHE_DIR`` environment variable, otherwise use the
+    per-user cache directory of the platform, falling back to a per-user
+    directory in the system temporary directory. Those are created private
+    (``0700``): only ``WASSIMA_CACHE_DIR`` can make what is written there
+    readable by other users.
+    """
+    candidates = _cache_directory_candidates()
+
+    for candidate in candidates:
+        if _is_usable_directory(candidate):
+            return candidate
+
+    raise OSError(f"no usable cache directory for wassima among {candidates!r}")
+
+
+def write_atomically(path: str, content: bytes) -> None:
+    """Write ``content`` at ``path`` such that readers never observe a partial file.
+    The content goes to a temporary file in the same directory, then is renamed."""
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(content)
+        # mkstemp creates it private. Bundles and snapshots hold public data only: let the directory
+        # decide who reads them. The default cache directory is private to its user, but a snapshot
+        # frozen into /etc at build time, or a WASSIMA_CACHE_DIR opened on purpose, may be shared.
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:  # Defensive: already renamed or removed
+            pass
+        raise
+
+
+def has_content(path: str, content: bytes) -> bool:
+    """Tell whether the file at ``path`` holds exactly ``content``."""
+    try:
+        if os.path.getsize(path) != len(content):
+            return False
+        with open(path, "rb") as fp:
+            return fp.read() == content
+    except OSError:
+        return False
+
+
+def write_directory_atomically(path: str, files: dict[str, bytes]) -> None:
+    """Create the directory ``path`` holding ``files`` (name to content) such that readers
+    never observe a partially populated directory. It is populated under a temporary
+    name, then renamed. A directory already at ``path`` with other content is replaced."""
+    parent, name = os.path.split(path)
+    tmp_path = tempfile.mkdtemp(dir=parent, prefix=f".{name}.", suffix=".tmp")
+
+    try:
+        for filename, content in files.items():
+            with open(os.path.join(tmp_path, filename), "wb") as fp:
+                fp.write(content)
+            os.chmod(os.path.join(tmp_path, filename), 0o644)
+
+        # mkdtemp creates it private, see write_atomically.
+        os.chmod(tmp_path, 0o755)
+
+        try:
+            os.rename(tmp_path, path)
+            return
+        except OSError:
+            if not os.path.isdir(path):
+                raise  # Defensive: not a name clash, e.g. the parent directory vanished
+
+        if has_directory_content(path, files):
+            # Lost the race against another process writing the very same thing.
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return
+
+        # Non-empty directories cannot be atomically replaced: set
+        # the unexpected one aside first, then remove it.
+        outdated = tempfile.mkdtemp(dir=parent, prefix=f".{name}.", suffix=".old")
+        os.replace(path, os.path.join(outdated, name))
+        os.rename(tmp_path, path)
+        shutil.rmtree(outdated, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+
+def has_directory_content(path: str, files: dict[str, bytes]) -> bool:
+    """Tell whether the directory at ``path`` holds exactly ``files`` (name to content)."""
+    try:
+        if sorted(os.listdir(path)) != sorted(files):
+            return False
+    except OSError:
+        return False
+
+    return all(has_content(os.path.join(path, filename), content) for filename, content in files.items())
+
+
+def dump_snapshot(certificates: list[bytes]) -> bytes:
+    """Serialize DER certificates, see ``SNAPSHOT_MAGIC``."""
+    offsets = [0]
+
+    for der in certificates:
+        offsets.append(offsets[-1] + len(der))
+
+    return b"".join([SNAPSHOT_MAGIC, struct.pack(f">I{len(offsets)}I", len(certificates), *offsets), *certificates])
+
+
+def load_snapshot(data: bytes) -> list[bytes]:
+    """Slice the DER certificates out of a snapshot, without decoding them."""
+    if not data.startswith(SNAPSHOT_MAGIC):
+        raise ValueError("not a wassima trust store snapshot")
+
+    table = len(SNAPSHOT_MAGIC) + _UINT32.size
+
+    try:
+        (count,) = _UINT32.unpack_from(data, len(SNAPSHOT_MAGIC))
+        offsets = struct.unpack_from(f">{count + 1}I", data, table)
+    except struct.error as e:
+        raise ValueError("truncated wassima trust store snapshot") from e
+
+    payload = table + (count + 1) * _UINT32.size
+
+    if offsets[0] != 0 or payload + offsets[-1] != len(data) or list(offsets) != sorted(offsets):
+        raise ValueError("truncated or corrupted wassima trust store snapshot")
+
+    return [data[payload + start : payload + end] for start, end in zip(offsets, offsets[1:])]
+
+
+def read_snapshot(path: str | os.PathLike[str]) -> list[bytes]:
+    """Load the snapshot at ``path``. Raise ``OSError`` or ``ValueError``."""
+    with open(path, "rb") as fp:
+        return load_snapshot(fp.read())
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import hashlib
+import ssl
+from datetime import datetime
+
+from . import _der
+
+_EXTENSIONS = 0xA3
+_SUBJECT_KEY_IDENTIFIER = "2.5.29.14"
+
+#: Names of the most common public key algorithms, as given by OpenSSL.
+_PUBLIC_KEY_ALGORITHMS = {
+    "1.2.840.113549.1.1.1": "rsaEncryption",
+    "1.2.840.113549.1.1.10": "rsassaPss",
+    "1.2.840.10045.2.1": "id-ecPublicKey",
+    "1.3.101.112": "ED25519",
+    "1.3.101.113": "ED448",
+    "1.2.840.10040.4.1": "dsaEncryption",
+}
+
+
+class Certificate:
+    """
+    A read-only view over a DER encoded certificate. Nothing is parsed upfront:
+    each field is decoded from the DER on first access, then kept, so that wrapping
+    a whole trust store is nearly free and you only pay for what you look at.
+
+    Instances are equal (and hash) by their DER content. They may be shared between
+    threads: concurrent first accesses merely decode the same field twice.
+    """
+
+    __slots__ = (
+        "der",
+        "_fields",
+        "_subject",
+        "_issuer",
+        "_not_before",
+        "_not_after",
+        "_subject_key_identifier",
+        "_public_key_algorithm",
+        "_sha256_fingerprint",
+        "_sha1_fingerprint",
+    )
+
+    der: bytes
+    _fields: list[tuple[int, int, int, int]]
+    _subject: str
+    _issuer: str
+    _not_before: datetime
+    _not_after: datetime
+    _subject_key_identifier: bytes | None
+    _public_key_algorithm: str
+    _sha256_fingerprint: str
+    _sha1_fingerprint: str
+
+    def __init__(self, der: bytes) -> None:
+        self.der = der
+
+    def __repr__(self) -> str:
+        return f"<Certificate {self.subject!r}>"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Certificate):
+            return NotImplemented
+        return self.der == other.der
+
+    def __hash__(self) -> int:
+        return hash(self.der)
+
+    def _tbs_fields(self) -> list[tuple[int, int, int, int]]:
+        try:
+            return self._fields
+        except AttributeError:
+            self._fields = _der.tbs_certificate_fields(self.der)
+            return self._fields
+
+    def _field(self, index: int) -> bytes:
+        _, start, _, end = self._tbs_fields()[index]
+
+        return self.der[start:end]
+
+    @property
+    def pem(self) -> str:
+        """The certificate, PEM encoded."""
+        return ssl.DER_cert_to_PEM_cert(self.der)
+
+    @property
+    def subject(self) -> str:
+        """The subject distinguished name, as a RFC 4514 string (e.g. ``CN=Foo,O=Bar,C=US``)."""
+        try:
+            return self._subject
+        except AttributeError:
+            self._subject = _der.decode_name(self.subject_der)
+            return self._subject
+
+    @property
+    def subject_der(self) -> bytes:
+        """The subject distinguished name, DER encoded."""
+        return self._field(4)
+
+    @property
+    def subject_public_key_info(self) -> bytes:
+        """The SubjectPublicKeyInfo (algorithm and public key), DER encoded."""
+        return self._field(5)
+
+    @property
+    def issuer(self) -> str:
+        """The issuer distinguished name, as a RFC 4514 string."""
+        try:
+            return self._issuer
+        except AttributeError:
+            self._issuer = _der.decode_name(self._field(2))
+            return self._issuer
+
+    def _decode_validity(self) -> None:
+        validity = self._field(3)
+        _, start, end = _der.read_tlv(validity)
+        (not_before_tag, _, not_before_start, not_before_end), (not_after_tag, _, not_after_start, not_after_end) = (
+            _der.iter_elements(validity, start, end)
+        )
+
+        self._not_before = _der.decode_time(not_before_tag, validity[not_before_start:not_before_end])
+        self._not_after = _der.decode_time(not_after_tag, validity[not_after_start:not_after_end])
+
+    @property
+    def not_before(self) -> datetime:
+        """Start of the validity period, as an aware UTC datetime."""
+        try:
+            return self._not_before
+        except AttributeError:
+            self._decode_validity()
+            return self._not_before
+
+    @property
+    def not_after(self) -> datetime:
+        """End of the validity period, as an aware UTC datetime."""
+        try:
+            return self._not_after
+        except AttributeError:
+            self._decode_validity()
+            return self._not_after
+
+    @property
+    def subject_key_identifier(self) -> bytes | None:
+        """The subject key identifier extension value, if present."""
+        try:
+            return self._subject_key_identifier
+        except AttributeError:
+            pass
+
+        self._subject_key_identifier = None
+
+        for tag, _, start, _ in self._tbs_fields()[6:]:
+            if tag != _EXTENSIONS:
+                continue
+
+            _, start, end = _der.read_tlv(self.der, start)
+
+            for _, _, extension_start, extension_end in _der.iter_elements(self.der, start, end):
+                elements = _der.iter_elements(self.der, extension_start, extension_end)
+                _, _, oid_start, oid_end = elements[0]
+
+                if _der.decode_oid(self.der[oid_start:oid_end]) != _SUBJECT_KEY_IDENTIFIER:
+                    continue
+
+                # extnValue is an OCTET STRING wrapping the KeyIdentifier OCTET STRING.
+                _, value_start, value_end = _der.read_tlv(self.der, elements[-1][2])
+                self._subject_key_identifier = self.der[value_start:value_end]
+
+        return self._subject_key_identifier
+
+    @property
+    def public_key_algorithm(self) -> str:
+        """The subject public key algorithm, e.g. ``rsaEncryption`` or ``id-ecPublicKey``.
+        Unknown algorithms are given as a dotted OID."""
+        try:
+            return self._public_key_algorithm
+        except AttributeError:
+            pass
+
+        spki = self._field(5)
+        _, start, _ = _der.read_tlv(spki)
+        _, algorithm_start, _ = _der.read_tlv(spki, start)
+        _, oid_start, oid_end = _der.read_tlv(spki, algorithm_start)
+        oid = _der.decode_oid(spki[oid_start:oid_end])
+
+        self._public_key_algorithm = _PUBLIC_KEY_ALGORITHMS.get(oid, oid)
+
+        return self._public_key_algorithm
+
+    @property
+    def sha256_fingerprint(self) -> str:
+        """SHA-256 of the DER, hexadecimal."""
+        try:
+            return self._sha256_fingerprint
+        except AttributeError:
+            self._sha256_fingerprint = hashlib.sha256(self.der).hexdigest()
+            return self._sha256_fingerprint
+
+    @property
+    def sha1_fingerprint(self) -> str:
+        """SHA-1 of the DER, hexadecimal."""
+        try:
+            return self._sha1_fingerprint
+        except AttributeError:
+            self._sha1_fingerprint = hashlib.sha1(self.der).hexdigest()
+            return self._sha1_fingerprint
@@ -0,0 +1,280 @@
+"""
+A node-local trust store daemon (``python -m wassima serve``) and its client.
+
+The daemon scans the trust store once for every process on the node and serves the
+resulting DER snapshot over a Unix domain socket. Clients fetch it instead of scanning,
+and fall back to scanning by themselves whenever the daemon is not reachable.
+
+Protocol, one request per connection, ASCII lines terminated by ``\\n``:
+
+- ``SNAPSHOT <0|1>`` (``hybrid_store``) is answered by ``OK <fingerprint> <count>``
+  followed by ``count`` certificates, each one prefixed by its length (4 bytes, big-endian).
+- ``WATCH`` is answered by ``OK``, then a ``CHANGED <0|1> <fingerprint>`` line every time
+  the trust store content changes, for as long as the connection stays open.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import socketserver
+import struct
+import threading
+from typing import TYPE_CHECKING, Any
+
+from . import _bundle
+
+if TYPE_CHECKING:
+    from typing import Callable
+
+#: Environment variable giving the path of the daemon socket. Otherwise, it lives in the
+#: wassima cache directory (see ``WASSIMA_CACHE_DIR``).
+DAEMON_SOCKET_ENV: str = "WASSIMA_DAEMON_SOCKET"
+DAEMON_SOCKET_NAME: str = "daemon.sock"
+#: Permissions of the daemon socket: only the user running it may connect. Widen them
+#: (e.g. ``0o660``, with a socket path other users can reach) to serve other users too.
+DEFAULT_SOCKET_MODE: int = 0o600
+
+#: Seconds a client waits for the daemon before scanning by itself.
+CLIENT_TIMEOUT: float = 2.0
+
+_LENGTH = struct.Struct(">I")
+
+#: Disabled within the daemon itself, so that it never asks itself for a snapshot.
+_CLIENT_ENABLED: bool = hasattr(socket, "AF_UNIX")
+
+
+def default_socket_path() -> str:
+    """Where ``serve`` listens by default."""
+    override = os.environ.get(DAEMON_SOCKET_ENV)
+
+    if override:
+        return override
+
+    return os.path.join(_bundle.cache_directory(), DAEMON_SOCKET_NAME)
+
+
+def _client_socket_path() -> str | None:
+    """Locate a daemon socket without creating anything on disk. Only the cache directories
+    of the current user are looked into: ``WASSIMA_DAEMON_SOCKET`` gives a shared one."""
+    override = os.environ.get(DAEMON_SOCKET_ENV)
+
+    if override:
+        return override
+
+    for candidate in _bundle._cache_directory_candidates():
+        path = os.path.join(candidate, DAEMON_SOCKET_NAME)
+
+        # Never trust a socket in a directory someone else controls.
+        if os.path.exists(path) and _bundle._is_usable_directory(candidate):
+            return path
+
+    return None
+
+
+def _connect(path: str, timeout: float) -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)  # type: ignore[attr-defined,unused-ignore]
+    sock.settimeout(timeout)
+
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        raise
+
+    return sock
+
+
+def _read_exactly(reader: Any, size: int) -> bytes:
+    data = reader.read(size)
+
+    if len(data) != size:
+        raise ValueError("truncated response from the wassima daemon")
+
+    return data  # type: ignore[no-any-return]
+
+
+def fetch_snapshot(hybrid_store: bool, path: str | None = None, timeout: float = CLIENT_TIMEOUT) -> list[bytes] | None:
+    """Fetch the trust store snapshot from the daemon. Return ``None`` if no daemon
+    is reachable or if its answer is not usable, the caller scans by itself then."""
+    if not _CLIENT_ENABLED:
+        return None
+
+    if path is None:
+        path = _client_socket_path()
+
+        if path is None:
+            return None
+
+    from . import _fingerprint
+
+    try:
+        with _connect(path, timeout) as sock, sock.makefile("rb") as reader:
+            sock.sendall(b"SNAPSHOT 1\n" if hybrid_store else b"SNAPSHOT 0\n")
+
+            status, fingerprint, count = reader.readline().decode("ascii").split()
+
+            if status != "OK":
+                return None  # Defensive: unknown request, e.g. a newer daemon
+
+            certificates = []
+
+            for _ in range(int(count)):
+                (length,) = _LENGTH.unpack(_read_exactly(reader, _LENGTH.size))
+                certificates.append(_read_exactly(reader, length))
+    except (OSError, ValueError, UnicodeDecodeError):
+        return None
+
+    # Whatever happened on the way, do not trust a snapshot that does not match its fingerprint.
+    if _fingerprint(certificates) != fingerprint:
+        return None
+
+    return certificates
+
+
+class _DaemonWatcher(threading.Thread):
+    """Follow the change notifications of the daemon, on behalf of a client process."""
+
+    def __init__(self, path: str, on_change: Callable[[bool, str], None]) -> None:
+        super().__init__(name="wassima-daemon-watcher", daemon=True)
+        self.path = path
+        self.on_change = on_change
+
+    def run(self) -> None:
+        try:
+            with _connect(self.path, CLIENT_TIMEOUT) as sock, sock.makefile("rb") as reader:
+                sock.sendall(b"WATCH\n")
+                sock.settimeout(None)
+
+                if reader.readline() != b"OK\n":
+                    return  # Defensive: unknown request, e.g. a newer daemon
+
+                for line in reader:
+                    _, hybrid_store, fingerprint = line.decode("ascii").split()
+                    self.on_change(hybrid_store == "1", fingerprint)
+        except (OSError, ValueError, UnicodeDecodeError):
+            # The daemon went away. Our next scan will find out and fall back, or reconnect.
+            return
+
+
+_WATCHER: _DaemonWatcher | None = None
+_WATCHER_LOCK = threading.Lock()
+
+
+def watch(on_change: Callable[[bool, str], None], path: str | None = None) -> None:
+    """Make sure a thread follows the change notifications of the daemon."""
+    global _WATCHER
+
+    path = path or _client_socket_path()
+
+    if path is None:
+        return  # Defensive: the daemon vanished meanwhile
+
+    with _WATCHER_LOCK:
+        if _WATCHER is not None and _WATCHER.is_alive():
+            return
+
+        _WATCHER = _DaemonWatcher(path, on_change)
+        _WATCHER.start()
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+
+    class _Handler(socketserver.StreamRequestHandler):
+        server: _Server
+
+        def handle(self) -> None:
+            request = self.rfile.readline(64).split()
+
+            if request[:1] == [b"SNAPSHOT"] and len(request) == 2:
+                certificates, fingerprint = self.server.snapshot(request[1] == b"1")
+
+                self.wfile.write(f"OK {fingerprint} {len(certificates)}\n".encode("ascii"))
+                self.wfile.write(b"".join(_LENGTH.pack(len(der)) + der for der in certificates))
+            elif request == [b"WATCH"]:
+                self.wfile.write(b"OK\n")
+                self.wfile.flush()
+
+                with self.server.watchers_lock:
+                    self.server.watchers.add(self)
+                # Wait for the client to hang up (or the daemon to stop).
+                try:
+                    while self.rfile.read(1):
+                        pass  # Defensive: clients are not expected to send anything
+                except OSError:  # Defensive:
+                    pass
+                finally:
+                    with self.server.watchers_lock:
+                        self.server.watchers.discard(self)
+            else:
+                self.wfile.write(b"ERROR unknown request\n")
+
+    class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+        def __init__(self, path: str, snapshot: Callable[[bool], tuple[list[bytes], str]]) -> None:
+            super().__init__(path, _Handler)
+            self.snapshot = snapshot
+            self.watchers: set[_Handler] = set()
+            self.watchers_lock = threading.Lock()
+
+        def notify(self, hybrid_store: bool, fingerprint: str) -> None:
+            line = f"CHANGED {int(hybrid_store)} {fingerprint}\n".encode("ascii")
+
+            with self.watchers_lock:
+                for watcher in tuple(self.watchers):
+                    try:
+                        watcher.wfile.write(line)
+                        watcher.wfile.flush()
+                    except OSError:  # Defensive: the client is gone
+                        self.watchers.discard(watcher)
+
+        def server_close(self) -> None:
+            super().server_close()
+
+            # Hang up on the watching clients, so that they stop relying on us right away.
+            with self.watchers_lock:
+                for watcher in self.watchers:
+                    try:
+                        watcher.request.shutdown(socket.SHUT_RDWR)
+                    except OSError:  # Defensive: the client is gone
+                        pass
+
+
+def create_server(path: str, interval: float, mode: int = DEFAULT_SOCKET_MODE) -> Any:
+    """Bind the daemon socket at ``path`` with the permissions ``mode``, serving snapshots refreshed
+    every ``interval`` seconds. Call ``serve_forever()`` on the result, ``shutdown()`` then
+    ``server_close()`` to stop it."""
+    global _CLIENT_ENABLED
+
+    from . import _snapshot_fingerprint, add_trust_store_listener, root_der_certificates, start_background_refresh
+
+    if not hasattr(socket, "AF_UNIX"):  # Defensive: Windows
+        raise OSError("the wassima daemon requires Unix domain sockets")
+
+    if os.path.exists(path):
+        try:
+            _connect(path, CLIENT_TIMEOUT).close()
+        except OSError:
+            os.unlink(path)  # Left over by a daemon that died.
+        else:
+            raise OSError(f"a wassima daemon is already listening on {path}")
+
+    _CLIENT_ENABLED = False
+
+    # The socket is created with its final permissions, never with the default ones, even briefly.
+    umask = os.umask(0o777 & ~mode)
+
+    try:
+        server = _Server(path, _snapshot_fingerprint)
+    finally:
+        os.umask(umask)
+
+    # Scan now, so that the first clients do not wait for it.
+    root_der_certificates()
+    root_der_certificates(True)
+
+    add_trust_store_listener(server.notify)
+    start_background_refresh(interval)
+
+    return server
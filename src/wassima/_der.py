@@ -0,0 +1,309 @@
+"""
+A minimal DER reader, just enough to walk X.509 certificates without any
+third-party dependency, and the OpenSSL subject name hash built on top of it.
+"""
+
+from __future__ import annotations
+
+import binascii
+import hashlib
+import re
+from datetime import datetime, timezone
+
+_SEQUENCE = 0x30
+_SET = 0x31
+_UTF8_STRING = 0x0C
+_CONTEXT_0 = 0xA0
+
+#: String types OpenSSL converts to UTF-8 when canonicalizing a name, along with the
+#: codec used to decode them. Other types (e.g. NumericString) are kept verbatim.
+_CANONICAL_STRING_CODECS = {
+    0x0C: "utf-8",  # UTF8String
+    0x13: "latin-1",  # PrintableString
+    0x14: "latin-1",  # T61String, one byte per character like OpenSSL does
+    0x16: "latin-1",  # IA5String
+    0x1A: "latin-1",  # VisibleString
+    0x1C: "utf-32-be",  # UniversalString
+    0x1E: "utf-16-be",  # BMPString
+}
+
+_OBJECT_IDENTIFIER = 0x06
+_UTC_TIME = 0x17
+_GENERALIZED_TIME = 0x18
+
+#: Short names of the attribute types RFC 4514 knows about.
+_ATTRIBUTE_NAMES = {
+    "2.5.4.3": "CN",
+    "2.5.4.7": "L",
+    "2.5.4.8": "ST",
+    "2.5.4.10": "O",
+    "2.5.4.11": "OU",
+    "2.5.4.6": "C",
+    "2.5.4.9": "STREET",
+    "0.9.2342.19200300.100.1.25": "DC",
+    "0.9.2342.19200300.100.1.1": "UID",
+}
+
+_ASCII_WHITESPACES = frozenset(b" \t\n\v\f\r")
+
+_PEM_CERTIFICATE = re.compile(rb"-----BEGIN CERTIFICATE-----(.*?)-----END CERTIFICATE-----", re.DOTALL)
+
+
+def read_tlv(data: bytes, offset: int = 0) -> tuple[int, int, int]:
+    """Read the element starting at ``offset``. Return its tag along with
+    the start and end offsets of its value."""
+    try:
+        tag = data[offset]
+        length = data[offset + 1]
+    except IndexError as e:
+        raise ValueError("truncated DER element") from e
+
+    offset += 2
+
+    if length & 0x80:
+        size = length & 0x7F
+
+        if size == 0 or offset + size > len(data):
+            raise ValueError("unsupported or truncated DER length")
+
+        length = int.from_bytes(data[offset : offset + size], "big")
+        offset += size
+
+    if offset + length > len(data):
+        raise ValueError("truncated DER element")
+
+    return tag, offset, offset + length
+
+
+def iter_elements(data: bytes, start: int, end: int) -> list[tuple[int, int, int, int]]:
+    """List the elements found between ``start`` and ``end`` as ``(tag, start, value_start, end)``."""
+    elements = []
+
+    while start < end:
+        tag, value_start, value_end = read_tlv(data, start)
+        elements.append((tag, start, value_start, value_end))
+        start = value_end
+
+    return elements
+
+
+def split_certificates(data: bytes) -> list[bytes]:
+    """Split concatenated DER certificates. Only the outer framing is checked."""
+    certificates = []
+    offset = 0
+
+    while offset < len(data):
+        tag, _, end = read_tlv(data, offset)
+
+        if tag != _SEQUENCE:
+            raise ValueError("not a DER encoded certificate")
+
+        certificates.append(data[offset:end])
+        offset = end
+
+    return certificates
+
+
+def pem_certificates(data: bytes) -> list[bytes]:
+    """Extract every ``CERTIFICATE`` block of a PEM bundle, DER encoded, in a single pass.
+    Anything outside of these blocks (comments, keys, CRLs, etc.) is ignored."""
+    certificates = []
+
+    for match in _PEM_CERTIFICATE.finditer(data):
+        try:
+            # Line breaks, CRLF or not, are skipped by the decoder.
+            der = binascii.a2b_base64(match.group(1))
+        except binascii.Error as e:
+            raise ValueError("malformed PEM certificate") from e
+
+        if split_certificates(der) != [der]:
+            raise ValueError("malformed PEM certificate")
+
+        certificates.append(der)
+
+    return certificates
+
+
+def decode_oid(data: bytes) -> str:
+    """Decode the value of an OBJECT IDENTIFIER to its dotted representation."""
+    arcs: list[int] = []
+    arc = 0
+
+    for byte in data:
+        arc = (arc << 7) | (byte & 0x7F)
+
+        if not byte & 0x80:
+            arcs.append(arc)
+            arc = 0
+
+    if not arcs:
+        raise ValueError("invalid object identifier")
+
+    first = min(arcs[0] // 40, 2)
+
+    return ".".join(str(n) for n in [first, arcs[0] - first * 40, *arcs[1:]])
+
+
+def decode_time(tag: int, value: bytes) -> datetime:
+    """Decode an UTCTime or GeneralizedTime value (as found in a certificate validity)."""
+    text = value.decode("ascii")
+
+    if tag == _UTC_TIME:
+        # RFC 5280 4.1.2.5.1: YY >= 50 means 19YY.
+        text = ("19" if int(text[:2]) >= 50 else "20") + text
+    elif tag != _GENERALIZED_TIME:
+        raise ValueError("invalid time")
+
+    return datetime.strptime(text, "%Y%m%d%H%M%SZ").replace(tzinfo=timezone.utc)
+
+
+def _escape_attribute_value(value: str) -> str:
+    escaped = "".join(f"\\{c}" if c in ',+"\\<>;' else c for c in value)
+
+    if escaped[:1] in ("#", " "):
+        escaped = "\\" + escaped
+    if escaped[-1:] == " ":
+        escaped = escaped[:-1] + "\\ "
+
+    return escaped
+
+
+def decode_name(name: bytes) -> str:
+    """Decode a DER encoded Name into its RFC 4514 string representation (e.g. ``CN=Foo,O=Bar,C=US``)."""
+    tag, start, end = read_tlv(name)
+
+    if tag != _SEQUENCE:
+        raise ValueError("invalid name")
+
+    rdns = []
+
+    for _, _, rdn_start, rdn_end in iter_elements(name, start, end):
+        attributes = []
+
+        for _, _, attribute_start, attribute_end in iter_elements(name, rdn_start, rdn_end):
+            (_, _, oid_start, oid_end), (value_tag, tlv_start, value_start, value_end) = iter_elements(
+                name, attribute_start, attribute_end
+            )[:2]
+
+            oid = decode_oid(name[oid_start:oid_end])
+            codec = _CANONICAL_STRING_CODECS.get(value_tag, "ascii" if value_tag == 0x12 else None)
+
+            if codec is None:
+                value = "#" + name[tlv_start:value_end].hex()
+            else:
+                value = _escape_attribute_value(name[value_start:value_end].decode(codec))
+
+            attributes.append(f"{_ATTRIBUTE_NAMES.get(oid, oid)}={value}")
+
+        rdns.append("+".join(attributes))
+
+    return ",".join(reversed(rdns))
+
+
+def tbs_certificate_fields(der: bytes) -> list[tuple[int, int, int, int]]:
+    """List the TBSCertificate elements of a DER certificate, the optional version excluded:
+    serialNumber, signature, issuer, validity, subject, subjectPublicKeyInfo then extensions, if any."""
+    tag, start, end = read_tlv(der)
+
+    if tag != _SEQUENCE:
+        raise ValueError("not a DER encoded certificate")
+
+    tag, start, end = read_tlv(der, start)
+
+    if tag != _SEQUENCE:
+        raise ValueError("not a DER encoded certificate")
+
+    fields = iter_elements(der, start, end)
+
+    # The version is optional ([0] EXPLICIT), skip it so that indexes are stable.
+    if fields and fields[0][0] == _CONTEXT_0:
+        fields = fields[1:]
+
+    if len(fields) < 6:
+        raise ValueError("not a DER encoded certificate")
+
+    return fields
+
+
+def subject_name(der: bytes) -> bytes:
+    """Return the DER encoded subject Name of a DER certificate."""
+    _, start, _, end = tbs_certificate_fields(der)[4]
+    return der[start:end]
+
+
+def _encode_tlv(tag: int, value: bytes) -> bytes:
+    length = len(value)
+
+    if length < 0x80:
+        return bytes((tag, length)) + value
+
+    size = (length.bit_length() + 7) // 8
+
+    return bytes((tag, 0x80 | size)) + length.to_bytes(size, "big") + value
+
+
+def _canonical_string(value: bytes) -> bytes:
+    # Trim, collapse inner whitespaces into a single space then lowercase ASCII.
+    # Non-ASCII bytes are kept as-is, exactly like OpenSSL asn1_string_canon.
+    canonical = bytearray()
+    previous_is_space = False
+
+    for byte in value.strip(b" \t\n\v\f\r"):
+        if byte in _ASCII_WHITESPACES:
+            if not previous_is_space:
+                canonical.append(0x20)
+            previous_is_space = True
+            continue
+
+        previous_is_space = False
+        canonical.append(byte + 0x20 if 0x41 <= byte <= 0x5A else byte)
+
+    return bytes(canonical)
+
+
+def _canonical_attribute(der: bytes, start: int, end: int) -> bytes:
+    (_, oid_start, _, oid_end), (value_tag, tlv_start, value_start, value_end) = iter_elements(der, start, end)[:2]
+
+    oid = der[oid_start:oid_end]
+    codec = _CANONICAL_STRING_CODECS.get(value_tag)
+
+    if codec is None:
+        value = der[tlv_start:value_end]
+    else:
+        text = der[value_start:value_end].decode(codec)
+        value = _encode_tlv(_UTF8_STRING, _canonical_string(text.encode("utf-8")))
+
+    return _encode_tlv(_SEQUENCE, oid + value)
+
+
+def subject_name_hash(der: bytes) -> str:
+    """Compute the OpenSSL subject name hash (``openssl x509 -hash``) of a DER certificate,
+    as expected in the file names of a ``capath`` directory (see ``c_rehash``).
+
+    It is the SHA-1 of the canonical encoding of the name (every RDN SET, values as
+    lowercased UTF-8 with collapsed whitespaces), truncated to its first 4 bytes read
+    as a little-endian integer, in hexadecimal.
+    """
+    name = subject_name(der)
+
+    tag, start, end = read_tlv(name)
+
+    if tag != _SEQUENCE:
+        raise ValueError("invalid subject name")
+
+    canonical = bytearray()
+
+    for rdn_tag, _, rdn_start, rdn_end in iter_elements(name, start, end):
+        if rdn_tag != _SET:
+            raise ValueError("invalid subject name")
+
+        attributes = sorted(
+            _canonical_attribute(name, attribute_start, attribute_end)
+            for _, _, attribute_start, attribute_end in iter_elements(name, rdn_start, rdn_end)
+        )
+
+        canonical += _encode_tlv(_SET, b"".join(attributes))
+
+    digest = hashlib.sha1(bytes(canonical)).digest()
+
+    return f"{int.from_bytes(digest[:4], 'little'):08x}"
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ._certificate import Certificate
+
+if TYPE_CHECKING:
+    from typing import Iterator
+
+
+def _normalize_fingerprint(fingerprint: str) -> str:
+    return fingerprint.replace(":", "").lower()
+
+
+class CertificateIndex:
+    """
+    Constant time lookups over a set of trust anchors: by fingerprint, subject
+    or subject key identifier. Each lookup table is built on its first use only.
+    Certificates that cannot be read are only found by DER or fingerprint.
+
+    Immutable: it describes one trust store snapshot. Get a fresh one with
+    :func:`wassima.trust_store_index` once the trust store changed.
+    """
+
+    __slots__ = ("_certificates", "_by_der", "_by_fingerprint", "_by_subject", "_by_key_identifier")
+
+    _by_fingerprint: dict[str, Certificate]
+    _by_subject: dict[str | bytes, list[Certificate]]
+    _by_key_identifier: dict[bytes, list[Certificate]]
+
+    def __init__(self, certificates: list[Certificate]) -> None:
+        self._certificates = tuple(certificates)
+        self._by_der = {certificate.der: certificate for certificate in self._certificates}
+
+    def __len__(self) -> int:
+        return len(self._certificates)
+
+    def __iter__(self) -> Iterator[Certificate]:
+        return iter(self._certificates)
+
+    def __contains__(self, certificate: object) -> bool:
+        """Tell whether a DER certificate (or a :class:`Certificate`) is part of the trust anchors."""
+        if isinstance(certificate, Certificate):
+            certificate = certificate.der
+
+        return certificate in self._by_der
+
+    def get(self, der: bytes) -> Certificate | None:
+        """Return the trust anchor matching the given DER certificate, if any."""
+        return self._by_der.get(der)
+
+    def by_fingerprint(self, fingerprint: str) -> Certificate | None:
+        """Return the trust anchor with the given SHA-256 or SHA-1 fingerprint, if any.
+        Hexadecimal, case and colons (e.g. ``AB:CD:...``) do not matter."""
+        try:
+            by_fingerprint = self._by_fingerprint
+        except AttributeError:
+            by_fingerprint = {}
+
+            for certificate in self._certificates:
+                by_fingerprint[certificate.sha256_fingerprint] = certificate
+                by_fingerprint[certificate.sha1_fingerprint] = certificate
+
+            self._by_fingerprint = by_fingerprint
+
+        return by_fingerprint.get(_normalize_fingerprint(fingerprint))
+
+    def by_subject(self, subject: str | bytes) -> list[Certificate]:
+        """Return the trust anchors with the given subject, either as a RFC 4514 string
+        (as in :attr:`Certificate.subject`) or a DER encoded name."""
+        try:
+            by_subject = self._by_subject
+        except AttributeError:
+            by_subject = {}
+
+            for certificate in self._certificates:
+                try:
+                    names = (certificate.subject, certificate.subject_der)
+                except ValueError:  # Unreadable, it cannot be found by subject.
+                    continue
+
+                for name in names:
+                    by_subject.setdefault(name, []).append(certificate)
+
+            self._by_subject = by_subject
+
+        return list(by_subject.get(subject, ()))
+
+    def by_key_identifier(self, key_identifier: bytes) -> list[Certificate]:
+        """Return the trust anchors with the given subject key identifier, e.g. to find
+        the candidate issuers of a certificate from its authority key identifier."""
+        try:
+            by_key_identifier = self._by_key_identifier
+        except AttributeError:
+            by_key_identifier = {}
+
+            for certificate in self._certificates:
+                try:
+                    identifier = certificate.subject_key_identifier
+                except ValueError:  # Unreadable, it cannot be found by key identifier.
+                    continue
+
+                if identifier is not None:
+                    by_key_identifier.setdefault(identifier, []).append(certificate)
+
+            self._by_key_identifier = by_key_identifier
+
+        return list(by_key_identifier.get(key_identifier, ()))
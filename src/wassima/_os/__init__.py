@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import platform
 import sys
+from typing import Any
 
 # Platform detection
 IS_WINDOWS = sys.platform == "win32"
@@ -18,13 +19,20 @@ if IS_MACOS:
 
 
 if IS_WINDOWS:
-    from ._windows import root_der_certificates
+    from ._windows import root_der_certificates, trust_store_metadata
 elif IS_MACOS and MACOS_VERSION >= (10, 15):  # type: ignore[operator]
-    from ._macos import root_der_certificates
+    from ._macos import root_der_certificates, trust_store_metadata
 elif IS_LINUX or IS_BSD:
-    from ._linux import root_der_certificates
+    from ._linux import root_der_certificates, trust_store_metadata
 else:
     from ._embed import root_der_certificates
 
+    def trust_store_metadata() -> tuple[tuple[Any, ...], float | None]:  # Defensive: exotic platforms only
+        # The embedded bundle cannot change at runtime.
+        return (), None
 
-__all__ = ("root_der_certificates",)
+
+__all__ = (
+    "root_der_certificates",
+    "trust_store_metadata",
+)
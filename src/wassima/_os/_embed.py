@@ -3,8 +3,11 @@
 # LICENSED UNDER BOTH MIT AND "Community Data License Agreement - Permissive - Version 2.0" LICENSE
 from __future__ import annotations
 
+import os
 import ssl
 
+from .._bundle import SNAPSHOT_MAGIC, read_snapshot
+
 CCADB_BUNDLE: str = """
 # Owner: Actalis
 # Organization: Actalis S.p.A./03358520967
@@ -3518,7 +3521,13 @@ ly4wBOeY99sLAZDBHwo/+ML+TvrbmnNzFrwFuHnYWa8G5z9nODmxfKuU4CkUpijy
 """
 
 
-def root_der_certificates() -> list[bytes]:
+#: The same certificates, pre-decoded, in a file next to this module. Same layout
+#: as the trust store snapshots, see SNAPSHOT_MAGIC in wassima._bundle.
+CCADB_DER_RESOURCE: str = "_embed.der"
+CCADB_DER_MAGIC: bytes = SNAPSHOT_MAGIC
+
+
+def _pem_bundle_certificates() -> list[bytes]:
     certificates: list[bytes] = []
 
     line_ending = "\n"
@@ -3539,3 +3548,15 @@ def root_der_certificates() -> list[bytes]:
                 continue  # just skip it... don't crash everything.
 
     return certificates
+
+
+def _der_resource_certificates() -> list[bytes]:
+    return read_snapshot(os.path.join(os.path.dirname(__file__), CCADB_DER_RESOURCE))
+
+
+def root_der_certificates() -> list[bytes]:
+    # Slicing the pre-decoded certificates out is much cheaper than decoding the PEM bundle.
+    try:
+        return _der_resource_certificates()
+    except (OSError, ValueError):
+        return _pem_bundle_certificates()
@@ -0,0 +1,1086 @@
+# DO NOT EDIT THIS FILE
+# IT IS AUTOMATICALLY GENERATED
+# LICENSED UNDER BOTH MIT AND "Community Data License Agreement - Permissive - Version 2.0" LICENSE
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class EmbeddedRoot(NamedTuple):
+    """Precomputed metadata of an embedded CCADB root. Fingerprints are lowercase
+    hexadecimal, validity bounds are POSIX timestamps."""
+
+    owner: str
+    common_name: str
+    sha256_fingerprint: str
+    sha1_fingerprint: str
+    not_before: int
+    not_after: int
+    public_key: str
+
+
+#: One entry per certificate of ``CCADB_BUNDLE``, in the same order.
+CCADB_INDEX: tuple[EmbeddedRoot, ...] = (
+    EmbeddedRoot(
+        "Actalis",
+        "Actalis Authentication Root CA",
+        "55926084ec963a64b96e2abe01ce0ba86a64fbfebcc7aab5afc155b37fd76066",
+        "f373b387065a28848af2f34ace192bddc78e9cac",
+        1316690522,
+        1916306522,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Agence Nationale de Certification Electronique",
+        "TunTrust Root CA",
+        "2e44102ab58cb85419451c8e19d9acf3662cafbc614b6a53960a30f7d0e2eb41",
+        "cfe970840fe0730f9df60c7f2c4bee2046349cbb",
+        1556269076,
+        2345273876,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Amazon Trust Services",
+        "Amazon Root CA 1",
+        "8ecde6884f3d87b1125ba31ac3fcb13d7016de7f57cc904fe1cb97c6ae98196e",
+        "8da7f965ec5efc37910f1c6e59fdc1cc6a6ede16",
+        1432598400,
+        2147299200,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "Amazon Trust Services",
+        "Amazon Root CA 2",
+        "1ba5b2aa8c65401a82960118f80bec4f62304d83cec4713a19c39c011ea46db4",
+        "5a8cef45d7a69859767a8c8b4496b578cf474b1a",
+        1432598400,
+        2221603200,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Amazon Trust Services",
+        "Amazon Root CA 3",
+        "18ce6cfe7bf14e60b2e347b8dfe868cb31d02ebb3ada271569f50343b46db3a4",
+        "0d44dd8c3c8c1a1a58756481e90f2e2affb3d26e",
+        1432598400,
+        2221603200,
+        "EC P-256",
+    ),
+    EmbeddedRoot(
+        "Amazon Trust Services",
+        "Amazon Root CA 4",
+        "e35d28419ed02025cfa69038cd623962458da5c695fbdea3c22b0bfb25897092",
+        "f6108407d6f8bb67980cc2e244c2ebae1cef63be",
+        1432598400,
+        2221603200,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "Amazon Trust Services",
+        "Starfield Services Root Certificate Authority - G2",
+        "568d6905a2c88708a4b3025190edcfedb1974a606a13c6e5290fcb2ae63edab5",
+        "925a8f8d2c6d04e0665f596aff22d863e8256f3f",
+        1251763200,
+        2145916799,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "Asseco Data Systems S.A.",
+        "Certum EC-384 CA",
+        "6b328085625318aa50d173c98d8bda09d57e27413d114cf787a0f5d06c030cf6",
+        "f33e783cacdff4a2ccac67556956d7e5163ce1ed",
+        1522049094,
+        2310967494,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "Asseco Data Systems S.A.",
+        "Certum Trusted Network CA",
+        "5c58468d55f58e497e743982d2b50010b6d165374acf83a7d4a32db768c4408e",
+        "07e032e020b72c3f192f0628a2593a19a70f069e",
+        1224677257,
+        1893413257,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "Asseco Data Systems S.A.",
+        "Certum Trusted Network CA 2",
+        "b676f2eddae8775cd36cb0f63cd1d4603961f49e6265ba013a2f0307b6d0b804",
+        "d3dd483e2bbf4c05e8af10f5fa7626cfd3dc3092",
+        1317890396,
+        2422427996,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Asseco Data Systems S.A.",
+        "Certum Trusted Root CA",
+        "fe7696573855773e37a95e7ad4d9cc96c30157c15d31765ba9b15704e1ae78fd",
+        "c88344c018ae9fccf187b78f22d1c5d74584bae5",
+        1521202213,
+        2310120613,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Atos",
+        "Atos TrustedRoot 2011",
+        "f356bea244b7a91eb35d53ca9ad7864ace018e2d35d5f8f96ddf68a6f41aa474",
+        "2bb1f53e550c1dc5f1d4e6b76a464b550602ac21",
+        1310050710,
+        1924991999,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "Atos",
+        "Atos TrustedRoot Root CA ECC TLS 2021",
+        "b2fae53e14ccd7ab9212064701ae279c1d8988facb775fa8a008914e663988a8",
+        "9ebc751042b302f381f4f73062d48fc3a751b2dd",
+        1619083583,
+        2249803582,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "Atos",
+        "Atos TrustedRoot Root CA RSA TLS 2021",
+        "81a9088ea59fb364c548a6f85559099b6f0405efbf18e5324ec9f457ba00112f",
+        "18523b0d0637e4d63adf23e498fb5b16fb867448",
+        1619083270,
+        2249803269,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Autoridad de Certificacion Firmaprofesional",
+        "Autoridad de Certificacion Firmaprofesional CIF A62634068",
+        "57de0583efd2b26e0361da99da9df4648def7ee8441c3b728afa9bcde0f9b26a",
+        "0bbec2272249cb39aadb355c53e38cae78ffb6fe",
+        1411485727,
+        2093613727,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Autoridad de Certificación (ANF AC)",
+        "ANF Secure Server Root CA",
+        "fb8fec759169b9106b1e511644c618c51304373f6c0643088d8beffd1b997599",
+        "5b6e68d0cc15b6a05f1ec15fae02fc6b2f5d6f74",
+        1567591238,
+        2198311238,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "BEIJING CERTIFICATE AUTHORITY Co., Ltd.",
+        "BJCA Global Root CA1",
+        "f3896f88fe7c0a882766a7fa6ad2749fb57a7f3e98fb769c1fa7b09c2c44d5ae",
+        "d5ec8d7b4cba79f4e7e8cb9d6bae77831003216a",
+        1576725377,
+        2365125377,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "BEIJING CERTIFICATE AUTHORITY Co., Ltd.",
+        "BJCA Global Root CA2",
+        "574df6931e278039667b720afdc1600fc27eb66dd3092979fb73856487212882",
+        "f42786eb6eb86d88316702fbba66a45300aa7aa6",
+        1576725501,
+        2365125501,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "Buypass",
+        "Buypass Class 2 Root CA",
+        "9a114025197c5bb95d94e63d55cd43790847b646b23cdf11ada4a00eff15fb48",
+        "490a7574de870a47fe58eef6c76bebc60b124099",
+        1288082283,
+        2234853483,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Buypass",
+        "Buypass Class 3 Root CA",
+        "edf7ebbca27a2a384d387b7d4010c666e2edb4843e4c29b4ae1d5b9332e6b24d",
+        "dafaf7fa6684ec068f1450bdc7c281a5bca96457",
+        1288081738,
+        2234852938,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Certainly LLC",
+        "Certainly Root E1",
+        "b4585f22e4ac756a4e8612a1361c5d9d031a93fd84febb778fa3068b0fc42dc2",
+        "f9e16ddc0189cfd58245633ec5377dc2eb936f2b",
+        1617235200,
+        2406153600,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "Certainly LLC",
+        "Certainly Root R1",
+        "77b82cd8644c4305f7acc5cb156b45675004033d51c60c6202a8e0c33467d3a0",
+        "a050ee0f2871f427b2126d6f509625bacc8642af",
+        1617235200,
+        2406153600,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Certigna",
+        "Certigna Root CA",
+        "d48d3d23eedb50a459e55197601c27774b9d7b18c94d5a059511a10250b93168",
+        "2d0d5214ff9ead9924017420476e6c852727f543",
+        1380616347,
+        2011768347,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "certSIGN",
+        "certSIGN ROOT CA G2",
+        "657cfe2fa73faa38462571f332a2363a46fce7020951710702cdfbb6eeda3305",
+        "26f993b4ed3d2827b0b94ba7e9151da38d92e532",
+        1486373255,
+        2275291655,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "China Financial Certification Authority (CFCA)",
+        "CFCA EV ROOT",
+        "5cc3d78e4e1d5e45547a04e6873e64f90cf9536d1ccc2ef800f355c4c5fd70fd",
+        "e2b8294b5584ab6b58c290466cac3fb8398f8483",
+        1344395221,
+        1893380821,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Chunghwa Telecom",
+        "HiPKI Root CA - G1",
+        "f015ce3cc239bfef064be9f1d2c417e1a0264a0a94be1f0c8d121864eb6949cc",
+        "6a92e4a8ee1bec964537e3295749cd96e3e5d260",
+        1550828764,
+        2145887999,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Cybertrust Japan / JCSI",
+        "SecureSign Root CA14",
+        "4b009c1034494f9ab56bba3ba1d62731fc4d20d8955adcec10a925607261e338",
+        "dd50c0f779b3642e74a2b89d9fd340ddbbf0f24f",
+        1586329579,
+        2375247979,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Cybertrust Japan / JCSI",
+        "SecureSign Root CA15",
+        "e778f0f095fe843729cd1a0082179e5314a9c291442805e1fb1d8fb6b8886c3a",
+        "cbba83c8c15a5df1f9736fcad7ef2813064a077d",
+        1586334776,
+        2375253176,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "D-Trust",
+        "D-TRUST BR Root CA 1 2020",
+        "e59aaa816009c22bff5b25bad37df306f049797c1f81d85ab089e657bd8f0044",
+        "1f5b98f0e3b5f7743cede6b0367d32cdf4094167",
+        1581414300,
+        2054799899,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "D-Trust",
+        "D-TRUST BR Root CA 2 2023",
+        "0552e6f83fdf65e8fa9670e666df28a4e21340b510cbe52566f97c4fb94b2bd1",
+        "2db070ee7194af696817db79ce589fa06b96f787",
+        1683622591,
+        2157008190,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "D-Trust",
+        "D-TRUST EV Root CA 1 2020",
+        "08170d1aa36453901a2f959245e347db0c8d37abaabc56b81aa100dc958970db",
+        "61db8c2159690390d87c9c128654cf9d3df4dd07",
+        1581415200,
+        2054800799,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "D-Trust",
+        "D-TRUST EV Root CA 2 2023",
+        "8e8221b2e7d4007836a1672f0dcc299c33bc07d316f132fa1a206d587150f1ce",
+        "a55bd8476c8f19f74cf46d6bb6c2798222df548b",
+        1683623433,
+        2157009032,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "D-Trust",
+        "D-TRUST Root Class 3 CA 2 2009",
+        "49e7a442acf0ea6287050054b52564b650e4f49e42e348d6aa38e039e957b1c1",
+        "58e8abb0361533fb80f79b1b6d29d3ff8d5f00f0",
+        1257410158,
+        1888562158,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "D-Trust",
+        "D-TRUST Root Class 3 CA 2 EV 2009",
+        "eec5496b988ce98625b934092eec2908bed0b0f316c2d4730c84eaf1f3d34881",
+        "96c91b0b95b4109842fad0d82279fe60fab91683",
+        1257411046,
+        1888563046,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "Deutsche Telekom Security GmbH",
+        "T-TeleSec GlobalRoot Class 2",
+        "91e2f5788d5810eba7ba58737de1548a8ecacd014598bc0b143e041b17052552",
+        "590d2d7d884f402e617ea562321765cf17d894e9",
+        1222857614,
+        2011823999,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "Deutsche Telekom Security GmbH",
+        "T-TeleSec GlobalRoot Class 3",
+        "fd73dad31c644ff1b43bef0ccdda96710b9cd9875eca7e31707af3e96d522bbd",
+        "55a6723ecbf2eccdc3237470199d2abe11e381d1",
+        1222856996,
+        2011823999,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "Deutsche Telekom Security GmbH",
+        "Telekom Security TLS ECC Root 2020",
+        "578af4ded0853f4e5998db4aeaf9cbea8d945f60b620a38d1a3c13b2bc7ba8e1",
+        "c0f896c5a93b01062107da184248bce99d88d5ec",
+        1598341700,
+        2387318399,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "Deutsche Telekom Security GmbH",
+        "Telekom Security TLS RSA Root 2023",
+        "efc65cadbb59adb6efe84da22311b35624b71b3b1ea0da8b6655174ec8978646",
+        "54d3acb3bd5756f6859dcee5c321e2d4ad83d093",
+        1680005805,
+        2468966399,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "DigiCert",
+        "DigiCert Assured ID Root G2",
+        "7d05ebb682339f8c9451ee094eebfefa7953a114edb2f44949452fab7d2fc185",
+        "a14b48d943ee0a0e40904f3ce0a4c09193515d3f",
+        1375358400,
+        2147169600,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "DigiCert",
+        "DigiCert Assured ID Root G3",
+        "7e37cb8b4c47090cab36551ba6f45db840680fba166a952db100717f43053fc2",
+        "f517a24f9a48c6c9f8a200269fdc0f482cab3089",
+        1375358400,
+        2147169600,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "DigiCert",
+        "DigiCert Global Root G2",
+        "cb3ccbb76031e5e0138f8dd39a23f9de47ffc35e43c1144cea27d46a5ab1cb5f",
+        "df3c24f9bfd666761b268073fe06d1cc8d4f82a4",
+        1375358400,
+        2147169600,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "DigiCert",
+        "DigiCert Global Root G3",
+        "31ad6648f8104138c738f39ea4320133393e3a18cc02296ef97c2ac9ef6731d0",
+        "7e04de896a3e666d00e687d33ffad93be83d349e",
+        1375358400,
+        2147169600,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "DigiCert",
+        "DigiCert TLS ECC P384 Root G5",
+        "018e13f0772532cf809bd1b17281867283fc48c6e13be9c69812854a490c1b05",
+        "17f3de5e9f0f19e98ef61f32266e20c407ae30ee",
+        1610668800,
+        2399587199,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "DigiCert",
+        "DigiCert TLS RSA4096 Root G5",
+        "371a00dc0533b3721a7eeb40e8419e70799d2b0a0f2c1d80693165f7cec4ad75",
+        "a78849dc5d7c758c8cde399856b3aad0b2a57135",
+        1610668800,
+        2399587199,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "DigiCert",
+        "DigiCert Trusted Root G4",
+        "552f7bdcf1a7af9e6ce672017f4f12abf77240c78e761ac203d1d9d20ac89988",
+        "ddfb16cd4931c973a2037d3fc83a4d7d775d05e4",
+        1375358400,
+        2147169600,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "DigiCert",
+        "QuoVadis Root CA 1 G3",
+        "8a866fd1b276b57e578e921c65828a2bed58e9f2f288054134b7f1f4bfc9cc74",
+        "1b8eea5796291ac939eab80a811a7373c0937967",
+        1326389264,
+        2273160464,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "DigiCert",
+        "QuoVadis Root CA 2 G3",
+        "8fe4fb0af93a4d0d67db0bebb23e37c71bf325dcbcdd240ea04daf58b47e1840",
+        "093c61f38b8bdc7d55df7538020500e125f5c836",
+        1326394772,
+        2273165972,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "DigiCert",
+        "QuoVadis Root CA 3 G3",
+        "88ef81de202eb018452e43f864725cea5fbd1fc2d9d205730709c5d8b8690f46",
+        "4812bd923ca8c43906e7306d2796e6a4cf222e7d",
+        1326399992,
+        2273171192,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Disig, a.s.",
+        "CA Disig Root R2",
+        "e23d4a036d7b70e9f595b1422079d2b91edfbb1fb651a0633eaa8a9dc5f80703",
+        "b561ebeaa4dee4254b691a98a55747c234c7d971",
+        1342689330,
+        2289374130,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "eMudhra Technologies Limited",
+        "emSign ECC Root CA - C3",
+        "bc4d809b15189d78db3e1d8cf4f9726a795da1643ca5f1358e1ddb0edc0d7eb3",
+        "b6af43c29b81537df6ef6bc31f1f60150cee4866",
+        1518978600,
+        2307897000,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "eMudhra Technologies Limited",
+        "emSign ECC Root CA - G3",
+        "86a1ecba089c4a8d3bbe2734c612ba341d813e043cf9e8a862cd5c57a36bbe6b",
+        "3043fa4ff257dca0c380ee2e58ea78b23fe6bbc1",
+        1518978600,
+        2307897000,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "eMudhra Technologies Limited",
+        "emSign Root CA - C1",
+        "125609aa301da0a249b97a8239cb6a34216f44dcac9f3954b14292f2e8c8608f",
+        "e72ef1dffcb20928cf5dd4d56737b151cb864f01",
+        1518978600,
+        2307897000,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "eMudhra Technologies Limited",
+        "emSign Root CA - G1",
+        "40f6af0346a99aa1cd1d555a4e9cce62c7f9634603ee406615833dc8c8d00367",
+        "8ac7ad8f73ac4ec1b5754da540f4fccf7cb58e8c",
+        1518978600,
+        2307897000,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "Global Digital Cybersecurity Authority Co., Ltd. (Formerly Guang Dong Certificate Authority (GDCA))",
+        "GDCA TrustAUTH R5 ROOT",
+        "bfff8fd04433487d6a8aa60c1a29767a9fc2bbb05e420f713a13b992891d3893",
+        "0f36385b811a25c39b314e83cae9346670cc74b4",
+        1416978795,
+        2240582399,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "GlobalSign nv-sa",
+        "GlobalSign",
+        "179fbc148a3dd00fd24ea13458cc43bfa7f59c8182d783a513f6ebec100c8924",
+        "1f24c630cda418ef2069ffad4fdd5f463a1b69aa",
+        1352764800,
+        2147483647,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "GlobalSign nv-sa",
+        "GlobalSign",
+        "2cabeafe37d06ca22aba7391c0033d25982952c453647349763a3ab5ad6ccf69",
+        "8094640eb5a7a1ca119c1fddd59f810263a7fbd1",
+        1418169600,
+        2049321600,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "GlobalSign nv-sa",
+        "GlobalSign",
+        "cbb522d7b7f127ad6a0113865bdf1cd4102e7d0759af635a7cf4720dc963c53b",
+        "d69b561148f01c77c54578c10926df5b856976ad",
+        1237370400,
+        1868522400,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "GlobalSign nv-sa",
+        "GlobalSign Root E46",
+        "cbb9c44d84b8043e1050ea31a69f514955d7bfd2e2c6b49301019ad61d9f5058",
+        "39b46cd5fe8006ebe22f4abb0833a0afdbb9dd84",
+        1553040000,
+        2405116800,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "GlobalSign nv-sa",
+        "GlobalSign Root R46",
+        "4fa3126d8d3a11d1c4855a4f807cbad6cf919d3a5a88b03bea2c6372d93c40c9",
+        "53a2b04bca6bd645e6398a8ec40dd2bf77c3a290",
+        1553040000,
+        2405116800,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "GoDaddy",
+        "Go Daddy Root Certificate Authority - G2",
+        "45140b3247eb9cc8c5b4f0d7b53091f73292089e6e5a63e2749dd3aca9198eda",
+        "47beabc922eae80e78783462a79f45c254fde68b",
+        1251763200,
+        2145916799,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "GoDaddy",
+        "Starfield Root Certificate Authority - G2",
+        "2ce1cb0bf9d2f9e102993fbe215152c3b2dd0cabde1c68e5319b839154dbb7f5",
+        "b51c067cee2b0c3df855ab2d92f4fe39d4e70f0e",
+        1251763200,
+        2145916799,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "Google Trust Services LLC",
+        "GlobalSign",
+        "b085d70b964f191a73e4af0d54ae7a0e07aafdaf9b71dd0862138ab7325a24a2",
+        "6ba0b098e171ef5aadfe4815807710f4bd6f0b28",
+        1352764800,
+        2147483647,
+        "EC P-256",
+    ),
+    EmbeddedRoot(
+        "Google Trust Services LLC",
+        "GTS Root R1",
+        "d947432abde7b7fa90fc2e6b59101b1280e0e1c7e4e40fa3c6887fff57a7f4cf",
+        "e58c1cc4913b38634be9106ee3ad8e6b9dd9814a",
+        1466553600,
+        2097705600,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Google Trust Services LLC",
+        "GTS Root R3",
+        "34d8a73ee208d9bcdb0d956520934b4e40e69482596e8b6f73c8426b010a6f48",
+        "ede571802bc892b95b833cd232683f09cda01e46",
+        1466553600,
+        2097705600,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "Google Trust Services LLC",
+        "GTS Root R4",
+        "349dfa4058c5e263123b398ae795573c4e1313c83fe68f93556cd5e8031b3c7d",
+        "77d30367b5e00c15f60c3861df7ce13b92464d47",
+        1466553600,
+        2097705600,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "Government of Hong Kong (SAR), Hongkong Post, Certizen",
+        "Hongkong Post Root CA 3",
+        "5a2fc03f0c83b090bbfa40604b0988446c7636183df9846e17101a447fb8efd6",
+        "58a2d0ec2052815bc1f3f86402244ec28e024b02",
+        1496456986,
+        2285375386,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Government of Spain, Autoritat de Certificació de la Comunitat Valenciana (ACCV)",
+        "ACCVRAIZ1",
+        "9a6ec012e1a7da9dbe34194d478ad7c0db1822fb071df12981496ed104384113",
+        "93057a8815c64fce882ffa9116522878bc536417",
+        1304588257,
+        1924940257,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Government of Spain, Fábrica Nacional de Moneda y Timbre (FNMT)",
+        "AC RAIZ FNMT-RCM",
+        "ebc5570c29018c4d67b1aa127baf12f703b4611ebc17b7dab5573894179b93fa",
+        "ec503507b215c4956219e2a89a5b42992c4c2c20",
+        1225295996,
+        1893456000,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Government of Spain, Fábrica Nacional de Moneda y Timbre (FNMT)",
+        "AC RAIZ FNMT-RCM SERVIDORES SEGUROS",
+        "554153b13d2cf9ddb753bfbe1a4e0ae08d0aa4187058fe60a2b862b2e4b87bcb",
+        "62ffd99ec0650d03ce7593d2ed3f2d32c9e3e54a",
+        1545298653,
+        2334217053,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "Government of Turkey, Kamu Sertifikasyon Merkezi (Kamu SM)",
+        "TUBITAK Kamu SM SSL Kok Sertifikasi - Surum 1",
+        "46edc3689046d53a453fb3104ab80dcaec658b2660ea1629dd7e867990648716",
+        "3143649becce27eced3a3f0b8f0de4e891ddeeca",
+        1385367955,
+        2329374355,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "HARICA",
+        "HARICA TLS ECC Root CA 2021",
+        "3f99cc474acfce4dfed58794665e478d1547739f2e780f1bb4ca9b133097d401",
+        "bcb0c19de9989270193857e98da7b45d6eee0148",
+        1613732470,
+        2370596469,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "HARICA",
+        "HARICA TLS RSA Root CA 2021",
+        "d95d0e8eda79525bf9beb11b14d2100d3294985f0c62d9fabd9cd999eccb7b1d",
+        "022d0582fa88ce140c0679de7f1410e945d7a56d",
+        1613732138,
+        2370596137,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "HARICA",
+        "Hellenic Academic and Research Institutions ECC RootCA 2015",
+        "44b545aa8a25e65a73ca15dc27fc36d24c1cb9953a066539b11582dc487b4833",
+        "9ff1718d92d59af37d7497b4bc6f84680bbab666",
+        1436265432,
+        2224665432,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "HARICA",
+        "Hellenic Academic and Research Institutions RootCA 2015",
+        "a040929a02ce53b4acf4f2ffc6981ce4496f755e6d45fe0b2a692bcd52523f36",
+        "010c0695a6981914ffbf5fc6b0b695ea29e912a6",
+        1436263881,
+        2224663881,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "IdenTrust Services, LLC",
+        "IdenTrust Commercial Root CA 1",
+        "5d56499be4d2e08bcfcad08a3e38723d50503bde706948e42f55603019e528ae",
+        "df717eaa4ad94ec9558499602d48de5fbcf03a25",
+        1389895943,
+        2021047943,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "IdenTrust Services, LLC",
+        "IdenTrust Public Sector Root CA 1",
+        "30d0895a9a448a262091635522d1f52010b5867acae12c78ef958fd4f4389f2f",
+        "ba29416077983ff4f3eff231053b2eea6d4d45fd",
+        1389894812,
+        2021046812,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Internet Security Research Group",
+        "ISRG Root X1",
+        "96bcec06264976f37460779acf28c5a7cfe8a3c0aae11a8ffcee05c0bddf08c6",
+        "cabd2a79a1076a31f21d253635cb039d4329a5e8",
+        1433415878,
+        2064567878,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Internet Security Research Group",
+        "ISRG Root X2",
+        "69729b8e15a86efc177a57afb7171dfc64add28c2fca8cf1507e34453ccb1470",
+        "bdb1b93cd5978d45c6261455f8db95c75ad153af",
+        1599177600,
+        2231510400,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "iTrusChina Co., Ltd.",
+        "vTrus ECC Root CA",
+        "30fbba2c32238e2a98547af97931e550428b9b3f1c8eeb6633dcfa86c5b27dd3",
+        "f69cdbb0fcf60213b65232a6a3913f1670dac3e1",
+        1533022004,
+        2321940404,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "iTrusChina Co., Ltd.",
+        "vTrus Root CA",
+        "8a71de6559336f426c26e53880d00d88a18da4c6a91f0dcb6194e206c5c96387",
+        "841a69fbf5cd1a2534133de3f8fcb899d0c914b7",
+        1533021845,
+        2321940245,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Izenpe S.A.",
+        "Izenpe.com",
+        "2530cc8e98321502bad96f9b1fba1b099e2d299e0f4548bb914f363bc0d4531f",
+        "2f783d255218a74a653971b52ca29c45156fe919",
+        1197551308,
+        2144305645,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Krajowa Izba Rozliczeniowa S.A. (KIR)",
+        "SZAFIR ROOT CA2",
+        "a1339d33281a0b56e557d3d32b1ce7f9367eb094bd5fa72a7e5004c8ded7cafe",
+        "e252fa953feddb2460bd6e28f39ccccf5eb33fde",
+        1445240610,
+        2076392610,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "Microsec Ltd.",
+        "e-Szigno Root CA 2017",
+        "beb00b30839b9bc32c32e4447905950641f26421b15ed089198b518ae2ea1b99",
+        "89d483034f9e9a48805f7237d4a9a6efcb7c1fd1",
+        1503403626,
+        2292322026,
+        "EC P-256",
+    ),
+    EmbeddedRoot(
+        "Microsec Ltd.",
+        "e-Szigno TLS Root CA 2023",
+        "b49141502d00663d740f2e7ec340c52800962666121a36d09cf7dd2b90384fb4",
+        "6f9ad5d5dfe82cebbe3707ee4f4f52582941d1fe",
+        1689602400,
+        2162988000,
+        "EC P-521",
+    ),
+    EmbeddedRoot(
+        "Microsec Ltd.",
+        "Microsec e-Szigno Root CA 2009",
+        "3c5f81fea5fab82c64bfa2eaecafcde8e077fc8620a7cae537163df36edbf378",
+        "89df74fe5cf40f4a80f9e3377d54da91e101318e",
+        1245151818,
+        1893324618,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "Microsoft Corporation",
+        "Microsoft ECC Root Certificate Authority 2017",
+        "358df39d764af9e1b766e9c972df352ee15cfac227af6ad1d70e8e4a6edcba02",
+        "999a64c37ff47d9fab95f14769891460eec4c3c5",
+        1576710405,
+        2289338164,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "Microsoft Corporation",
+        "Microsoft RSA Root Certificate Authority 2017",
+        "c741f70f4b2a8d88bf2e71c14122ef53ef10eba0cfa5e64cfa20f418853073e0",
+        "73a5e64a3bff8316ff0edccc618a906e4eae4d74",
+        1576709482,
+        2289337223,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "NAVER Cloud Trust Services",
+        "NAVER Global Root Certification Authority",
+        "88f438dcf8ffd1fa8f429115ffe5f82ae1e06e0c70c375faad717b34a49e7265",
+        "8f6bf2a9274ada14a0c4f48e6127f9c01e785dd1",
+        1503046722,
+        2134252799,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "NETLOCK",
+        "NetLock Arany (Class Gold) Főtanúsítvány",
+        "6c61dac3a2def031506be036d2a6fe401994fbd13df9c8d466599274c446ec98",
+        "06083f593f15a104a069a46ba903d006b7970991",
+        1229008101,
+        1859728101,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "OISTE",
+        "OISTE Server Root ECC G1",
+        "eec997c0c30f216f7e3b8b307d2bae42412d753fc8219dafd1520b2572850f49",
+        "3bf68b09ae2a927bbae38d3f1195d9e6440c45e2",
+        1685544148,
+        2473944147,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "OISTE",
+        "OISTE Server Root RSA G1",
+        "9ae36232a5189ffddb353dfd26520c015395d22777dac59db57b98c089a651e6",
+        "f700342594886831e434873f70fe86b3869ff06e",
+        1685543836,
+        2473943835,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "OISTE",
+        "OISTE WISeKey Global Root GB CA",
+        "6b9c08e86eb0f767cfad65cd98b62149e5494a67f5845e7bd1ed019f27b86bd6",
+        "0ff9407618d3d76a4b98f0a8359e0cfd27accced",
+        1417446032,
+        2206365031,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "OISTE",
+        "OISTE WISeKey Global Root GC CA",
+        "8560f91c3624daba9570b5fea0dbe36ff11a8323be9486854fb3f34a5571198d",
+        "e011845e34debe8881b99cf61626d1961fc3b931",
+        1494323314,
+        2283242313,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "SECOM Trust Systems Co., Ltd.",
+        "Security Communication ECC RootCA1",
+        "e74fbda55bd564c473a36b441aa799c8a68e077440e8288b9fa1e50e4bbaca11",
+        "b80e26a9bfd2b23bc0ef46c9bac7bbf61d0d4141",
+        1466054128,
+        2147404528,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "SECOM Trust Systems Co., Ltd.",
+        "Security Communication RootCA2",
+        "513b2cecb810d4cde5dd85391adfc6c2dd60d87bb736d2b521484aa47a0ebef6",
+        "5f3b8cf2f810b37d78b4ceec1919c37334b9c774",
+        1243573239,
+        1874725239,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "Sectigo",
+        "COMODO ECC Certification Authority",
+        "1793927a0614549789adce2f8f34f7f0b66d0f3ae3a3b84d21ec15dbba4fadc7",
+        "9f744e9f2b4dbaec0f312c50b6563b8e2d93c311",
+        1204761600,
+        2147471999,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "Sectigo",
+        "COMODO RSA Certification Authority",
+        "52f0e1c4e58ec629291b60317f074671b85d7ea80d5b07273463534b32b40234",
+        "afe5d244a8d1194230ff479fe2f897bbcd7a8cb4",
+        1263859200,
+        2147471999,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Sectigo",
+        "Sectigo Public Server Authentication Root E46",
+        "c90f26f0fb1b4018b22227519b5ca2b53e2ca5b3be5cf18efe1bef47380c5383",
+        "ec8a396c40f02ebc4275d49fab1c1a5b67bed29a",
+        1616371200,
+        2405289599,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "Sectigo",
+        "Sectigo Public Server Authentication Root R46",
+        "7bb647a62aeeac88bf257aa522d01ffea395e0ab45c73f93f65654ec38f25a06",
+        "ad98f9f3e47d753b65d482b3a45217bb6ef5e438",
+        1616371200,
+        2405289599,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Sectigo",
+        "USERTrust ECC Certification Authority",
+        "4ff460d54b9c86dabfbcfc5712e0400d2bed3fbc4d4fbdaa86e06adcd2a9ad7a",
+        "d1cbca5db2d52a7f693b674de5f05a1d0c957df0",
+        1264982400,
+        2147471999,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "Sectigo",
+        "USERTrust RSA Certification Authority",
+        "e793c9b02fd8aa13e21c31228accb08119643b749c898964b1746d46c3d4cbd2",
+        "2b8f1b57330dbba2d07a6c51f70ee90ddab9ad8e",
+        1264982400,
+        2147471999,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Shanghai Electronic Certification Authority Co., Ltd.",
+        "UCA Extended Validation Root",
+        "d43af9b35473755c9684fc06d7d8cb70ee5c28e773fb294eb41ee71722924d24",
+        "a3a1b06f2461234ae336a5c237fca6ffddf0d73a",
+        1426204800,
+        2177366400,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Shanghai Electronic Certification Authority Co., Ltd.",
+        "UCA Global G2 Root",
+        "9bea11c976fe014764c1be56a6f914b5a560317abd9988393382e5161aa0493c",
+        "28f97816197aff182518aa44fec1a0ce5cb64c8a",
+        1457654400,
+        2240524800,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "SSL.com",
+        "SSL.com EV Root Certification Authority ECC",
+        "22a2c1f7bded704cc1e701b5f408c310880fe956b5de2a4a44f99c873a25a7c8",
+        "4cdd51a3d1f5203214b0c6c532230391c746426d",
+        1455300923,
+        2244305723,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "SSL.com",
+        "SSL.com EV Root Certification Authority RSA R2",
+        "2e7bf16cc22485a7bbe2aa8696750761b0ae39be3b2fe9d0cc6d4ef73491425c",
+        "743af0529bd032a0f44a83cdd4baa97b7c2ec49a",
+        1496254477,
+        2285086477,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "SSL.com",
+        "SSL.com Root Certification Authority ECC",
+        "3417bb06cc6007da1b961c920b8ab4ce3fad820e4aa30b9acbc4a74ebdcebc65",
+        "c3197c3924e654af1bc4ab20957ae2c30e13026a",
+        1455300843,
+        2244305643,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "SSL.com",
+        "SSL.com Root Certification Authority RSA",
+        "85666a562ee0be5ce925c1d8890a6f76a87ec16d4d7d5f29ea7419cf20123b69",
+        "b7ab3308d1ea4477ba1480125a6fbda936490cbb",
+        1455298779,
+        2244303579,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "SSL.com",
+        "SSL.com TLS ECC Root CA 2022",
+        "c32ffd9f46f936d16c3673990959434b9ad60aafbb9e7cf33654f144cc1ba143",
+        "9f5fd91a546df50c71f0ee7abd1749988473e239",
+        1661445228,
+        2418309227,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "SSL.com",
+        "SSL.com TLS RSA Root CA 2022",
+        "8faf7d2e2cb4709bb8e0b33666bf75a5dd45b5de480f8ea8d4bfe6bebc17f2ed",
+        "ec2c834072af269510ff0ef203ee3170f6789dca",
+        1661445262,
+        2418309261,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "SwissSign AG",
+        "SwissSign RSA TLS Root CA 2022 - 1",
+        "193144f431e0fddb740717d4de926a571133884b4360d30e272913cbe660ce41",
+        "81340abe4ccdcecce77dcc8ad457e245a0775dce",
+        1654686502,
+        2443604902,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Taiwan-CA Inc. (TWCA)",
+        "TWCA CYBER Root CA",
+        "3f63bb2814be174ec8b6439cf08d6d56f0b7c405883a5648a334424d6b3ec558",
+        "f6b11c1a8338e97bdbb3a8c83324e02d9c7f2666",
+        1669100069,
+        2458051199,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Taiwan-CA Inc. (TWCA)",
+        "TWCA Global Root CA",
+        "59769007f7685d0fcd50872f9f95d5755a5b2b457d81f3692b610a98672f0e1b",
+        "9cbb4853f6a4f6d352a4e83252556013f5adaf65",
+        1340778513,
+        1924963199,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "Taiwan-CA Inc. (TWCA)",
+        "TWCA Root Certification Authority",
+        "bfd88fe1101c41ae3e801bf8be56350ee9bad1a6b9bd515edc5c6d5b8711ac44",
+        "cf9e876dd3ebfc422697a3b5a37aa076a9062348",
+        1219908273,
+        1924963199,
+        "RSA 2048",
+    ),
+    EmbeddedRoot(
+        "Telia Company",
+        "Telia Root CA v2",
+        "242b69742fcb1e5b2abf98898b94572187544e5b4d9911786573621f6a74b82c",
+        "b999cdd173508ac44705089c8c88fbbea02b40cd",
+        1543492554,
+        2332410954,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "TrustAsia Technologies, Inc.",
+        "TrustAsia Global Root CA G3",
+        "e0d3226aeb1163c2e48ff9be3b50b4c6431be7bb1eacc5c36b5d5ec509039a08",
+        "63cfb6c1272b56e4888e1c239ab62e814724c3c7",
+        1621476619,
+        2410308619,
+        "RSA 4096",
+    ),
+    EmbeddedRoot(
+        "TrustAsia Technologies, Inc.",
+        "TrustAsia Global Root CA G4",
+        "be4b56cb5056c0136a526df444508daa36a0b54f42e4ac38f72af470e479654c",
+        "5773a5615d80b2e6ac3882fc680731ac9fb5925a",
+        1621476622,
+        2410308622,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "TrustAsia Technologies, Inc.",
+        "TrustAsia TLS ECC Root CA",
+        "c0076b9ef0531fb1a656d67c4ebe97cd5dbaa41ef44598acc2489878c92d8711",
+        "b5ec39f3a16637aec3059457e2be11beb7a17f36",
+        1715751716,
+        2346903715,
+        "EC P-384",
+    ),
+    EmbeddedRoot(
+        "TrustAsia Technologies, Inc.",
+        "TrustAsia TLS RSA Root CA",
+        "06c08d7dafd876971eb1124fe67f847ec0c7a158d3ea53cbe940e2ea9791f4c3",
+        "a54650c562ea959a1aa7046f1758c729533d03fa",
+        1715751717,
+        2346903716,
+        "RSA 4096",
+    ),
+)
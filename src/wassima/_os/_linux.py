@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import os
 import time
+from itertools import count
 from pathlib import Path
 from ssl import PEM_cert_to_DER_cert
+from threading import Lock
+from typing import Any, Iterator
 
 # Threshold for considering a system trust store as stale (3 years, in seconds).
 STALE_TRUST_STORE_THRESHOLD_SECONDS: int = 3 * 365 * 24 * 3600
@@ -11,6 +14,13 @@ STALE_TRUST_STORE_THRESHOLD_SECONDS: int = 3 * 365 * 24 * 3600
 # Most recent modification time observed across the trust store source files.
 # Updated by `root_der_certificates`. ``None`` means "no usable info collected".
 _LAST_NEWEST_MTIME: float | None = None
+# Scans may run concurrently (no GIL to serialize them on free-threaded builds).
+# Each scan draws a ticket when it starts and only publishes its observation if
+# no scan that started later already did, so a slow stale scan never overwrites
+# a fresher result.
+_SCAN_TICKETS = count(1)
+_LAST_PUBLISHED_TICKET: int = 0
+_SCAN_STATE_LOCK = Lock()
 
 # source: http://gagravarr.org/writing/openssl-certs/others.shtml
 BUNDLE_TRUST_STORE_DIRECTORIES: list[str] = [
@@ -48,12 +58,10 @@ BANNED_KEYWORD_NOT_TLS: set[str] = {
 }
 
 
-def root_der_certificates() -> list[bytes]:
-    global _LAST_NEWEST_MTIME
-
-    certificates: list[bytes] = []
-    newest_mtime: float = 0.0
-    # Track files we've already processed by their (device, inode) pair so that
+def _iter_trust_store_files() -> Iterator[tuple[Path, os.stat_result]]:
+    """Yield every candidate trust store file along with its stat, once per
+    canonical file. Relies on metadata only, nothing is read here."""
+    # Track files we've already yielded by their (device, inode) pair so that
     # symlinks pointing into the same canonical file (very common, e.g.
     # /etc/ssl/certs/*.pem -> /usr/share/ca-certificates/.../*.crt) and other
     # cross-directory aliases are read and parsed exactly once.
@@ -63,8 +71,10 @@ def root_der_certificates() -> list[bytes]:
         if not os.path.exists(directory):
             continue
 
-        # Use rglob to recursively search all files in directory and subdirectories
-        for filepath in Path(directory).rglob("*"):
+        # Use rglob to recursively search all files in directory and subdirectories.
+        # Sorted, so that the outcome (including which alias of a given inode wins)
+        # does not depend on the filesystem traversal order.
+        for filepath in sorted(Path(directory).rglob("*")):
             try:
                 if not filepath.is_file():  # Skip directories
                     continue
@@ -77,66 +87,112 @@ def root_der_certificates() -> list[bytes]:
                 if any(kw in str(filepath).lower() for kw in BANNED_KEYWORD_NOT_TLS):
                     continue
 
-                try:
-                    st = filepath.stat()
-                except OSError:  # Defensive: stat may fail on broken symlinks
+                st = filepath.stat()
+            except OSError:  # Defensive: e.g. PermissionError, or stat failing on broken symlinks
+                continue
+
+            inode_key = (st.st_dev, st.st_ino)
+            # Some very old cases, we may find st_ino reported
+            # as 0.
+            if st.st_ino != 0:
+                if inode_key in seen_inodes:
                     continue
+                seen_inodes.add(inode_key)
 
-                inode_key = (st.st_dev, st.st_ino)
-                # Some very old cases, we may find st_ino reported
-                # as 0.
-                if st.st_ino != 0:
-                    if inode_key in seen_inodes:
-                        continue
-                    seen_inodes.add(inode_key)
+            yield filepath, st
 
-                if st.st_mtime > newest_mtime:
-                    newest_mtime = st.st_mtime
 
-                with open(filepath, encoding="utf-8") as f:
-                    bundle = f.read()
+def root_der_certificates() -> list[bytes]:
+    global _LAST_NEWEST_MTIME, _LAST_PUBLISHED_TICKET
 
-                if not bundle.strip():  # Skip empty files
-                    continue  # Defensive:
+    with _SCAN_STATE_LOCK:
+        ticket = next(_SCAN_TICKETS)
 
-                line_ending = "\n" if "-----END CERTIFICATE-----\r\n" not in bundle else "\r\n"
-                boundary = "-----END CERTIFICATE-----" + line_ending
+    certificates: list[bytes] = []
+    newest_mtime: float = 0.0
 
-                for chunk in bundle.split(boundary):
-                    if chunk:
-                        start_marker = chunk.find("-----BEGIN CERTIFICATE-----" + line_ending)
+    for filepath, st in _iter_trust_store_files():
+        if st.st_mtime > newest_mtime:
+            newest_mtime = st.st_mtime
 
-                        if start_marker == -1:
-                            break  # Defensive: file that aren't PEM encoded in target directories(...)
+        try:
+            with open(filepath, encoding="utf-8") as f:
+                bundle = f.read()
+        except (OSError, UnicodeDecodeError):  # Defensive: Skip files we can't read
+            # OSError -> e.g. PermissionError
+            # UnicodeDecodeError -> DER ASN.1 encoded
+            continue
 
-                        pem_reconstructed = "".join([chunk[start_marker:], boundary])
+        if not bundle.strip():  # Skip empty files
+            continue  # Defensive:
 
-                        try:
-                            der_certificate = PEM_cert_to_DER_cert(pem_reconstructed)
-                        except ValueError:  # Defensive: malformed cert/base64?
-                            continue
+        line_ending = "\n" if "-----END CERTIFICATE-----\r\n" not in bundle else "\r\n"
+        boundary = "-----END CERTIFICATE-----" + line_ending
 
-                        if der_certificate not in certificates:
-                            certificates.append(der_certificate)
+        for chunk in bundle.split(boundary):
+            if chunk:
+                start_marker = chunk.find("-----BEGIN CERTIFICATE-----" + line_ending)
 
-            except (OSError, UnicodeDecodeError):  # Defensive: Skip files we can't read
-                # OSError -> e.g. PermissionError
-                # UnicodeDecodeError -> DER ASN.1 encoded
-                continue
+                if start_marker == -1:
+                    break  # Defensive: file that aren't PEM encoded in target directories(...)
+
+                pem_reconstructed = "".join([chunk[start_marker:], boundary])
+
+                try:
+                    der_certificate = PEM_cert_to_DER_cert(pem_reconstructed)
+                except ValueError:  # Defensive: malformed cert/base64?
+                    continue
+
+                if der_certificate not in certificates:
+                    certificates.append(der_certificate)
 
-    _LAST_NEWEST_MTIME = newest_mtime if newest_mtime > 0 else None
+    with _SCAN_STATE_LOCK:
+        if ticket > _LAST_PUBLISHED_TICKET:
+            _LAST_PUBLISHED_TICKET = ticket
+            _LAST_NEWEST_MTIME = newest_mtime if newest_mtime > 0 else None
 
     return certificates
 
 
+def trust_store_metadata() -> tuple[tuple[Any, ...], float | None]:
+    """Describe the trust store state from directory and file metadata only (no reads,
+    no parsing). Return the description and the most recent modification time found.
+
+    Any certificate added, removed or modified in place changes the description.
+    """
+    entries: list[tuple[Any, ...]] = []
+    newest_mtime: float = 0.0
+
+    for directory in BUNDLE_TRUST_STORE_DIRECTORIES:
+        try:
+            st = os.stat(directory)
+        except OSError:
+            continue
+        entries.append((directory, st.st_mtime_ns))
+
+    for filepath, st in _iter_trust_store_files():
+        entries.append((str(filepath), st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns))
+
+        if st.st_mtime > newest_mtime:
+            newest_mtime = st.st_mtime
+
+    return tuple(entries), newest_mtime if newest_mtime > 0 else None
+
+
 def is_trust_store_stale(threshold_seconds: int = STALE_TRUST_STORE_THRESHOLD_SECONDS) -> bool:
     """Return True if the system trust store has not been updated for longer than
     ``threshold_seconds``.
 
     The decision relies on the most recent modification time observed during
-    the last call to :func:`root_der_certificates`. If no modification time has
-    been collected yet, returns False.
+    the last call to :func:`root_der_certificates`. Before any scan, it is
+    derived from the trust store metadata (see :func:`trust_store_metadata`).
+    If no modification time can be collected, returns False.
     """
-    if _LAST_NEWEST_MTIME is None:
+    newest_mtime = _LAST_NEWEST_MTIME
+
+    if newest_mtime is None:
+        newest_mtime = trust_store_metadata()[1]
+
+    if newest_mtime is None:
         return False
-    return (time.time() - _LAST_NEWEST_MTIME) >= threshold_seconds
+    return (time.time() - newest_mtime) >= threshold_seconds
@@ -3,6 +3,7 @@ from __future__ import annotations
 import ctypes
 import os
 from ctypes import POINTER, byref, c_int32, c_long, c_void_p
+from typing import Any
 
 # Load frameworks
 _core = ctypes.CDLL(
@@ -14,6 +15,18 @@ _sec = ctypes.CDLL(
     use_errno=True,
 )
 
+# Files backing the system, admin and user trust stores and trust settings.
+# Used to detect changes from metadata only, see trust_store_metadata.
+_TRUST_STORE_PATHS: list[str] = [
+    "/System/Library/Keychains/SystemRootCertificates.keychain",
+    "/System/Library/Security/Certificates.bundle",
+    "/Library/Keychains/System.keychain",
+    "/Library/Security/Trust Settings",
+    "/Library/Security/Trust Settings/Admin.plist",
+    "~/Library/Keychains",
+    "~/Library/Keychains/login.keychain-db",
+]
+
 # PID of the process that imported (and thus initialized) the CoreFoundation
 # and Security frameworks above. CoreFoundation/Security are NOT fork-safe.
 _INIT_PID = os.getpid()
@@ -269,3 +282,24 @@ def root_der_certificates() -> list[bytes]:
         _CFRelease(query)
 
     return certificates
+
+
+def trust_store_metadata() -> tuple[tuple[Any, ...], float | None]:
+    """Describe the keychains and trust settings from file metadata only, without
+    calling into Security.framework. Return the description and the most recent
+    modification time found."""
+    entries: list[tuple[Any, ...]] = []
+    newest_mtime: float = 0.0
+
+    for path in _TRUST_STORE_PATHS:
+        try:
+            st = os.stat(os.path.expanduser(path))
+        except OSError:  # Defensive: location absent on this macOS release
+            continue
+
+        entries.append((path, st.st_ino, st.st_size, st.st_mtime_ns))
+
+        if st.st_mtime > newest_mtime:
+            newest_mtime = st.st_mtime
+
+    return tuple(entries), newest_mtime if newest_mtime > 0 else None
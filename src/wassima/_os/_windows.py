@@ -5,6 +5,7 @@ import hashlib
 import sys
 from ctypes import POINTER, c_char_p, c_int32, c_ubyte, c_uint32, c_void_p
 from ssl import enum_certificates  # type: ignore[attr-defined]
+from typing import Any
 
 from ._embed import root_der_certificates as _ccadb_root_certificates
 
@@ -18,6 +19,25 @@ WINDOWS_STORES: list[str] = [
 ]
 SERVER_AUTH_OID: str = "1.3.6.1.5.5.7.3.1"
 
+# Registry locations backing the certificate stores above (physical stores of the
+# current user, local machine, group policy and enterprise), plus the AuthRoot
+# trust list. Used to detect changes from metadata only, see trust_store_metadata.
+_TRUST_STORE_REGISTRY_KEYS: list[tuple[str, str]] = [
+    (hive, location.format(store=store))
+    for store in WINDOWS_STORES
+    for hive, location in (
+        ("HKEY_CURRENT_USER", r"SOFTWARE\Microsoft\SystemCertificates\{store}\Certificates"),
+        ("HKEY_LOCAL_MACHINE", r"SOFTWARE\Microsoft\SystemCertificates\{store}\Certificates"),
+        ("HKEY_LOCAL_MACHINE", r"SOFTWARE\Policies\Microsoft\SystemCertificates\{store}\Certificates"),
+        ("HKEY_LOCAL_MACHINE", r"SOFTWARE\Microsoft\EnterpriseCertificates\{store}\Certificates"),
+    )
+] + [
+    ("HKEY_LOCAL_MACHINE", r"SOFTWARE\Microsoft\SystemCertificates\AuthRoot\AutoUpdate"),
+]
+
+# FILETIME (100ns intervals since 1601-01-01) to UNIX epoch.
+_FILETIME_EPOCH_OFFSET_SECONDS = 11644473600
+
 
 def root_der_certificates() -> list[bytes]:
     certificates: list[bytes] = []
@@ -192,6 +212,42 @@ if sys.platform == "win32":
         _CertFreeCTLContext.restype = _BOOL
 
 
+def trust_store_metadata() -> tuple[tuple[Any, ...], float | None]:
+    """Describe the certificate stores from registry key metadata only (subkey count,
+    value count and last write time), without enumerating any certificate.
+    Return the description and the most recent modification time found."""
+    if sys.platform != "win32":  # Defensive: winreg is Windows-only.
+        return (), None
+    import winreg
+
+    entries: list[tuple[Any, ...]] = []
+    newest_mtime: float = 0.0
+
+    for hive, location in _TRUST_STORE_REGISTRY_KEYS:
+        try:
+            key = winreg.OpenKey(getattr(winreg, hive), location)
+        except OSError:
+            continue
+
+        try:
+            subkeys, values, last_write = winreg.QueryInfoKey(key)
+        finally:
+            winreg.CloseKey(key)
+
+        entries.append((hive, location, subkeys, values, last_write))
+
+        mtime = last_write / 10_000_000 - _FILETIME_EPOCH_OFFSET_SECONDS
+
+        if mtime > newest_mtime:
+            newest_mtime = mtime
+
+    return tuple(entries), newest_mtime if newest_mtime > 0 else None
+
+
+#: DER -> SHA-1 thumbprint, so that a refresh does not hash the same candidates all over again
+_THUMBPRINTS: dict[bytes, bytes] = {}
+
+
 def _sha1(data: bytes) -> bytes:
     """SHA-1 digest used purely as an identity/join key against the CTL."""
     try:
@@ -282,7 +338,20 @@ def _os_trusted_subset(candidates: list[bytes]) -> list[bytes]:
     trusted = _authroot_ctl_thumbprints()
     if not trusted:
         return []  # Defensive: empty OS trust list
-    return [der for der in candidates if _sha1(der) in trusted]
+    return [der for der, thumbprint in zip(candidates, _thumbprints(candidates)) if thumbprint in trusted]
+
+
+def _thumbprints(candidates: list[bytes]) -> list[bytes]:
+    """SHA-1 of each candidate, computed once per process and keyed on the DER itself:
+    this decides what Windows trusts, it must never be paired with the wrong certificate."""
+    for der in candidates:
+        if der not in _THUMBPRINTS:
+            _THUMBPRINTS[der] = _sha1(der)
+
+    return [_THUMBPRINTS[der] for der in candidates]
 
 
-__all__ = ("root_der_certificates",)
+__all__ = (
+    "root_der_certificates",
+    "trust_store_metadata",
+)
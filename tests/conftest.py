@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from wassima._der import _encode_tlv
+
+
+def fake_certificate(
+    subject: bytes = _encode_tlv(0x30, b""),
+    validity: bytes = _encode_tlv(0x30, b"\x17\x0d991231235959Z\x18\x0f20500101000000Z"),
+    algorithm: bytes = b"\x06\x03\x2a\x03\x04",
+    public_key: bytes = b"",
+    extensions: bytes = b"",
+    serial: int = 1,
+) -> bytes:
+    """Just enough of a certificate for the DER reader: a TBSCertificate with the given fields,
+    an empty issuer and no signature. OpenSSL cannot load it."""
+    spki = _encode_tlv(0x30, _encode_tlv(0x30, algorithm) + _encode_tlv(0x03, b"\x00" + public_key))
+    tbs = _encode_tlv(0x02, bytes((serial,))) + b"\x30\x00" + _encode_tlv(0x30, b"") + validity + subject + spki + extensions
+    return _encode_tlv(0x30, _encode_tlv(0x30, tbs))
+
+
+def fake_name(*attributes: tuple[int, bytes]) -> bytes:
+    """A DER name made of a single RDN holding a common name per ``(string tag, value)``."""
+    cn = b"\x06\x03\x55\x04\x03"
+    rdn = b"".join(_encode_tlv(0x30, cn + _encode_tlv(tag, value)) for tag, value in attributes)
+    return _encode_tlv(0x30, _encode_tlv(0x31, rdn))
@@ -0,0 +1,469 @@
+from __future__ import annotations
+
+import os
+import shutil
+import ssl
+import subprocess
+import sys
+import time
+from typing import Iterator
+
+import pytest
+
+import wassima
+from wassima import (
+    _bundle,
+    _der,
+    ca_directory,
+    create_default_ssl_context,
+    generate_ca_bundle,
+    register_ca,
+    root_der_certificates,
+    root_pem_certificates,
+    where,
+)
+from wassima.__main__ import main
+from wassima._os._embed import root_der_certificates as fallback_der_certificates
+
+from .conftest import fake_certificate, fake_name
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(monkeypatch, tmp_path) -> Iterator[None]:  # type: ignore[no-untyped-def]
+    monkeypatch.setenv(_bundle.CACHE_DIRECTORY_ENV, str(tmp_path / "cache"))
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: fallback_der_certificates()[:5])
+    wassima._MANUALLY_REGISTERED_CA.clear()
+    wassima._BUNDLE_FILES.clear()
+    wassima._CA_DIRECTORIES.clear()
+    root_der_certificates.cache_clear()
+    root_pem_certificates.cache_clear()
+    yield
+    wassima.use_frozen_trust_store(None)
+    wassima._MANUALLY_REGISTERED_CA.clear()
+    wassima._BUNDLE_FILES.clear()
+    wassima._CA_DIRECTORIES.clear()
+    root_der_certificates.cache_clear()
+    root_pem_certificates.cache_clear()
+
+
+def test_where_writes_bundle_once(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    path = where()
+    assert where() is path
+
+    assert os.path.dirname(path) == str(tmp_path / "cache")
+    assert wassima.trust_store_fingerprint()[:32] in os.path.basename(path)
+
+    with open(path) as fp:
+        assert fp.read() == generate_ca_bundle()
+
+    mtime_ns = os.stat(path).st_mtime_ns
+
+    # Another process, same trust set: the file is reused as-is.
+    wassima._BUNDLE_FILES.clear()
+    assert where() == path
+    assert os.stat(path).st_mtime_ns == mtime_ns
+    assert [name for name in os.listdir(tmp_path / "cache")] == [os.path.basename(path)]
+
+
+def test_where_follows_trust_store_changes() -> None:
+    path = where()
+    hybrid_path = where(hybrid_store=True)
+
+    assert hybrid_path != path
+
+    register_ca(fallback_der_certificates()[7])
+    updated = where()
+
+    assert updated != path
+    with open(updated) as fp:
+        assert fp.read() == generate_ca_bundle()
+
+
+def test_where_rewrites_tampered_bundle() -> None:
+    path = where()
+
+    with open(path, "w") as fp:
+        fp.write("tampered")
+
+    wassima._BUNDLE_FILES.clear()
+    assert where() == path
+
+    with open(path) as fp:
+        assert fp.read() == generate_ca_bundle()
+
+
+def test_where_recreates_deleted_bundle() -> None:
+    path = where()
+    os.unlink(path)
+
+    assert where() == path
+    assert os.path.exists(path)
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX only")
+def test_cache_directory_refuses_foreign_directory(monkeypatch, tmp_path) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr(os, "getuid", lambda: os.stat(tmp_path).st_uid + 1)
+
+    with pytest.raises(OSError):
+        _bundle.cache_directory()
+
+
+@pytest.mark.parametrize(
+    "platform, expected",
+    [
+        ("linux", ("xdg", "wassima")),
+        ("darwin", ("home", "Library", "Caches", "wassima")),
+        ("win32", ("appdata", "wassima", "Cache")),
+    ],
+)
+def test_cache_directory_defaults(monkeypatch, tmp_path, platform: str, expected: tuple[str, ...]) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.delenv(_bundle.CACHE_DIRECTORY_ENV)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path / "appdata"))
+    monkeypatch.setattr(os.path, "expanduser", lambda path: str(tmp_path / "home"))
+    monkeypatch.setattr(sys, "platform", platform)
+
+    candidates = _bundle._cache_directory_candidates()
+
+    assert candidates[0] == os.path.join(str(tmp_path), *expected)
+    # Read-only home: fall back to a per-user directory in the temp dir.
+    assert os.path.basename(candidates[-1]).startswith("wassima-")
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX only")
+def test_cache_directory_permissions(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    # Created private to the user...
+    assert os.stat(_bundle.cache_directory()).st_mode & 0o777 == 0o700
+
+    # ...while what is written there is public, for a directory shared on purpose.
+    assert os.stat(where()).st_mode & 0o777 == 0o644
+    path = ca_directory()
+    assert os.stat(path).st_mode & 0o777 == 0o755
+    assert {os.stat(os.path.join(path, name)).st_mode & 0o777 for name in os.listdir(path)} == {0o644}
+
+
+def test_cache_directory_skips_unusable_candidates(monkeypatch, tmp_path) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr(_bundle, "_cache_directory_candidates", lambda: [str(tmp_path / "file"), str(tmp_path / "ok")])
+    (tmp_path / "file").write_text("not a directory")
+
+    assert _bundle.cache_directory() == str(tmp_path / "ok")
+
+
+def test_write_atomically_cleans_up_on_failure(monkeypatch, tmp_path) -> None:  # type: ignore[no-untyped-def]
+    def broken_replace(src: str, dst: str) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", broken_replace)
+
+    with pytest.raises(OSError):
+        _bundle.write_atomically(str(tmp_path / "bundle.pem"), b"data")
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_subject_name_hash_known_value() -> None:
+    isrg_root_x1 = next(c for c in fallback_der_certificates() if b"ISRG Root X1" in c)
+
+    assert _der.subject_name_hash(isrg_root_x1) == "4042bcee"
+
+
+@pytest.mark.skipif(shutil.which("openssl") is None, reason="needs the openssl command")
+def test_subject_name_hash_matches_openssl() -> None:
+    for certificate in fallback_der_certificates():
+        expected = subprocess.run(
+            ["openssl", "x509", "-inform", "DER", "-noout", "-hash"],
+            input=certificate,
+            capture_output=True,
+            check=True,
+        ).stdout.decode()
+
+        assert _der.subject_name_hash(certificate) == expected.strip()
+
+
+def test_subject_name_hash_canonicalization() -> None:
+    reference = _der.subject_name_hash(fake_certificate(fake_name((0x0C, b"foo bar"))))
+
+    # Case, whitespaces and string type do not matter...
+    assert _der.subject_name_hash(fake_certificate(fake_name((0x13, b"  Foo \t  BAR ")))) == reference
+    assert _der.subject_name_hash(fake_certificate(fake_name((0x1E, "FOO BAR".encode("utf-16-be"))))) == reference
+    # ...unless OpenSSL does not canonicalize that type.
+    assert _der.subject_name_hash(fake_certificate(fake_name((0x12, b"foo bar")))) != reference
+    # Multi-valued RDNs are sorted.
+    assert _der.subject_name_hash(fake_certificate(fake_name((0x0C, b"a"), (0x0C, b"b")))) == _der.subject_name_hash(
+        fake_certificate(fake_name((0x0C, b"b"), (0x0C, b"a")))
+    )
+    # Long form lengths.
+    assert _der.subject_name_hash(fake_certificate(fake_name((0x0C, b"x" * 300)))) == _der.subject_name_hash(
+        fake_certificate(fake_name((0x13, b"X" * 300)))
+    )
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"\x30",
+        b"\x30\x85\x01",
+        b"\x30\x80",
+        b"\x30\x05\x00",
+        b"\x02\x00",
+        b"\x30\x02\x02\x00",
+        _der._encode_tlv(0x30, _der._encode_tlv(0x30, b"\x02\x01\x01")),
+        fake_certificate(b"\x02\x00"),
+        fake_certificate(_der._encode_tlv(0x30, b"\x02\x00")),
+    ],
+)
+def test_subject_name_hash_rejects_invalid_der(data: bytes) -> None:
+    with pytest.raises(ValueError):
+        _der.subject_name_hash(data)
+
+
+def test_ca_directory_layout(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    path = ca_directory()
+
+    assert ca_directory() is path
+    assert os.path.dirname(path) == str(tmp_path / "cache")
+    assert wassima.trust_store_fingerprint()[:32] in os.path.basename(path)
+
+    expected: dict[str, str] = {}
+
+    for certificate in root_der_certificates():
+        name_hash = _der.subject_name_hash(certificate)
+        n = sum(1 for name in expected if name.startswith(name_hash))
+        expected[f"{name_hash}.{n}"] = ssl.DER_cert_to_PEM_cert(certificate)
+
+    assert sorted(os.listdir(path)) == sorted(expected)
+
+    for name, pem in expected.items():
+        with open(os.path.join(path, name)) as fp:
+            assert fp.read() == pem
+
+    # Another process, same trust set: reused as-is.
+    wassima._CA_DIRECTORIES.clear()
+    assert ca_directory() == path
+
+
+def test_ca_directory_same_subject(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    certificate = fallback_der_certificates()[0]
+    name_hash = _der.subject_name_hash(certificate)
+
+    # e.g. a renewed CA, keeping its subject.
+    monkeypatch.setattr(_der, "subject_name_hash", lambda der: name_hash)
+
+    assert sorted(os.listdir(ca_directory())) == [f"{name_hash}.{n}" for n in range(5)]
+
+
+def test_ca_directory_skips_unreadable_certificates(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    # e.g. a corrupt file in the OS trust store.
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: fallback_der_certificates()[:5] + [b"\x30\x03\x02\x01\x01"])
+
+    assert len(root_der_certificates()) == 6
+    assert len(os.listdir(ca_directory())) == 5
+    assert create_default_ssl_context(lazy=True).verify_mode == ssl.CERT_REQUIRED
+
+
+def test_ca_directory_repairs_tampered_directory() -> None:
+    path = ca_directory()
+    files = sorted(os.listdir(path))
+
+    os.unlink(os.path.join(path, files[0]))
+    with open(os.path.join(path, "intruder.0"), "w") as fp:
+        fp.write("tampered")
+
+    wassima._CA_DIRECTORIES.clear()
+    assert ca_directory() == path
+    assert sorted(os.listdir(path)) == files
+    # Nothing left behind.
+    assert os.listdir(os.path.dirname(path)) == [os.path.basename(path)]
+
+
+def test_write_directory_atomically_lost_race(monkeypatch, tmp_path) -> None:  # type: ignore[no-untyped-def]
+    files = {"a.0": b"a"}
+    target = str(tmp_path / "dir")
+    _bundle.write_directory_atomically(target, files)
+
+    # Another process just wrote the same directory: keep theirs.
+    monkeypatch.setattr(_bundle, "has_directory_content", lambda path, files: os.path.isdir(path))
+    inode = os.stat(target).st_ino
+    _bundle.write_directory_atomically(target, files)
+
+    assert os.stat(target).st_ino == inode
+    assert os.listdir(tmp_path) == ["dir"]
+
+
+def test_write_directory_atomically_cleans_up_on_failure(monkeypatch, tmp_path) -> None:  # type: ignore[no-untyped-def]
+    def broken_rename(src: str, dst: str) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "rename", broken_rename)
+    monkeypatch.setattr(os.path, "isdir", lambda path: False)
+
+    with pytest.raises(OSError):
+        _bundle.write_directory_atomically(str(tmp_path / "dir"), {"a.0": b"a"})
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_create_lazy_ssl_context() -> None:
+    ctx = create_default_ssl_context(lazy=True)
+
+    assert ctx.verify_mode == ssl.CERT_REQUIRED
+    assert ctx.check_hostname is True
+    # Nothing loaded upfront: OpenSSL reads from the hashed directory on demand.
+    assert ctx.get_ca_certs() == []
+    assert len(create_default_ssl_context().get_ca_certs()) == 5
+
+
+def test_snapshot_round_trip() -> None:
+    certificates = fallback_der_certificates()[:3]
+
+    assert _bundle.load_snapshot(_bundle.dump_snapshot(certificates)) == certificates
+    assert _bundle.load_snapshot(_bundle.dump_snapshot([])) == []
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"-----BEGIN CERTIFICATE-----",
+        _bundle.SNAPSHOT_MAGIC + b"\x00\x00",
+        _bundle.SNAPSHOT_MAGIC + b"\x00\x00\x00\x02\x00\x00\x00\x00",
+        _bundle.dump_snapshot(fallback_der_certificates()[:2])[:-1],
+        _bundle.SNAPSHOT_MAGIC + bytes.fromhex("00000002000000000000000200000001") + b"\x30\x00",
+    ],
+)
+def test_invalid_snapshot(data: bytes) -> None:
+    with pytest.raises(ValueError):
+        _bundle.load_snapshot(data)
+
+
+def _refuse(*args: object) -> None:
+    raise AssertionError("a frozen trust store must not touch the OS trust store")
+
+
+def test_freeze(monkeypatch, tmp_path, capsys) -> None:  # type: ignore[no-untyped-def]
+    path = str(tmp_path / "frozen.der")
+    extra = tmp_path / "extra.pem"
+    extra.write_text(ssl.DER_cert_to_PEM_cert(fallback_der_certificates()[7]))
+
+    assert main(["freeze", path, "--ca", str(extra)]) == 0
+    assert "froze 6 certificates" in capsys.readouterr().err
+    assert _bundle.read_snapshot(path) == sorted(fallback_der_certificates()[:5] + [fallback_der_certificates()[7]])
+
+    # The live trust store is frozen, not the snapshot in use.
+    wassima.use_frozen_trust_store(path)
+    wassima._MANUALLY_REGISTERED_CA.clear()
+
+    assert main(["freeze", path, "--hybrid"]) == 0
+    assert _bundle.read_snapshot(path) == sorted(fallback_der_certificates())
+
+
+def test_freeze_failure(tmp_path, capsys) -> None:  # type: ignore[no-untyped-def]
+    assert main(["freeze", str(tmp_path / "frozen.der"), "--ca", str(tmp_path / "missing.pem")]) == 1
+    assert "missing.pem" in capsys.readouterr().err
+    assert not os.path.exists(tmp_path / "frozen.der")
+
+
+def test_use_frozen_trust_store(monkeypatch, tmp_path) -> None:  # type: ignore[no-untyped-def]
+    path = str(tmp_path / "frozen.der")
+    frozen = fallback_der_certificates()[10:13]
+    _bundle.write_atomically(path, _bundle.dump_snapshot(frozen))
+
+    root_der_certificates()
+    wassima.use_frozen_trust_store(path)
+
+    monkeypatch.setattr("wassima._root_der_certificates", _refuse)
+    monkeypatch.setattr("wassima._trust_store_metadata", _refuse)
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", _refuse)
+    monkeypatch.setattr(_bundle, "read_snapshot", _refuse)
+
+    assert root_der_certificates() == sorted(frozen)
+    assert root_der_certificates(True) == sorted(fallback_der_certificates())
+
+    register_ca(fallback_der_certificates()[20])
+
+    assert root_der_certificates() == sorted(frozen + [fallback_der_certificates()[20]])
+
+    # Cached results never expire, and a refresh finds nothing to rescan.
+    monkeypatch.setattr("wassima.time.monotonic", lambda: 1e12)
+
+    assert root_der_certificates.cache_peek((False,)) is not None
+    assert wassima.refresh_trust_store() is False
+
+    wassima.use_frozen_trust_store(None)
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: fallback_der_certificates()[:5])
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+
+    assert root_der_certificates() == sorted(fallback_der_certificates()[:5] + [fallback_der_certificates()[20]])
+
+
+def test_use_frozen_trust_store_missing(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    with pytest.raises(OSError):
+        wassima.use_frozen_trust_store(str(tmp_path / "missing.der"))
+
+
+def test_frozen_trust_store_from_environment(monkeypatch, tmp_path) -> None:  # type: ignore[no-untyped-def]
+    path = str(tmp_path / "frozen.der")
+    frozen = fallback_der_certificates()[10:13]
+    _bundle.write_atomically(path, _bundle.dump_snapshot(frozen))
+
+    # As read at import time from WASSIMA_FROZEN_TRUST_STORE.
+    monkeypatch.setattr("wassima._FROZEN_TRUST_STORE_PATH", path)
+    monkeypatch.setattr("wassima._root_der_certificates", _refuse)
+
+    assert root_der_certificates() == sorted(frozen)
+    assert wassima._FROZEN_TRUST_STORE_PATH is None
+
+
+def test_no_deadlock_between_use_frozen_trust_store_and_a_cold_scan(monkeypatch, tmp_path) -> None:  # type: ignore[no-untyped-def]
+    """Regression test: a cold scan loads WASSIMA_FROZEN_TRUST_STORE while holding the
+    cache lock, ``use_frozen_trust_store`` must not wait for that lock while holding
+    _FROZEN_TRUST_STORE_LOCK."""
+    import threading
+
+    path = str(tmp_path / "frozen.der")
+    frozen = fallback_der_certificates()[10:13]
+    _bundle.write_atomically(path, _bundle.dump_snapshot(frozen))
+
+    monkeypatch.setattr("wassima._FROZEN_TRUST_STORE_PATH", path)
+    monkeypatch.setattr("wassima._root_der_certificates", _refuse)
+
+    scanning = threading.Event()
+    scan = threading.Thread(target=root_der_certificates, daemon=True)
+
+    class SlowLock:
+        """The scan saw WASSIMA_FROZEN_TRUST_STORE unresolved, and is slow to take the lock."""
+
+        def __init__(self) -> None:
+            self._lock = threading.RLock()
+
+        def __enter__(self) -> None:
+            if threading.current_thread() is scan:
+                scanning.set()
+                # Let use_frozen_trust_store enter its critical section meanwhile.
+                time.sleep(0.2)
+            self._lock.acquire()
+
+        def __exit__(self, *args: object) -> None:
+            self._lock.release()
+
+    monkeypatch.setattr("wassima._FROZEN_TRUST_STORE_LOCK", SlowLock())
+
+    scan.start()
+    assert scanning.wait(10)
+
+    swap = threading.Thread(target=wassima.use_frozen_trust_store, args=(path,), daemon=True)
+    swap.start()
+
+    scan.join(10)
+    swap.join(10)
+    assert not scan.is_alive() and not swap.is_alive(), "deadlock"
+    assert root_der_certificates() == sorted(frozen)
+
+
+def test_frozen_trust_store_from_environment_unusable(monkeypatch, tmp_path) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr("wassima._FROZEN_TRUST_STORE_PATH", str(tmp_path / "missing.der"))
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+
+    with pytest.warns(RuntimeWarning, match="uses the live trust store"):
+        assert root_der_certificates() == sorted(fallback_der_certificates()[:5])
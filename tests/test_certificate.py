@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import shutil
+import ssl
+import subprocess
+from datetime import datetime, timezone
+
+import pytest
+
+import wassima
+from wassima import Certificate, CertificateIndex, root_certificates, root_der_certificates
+from wassima._der import _encode_tlv
+from wassima._os._embed import root_der_certificates as fallback_der_certificates
+
+from .conftest import fake_certificate
+
+ISRG_ROOT_X1 = next(c for c in fallback_der_certificates() if b"ISRG Root X1" in c)
+
+
+def test_certificate_fields() -> None:
+    certificate = Certificate(ISRG_ROOT_X1)
+
+    assert certificate.subject == "CN=ISRG Root X1,O=Internet Security Research Group,C=US"
+    assert certificate.issuer == certificate.subject
+    assert certificate.not_before == datetime(2015, 6, 4, 11, 4, 38, tzinfo=timezone.utc)
+    assert certificate.not_after == datetime(2035, 6, 4, 11, 4, 38, tzinfo=timezone.utc)
+    assert certificate.subject_key_identifier == bytes.fromhex("79b459e67bb6e5e40173800888c81a58f6e99b6e")
+    assert certificate.public_key_algorithm == "rsaEncryption"
+    # The well-known SPKI pin of ISRG Root X1.
+    assert hashlib.sha256(certificate.subject_public_key_info).digest() == base64.b64decode(
+        "C5+lpZ7tcVwmwQIMcRtPbsQtWLABXhQzejna0wHFr8M="
+    )
+    assert certificate.sha256_fingerprint == "96bcec06264976f37460779acf28c5a7cfe8a3c0aae11a8ffcee05c0bddf08c6"
+    assert certificate.sha1_fingerprint == "cabd2a79a1076a31f21d253635cb039d4329a5e8"
+    assert certificate.pem.startswith("-----BEGIN CERTIFICATE-----")
+    assert repr(certificate) == "<Certificate 'CN=ISRG Root X1,O=Internet Security Research Group,C=US'>"
+
+
+def test_certificate_is_lazy() -> None:
+    certificate = Certificate(ISRG_ROOT_X1)
+
+    # Nothing decoded upfront...
+    for name in Certificate.__slots__[1:]:
+        assert not hasattr(certificate, name)
+
+    # ...then only what was asked for, once.
+    assert certificate.not_after is certificate.not_after
+    assert not hasattr(certificate, "_subject")
+    assert certificate.subject is certificate.subject
+    assert certificate.subject_key_identifier is certificate.subject_key_identifier
+    assert certificate.public_key_algorithm is certificate.public_key_algorithm
+    assert certificate.sha256_fingerprint is certificate.sha256_fingerprint
+    assert certificate.sha1_fingerprint is certificate.sha1_fingerprint
+    assert certificate.issuer is certificate.issuer
+
+
+def test_certificate_equality() -> None:
+    assert Certificate(ISRG_ROOT_X1) == Certificate(bytes(ISRG_ROOT_X1))
+    assert len({Certificate(ISRG_ROOT_X1), Certificate(bytes(ISRG_ROOT_X1))}) == 1
+    assert Certificate(ISRG_ROOT_X1) != Certificate(fallback_der_certificates()[0])
+    assert Certificate(ISRG_ROOT_X1) != ISRG_ROOT_X1
+
+
+def test_certificate_uncommon_encodings() -> None:
+    cn = b"\x06\x03\x55\x04\x03"
+    serial_number = b"\x06\x03\x55\x04\x05"
+    subject = _encode_tlv(
+        0x30,
+        _encode_tlv(0x31, _encode_tlv(0x30, serial_number + b"\x03\x02\x00\x01"))
+        + _encode_tlv(0x31, _encode_tlv(0x30, cn + _encode_tlv(0x0C, b"#a,b ")) + _encode_tlv(0x30, cn + b"\x12\x011")),
+    )
+    certificate = Certificate(fake_certificate(subject=subject))
+
+    assert certificate.subject == "CN=\\#a\\,b\\ +CN=1,2.5.4.5=#03020001"
+    assert certificate.issuer == ""
+    # UTCTime from the past century, then GeneralizedTime.
+    assert certificate.not_before == datetime(1999, 12, 31, 23, 59, 59, tzinfo=timezone.utc)
+    assert certificate.not_after == datetime(2050, 1, 1, tzinfo=timezone.utc)
+    assert certificate.subject_key_identifier is None
+    assert certificate.public_key_algorithm == "1.2.3.4"
+
+
+def test_certificate_extensions_without_subject_key_identifier() -> None:
+    basic_constraints = _encode_tlv(0x30, b"\x06\x03\x55\x1d\x13\x01\x01\xff" + _encode_tlv(0x04, b"\x30\x00"))
+    extensions = b"\x81\x01\x00" + _encode_tlv(0xA3, _encode_tlv(0x30, basic_constraints))
+
+    assert Certificate(fake_certificate(extensions=extensions)).subject_key_identifier is None
+
+
+@pytest.mark.parametrize(
+    "field, kwargs",
+    [
+        ("not_after", {"validity": _encode_tlv(0x30, b"\x04\x00\x04\x00")}),
+        ("public_key_algorithm", {"algorithm": b"\x06\x00"}),
+        ("subject", {"subject": b"\x04\x00"}),
+    ],
+)
+def test_certificate_invalid_fields(field: str, kwargs) -> None:  # type: ignore[no-untyped-def]
+    certificate = Certificate(fake_certificate(**kwargs))
+
+    with pytest.raises(ValueError):
+        getattr(certificate, field)
+
+
+@pytest.mark.skipif(shutil.which("openssl") is None, reason="needs the openssl command")
+def test_certificate_matches_openssl() -> None:
+    for der in fallback_der_certificates():
+        lines = subprocess.run(
+            ["openssl", "x509", "-inform", "DER", "-noout", "-startdate", "-enddate", "-ext", "subjectKeyIdentifier"],
+            input=der,
+            capture_output=True,
+            check=True,
+        ).stdout.decode()
+        certificate = Certificate(der)
+
+        for name, value in (("notBefore", certificate.not_before), ("notAfter", certificate.not_after)):
+            assert f"{name}={value:%b} {value.day:>2} {value:%H:%M:%S %Y} GMT" in lines
+
+        if certificate.subject_key_identifier is not None:
+            assert ":".join(f"{b:02X}" for b in certificate.subject_key_identifier) in lines
+
+
+def test_root_certificates_are_reused_per_snapshot(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: embed[:3])
+    root_der_certificates.cache_clear()
+
+    try:
+        certificates = root_certificates()
+
+        assert [c.der for c in certificates] == root_der_certificates()
+        assert all(a is b for a, b in zip(certificates, root_certificates()))
+
+        wassima.register_ca(embed[5])
+        assert len(root_certificates()) == 4
+    finally:
+        wassima._MANUALLY_REGISTERED_CA.clear()
+        root_der_certificates.cache_clear()
+        wassima.root_pem_certificates.cache_clear()
+
+
+def test_trust_store_index_lookups(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    os_certificates = [c for c in embed[:20] if c != ISRG_ROOT_X1]
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: os_certificates)
+    root_der_certificates.cache_clear()
+
+    try:
+        wassima.register_ca(ISRG_ROOT_X1)
+        index = wassima.trust_store_index()
+        isrg = Certificate(ISRG_ROOT_X1)
+
+        assert len(index) == len(os_certificates) + 1
+        assert list(index) == root_certificates()
+        # Registered CAs are indexed too.
+        assert ISRG_ROOT_X1 in index
+        assert isrg in index
+        assert embed[50] not in index
+        assert index.get(ISRG_ROOT_X1) == isrg
+        assert index.get(embed[50]) is None
+
+        assert index.by_fingerprint(isrg.sha256_fingerprint) == isrg
+        assert index.by_fingerprint(isrg.sha1_fingerprint.upper()) == isrg
+        assert index.by_fingerprint(":".join(f"{b:02X}" for b in bytes.fromhex(isrg.sha256_fingerprint))) == isrg
+        assert index.by_fingerprint("00" * 32) is None
+
+        assert index.by_subject("CN=ISRG Root X1,O=Internet Security Research Group,C=US") == [isrg]
+        assert index.by_subject(isrg.subject_der) == [isrg]
+        assert index.by_subject("CN=Nope") == []
+
+        assert isrg.subject_key_identifier is not None
+        assert index.by_key_identifier(isrg.subject_key_identifier) == [isrg]
+        assert index.by_key_identifier(b"nope") == []
+
+        # The CCADB bundle, when merged.
+        assert embed[50] in wassima.trust_store_index(hybrid_store=True)
+    finally:
+        wassima._MANUALLY_REGISTERED_CA.clear()
+        root_der_certificates.cache_clear()
+        wassima.root_pem_certificates.cache_clear()
+
+
+def test_index_skips_unreadable_certificates() -> None:
+    isrg = Certificate(ISRG_ROOT_X1)
+    # e.g. a corrupt file in the OS trust store.
+    unreadable = Certificate(b"\x30\x03\x02\x01\x01")
+    index = CertificateIndex([unreadable, isrg])
+
+    assert unreadable in index
+    assert index.by_fingerprint(unreadable.sha256_fingerprint) == unreadable
+    assert index.by_subject(isrg.subject) == [isrg]
+    assert isrg.subject_key_identifier is not None
+    assert index.by_key_identifier(isrg.subject_key_identifier) == [isrg]
+
+
+def test_trust_store_index_rebuilt_only_on_change(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: embed[:3])
+    root_der_certificates.cache_clear()
+
+    try:
+        index = wassima.trust_store_index()
+        assert wassima.trust_store_index() is index
+
+        wassima.register_ca(embed[5])
+        updated = wassima.trust_store_index()
+
+        assert updated is not index
+        assert embed[5] in updated and embed[5] not in index
+        # Wrappers (and what they decoded) are shared with root_certificates().
+        assert all(a is b for a, b in zip(updated, root_certificates()))
+    finally:
+        wassima._MANUALLY_REGISTERED_CA.clear()
+        root_der_certificates.cache_clear()
+        wassima.root_pem_certificates.cache_clear()
+
+
+def test_subset_ssl_context(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: embed[:20] + [ISRG_ROOT_X1])
+    monkeypatch.setattr(wassima, "_SUBSET_SSL_CONTEXTS", {})
+    root_der_certificates.cache_clear()
+
+    try:
+        isrg = Certificate(ISRG_ROOT_X1)
+        ctx = wassima.subset_ssl_context(fingerprints=[isrg.sha256_fingerprint])
+
+        assert [c["subject"] for c in ctx.get_ca_certs()] == [
+            (
+                (("countryName", "US"),),
+                (("organizationName", "Internet Security Research Group"),),
+                (("commonName", "ISRG Root X1"),),
+            )
+        ]
+        assert ctx.verify_mode == ssl.CERT_REQUIRED
+
+        # Same subset, however selected: same context.
+        assert wassima.subset_ssl_context(subjects=[isrg.subject]) is ctx
+        assert wassima.subset_ssl_context(fingerprints=[isrg.sha1_fingerprint, "00" * 32], subjects=[isrg.subject]) is ctx
+        assert wassima.subset_ssl_context(predicate=lambda c: c.der == ISRG_ROOT_X1) is ctx
+
+        ecdsa = wassima.subset_ssl_context(predicate=lambda c: c.public_key_algorithm == "id-ecPublicKey")
+        assert 0 < len(ecdsa.get_ca_certs()) < 21
+        assert wassima.subset_ssl_context() is not ctx
+        assert len(wassima.subset_ssl_context().get_ca_certs()) == 21
+
+        with pytest.raises(ValueError):
+            wassima.subset_ssl_context(fingerprints=["00" * 32])
+        with pytest.raises(ValueError):
+            wassima.subset_ssl_context(subjects=[isrg.subject], predicate=lambda c: False)
+    finally:
+        root_der_certificates.cache_clear()
+        wassima.root_pem_certificates.cache_clear()
+
+
+def test_subset_ssl_context_cache_is_bounded(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: embed[:5])
+    monkeypatch.setattr(wassima, "_SUBSET_SSL_CONTEXTS", {})
+    monkeypatch.setattr(wassima, "_SUBSET_SSL_CONTEXTS_MAXSIZE", 2)
+    root_der_certificates.cache_clear()
+
+    try:
+        contexts = [wassima.subset_ssl_context(predicate=Certificate(der).__eq__) for der in embed[:3]]
+
+        assert len(wassima._SUBSET_SSL_CONTEXTS) == 2
+        assert wassima.subset_ssl_context(predicate=lambda c: c.der == embed[2]) is contexts[2]
+        assert wassima.subset_ssl_context(predicate=lambda c: c.der == embed[0]) is not contexts[0]
+    finally:
+        root_der_certificates.cache_clear()
+        wassima.root_pem_certificates.cache_clear()
+
+
+def test_embedded_roots_agree_with_the_bundle() -> None:
+    roots = wassima.embedded_roots()
+    certificates = [Certificate(der) for der in fallback_der_certificates()]
+
+    assert len(roots) == len(certificates)
+
+    for root, certificate in zip(roots, certificates):
+        assert root.sha256_fingerprint == certificate.sha256_fingerprint
+        assert root.sha1_fingerprint == certificate.sha1_fingerprint
+        assert root.not_before == certificate.not_before.timestamp()
+        assert root.not_after == certificate.not_after.timestamp()
+        assert root.common_name in certificate.subject or root.owner in certificate.subject
+
+    isrg_root_x1 = next(root for root in roots if root.common_name == "ISRG Root X1")
+
+    assert isrg_root_x1.owner == "Internet Security Research Group"
+    assert isrg_root_x1.public_key == "RSA 4096"
+    assert {root.public_key.split()[0] for root in roots} <= {"RSA", "EC"}
@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import os
+import shutil
+import signal
+import socket
+import ssl
+import tempfile
+import threading
+import time
+from typing import Iterator
+
+import pytest
+
+import wassima
+from wassima import _daemon, root_der_certificates, root_pem_certificates
+from wassima.__main__ import main
+from wassima._os._embed import root_der_certificates as fallback_der_certificates
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="requires Unix domain sockets")
+
+
+@pytest.fixture(autouse=True)
+def _reset_caches() -> Iterator[None]:
+    root_der_certificates.cache_clear()
+    root_pem_certificates.cache_clear()
+    yield
+    wassima.stop_background_refresh()
+    wassima._TRUST_STORE_LISTENERS.clear()
+    wassima._KNOWN_FINGERPRINTS.clear()
+    wassima._MANUALLY_REGISTERED_CA.clear()
+    root_der_certificates.cache_clear()
+    root_pem_certificates.cache_clear()
+
+
+@pytest.fixture
+def socket_path() -> Iterator[str]:
+    # Unix socket paths are short (~100 bytes), pytest's tmp_path may not fit.
+    directory = tempfile.mkdtemp(prefix="wassima-", dir="/tmp")
+    yield os.path.join(directory, "d.sock")
+    shutil.rmtree(directory)
+
+
+class _Snapshot:
+    def __init__(self, certificates: list[bytes]) -> None:
+        self.certificates = certificates
+
+    def __call__(self, hybrid_store: bool) -> tuple[list[bytes], str]:
+        return self.certificates, wassima._fingerprint(self.certificates)
+
+
+@pytest.fixture
+def daemon(socket_path: str) -> Iterator[_daemon._Server]:
+    server = _daemon._Server(socket_path, _Snapshot(fallback_der_certificates()[:3]))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+    if _daemon._WATCHER is not None:
+        _daemon._WATCHER.join(10)
+        assert not _daemon._WATCHER.is_alive()
+
+
+def _refuse_scan() -> list[bytes]:
+    raise AssertionError("the trust store must not be scanned while the daemon serves it")
+
+
+def test_fetch_snapshot(daemon: _daemon._Server, socket_path: str) -> None:
+    assert _daemon.fetch_snapshot(False, socket_path) == fallback_der_certificates()[:3]
+
+
+def test_fetch_snapshot_empty(daemon: _daemon._Server, socket_path: str) -> None:
+    daemon.snapshot = _Snapshot([])
+
+    assert _daemon.fetch_snapshot(True, socket_path) == []
+
+
+def test_clients_use_the_daemon(monkeypatch, daemon: _daemon._Server, socket_path: str) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setenv(_daemon.DAEMON_SOCKET_ENV, socket_path)
+    monkeypatch.setattr("wassima._root_der_certificates", _refuse_scan)
+
+    assert root_der_certificates() == sorted(fallback_der_certificates()[:3])
+
+
+def test_clients_still_merge_registered_cas(monkeypatch, daemon: _daemon._Server, socket_path: str) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setenv(_daemon.DAEMON_SOCKET_ENV, socket_path)
+    monkeypatch.setattr("wassima._root_der_certificates", _refuse_scan)
+
+    extra = fallback_der_certificates()[10]
+    wassima.register_ca(ssl.DER_cert_to_PEM_cert(extra))
+
+    assert root_der_certificates() == sorted(fallback_der_certificates()[:3] + [extra])
+
+
+def test_clients_follow_daemon_changes(monkeypatch, daemon: _daemon._Server, socket_path: str) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setenv(_daemon.DAEMON_SOCKET_ENV, socket_path)
+    monkeypatch.setattr("wassima._root_der_certificates", _refuse_scan)
+
+    changes = []
+    changed = threading.Event()
+
+    def listener(hybrid_store: bool, fingerprint: str) -> None:
+        changes.append((hybrid_store, fingerprint))
+        changed.set()
+
+    wassima.add_trust_store_listener(listener)
+
+    before = root_der_certificates()
+
+    # Wait for the watcher to be registered by the daemon.
+    deadline = time.monotonic() + 10
+    while not daemon.watchers and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    daemon.snapshot = _Snapshot(fallback_der_certificates()[:4])
+    _, fingerprint = daemon.snapshot(False)
+    daemon.notify(False, fingerprint)
+
+    assert changed.wait(10)
+    assert changes == [(False, fingerprint)]
+
+    after = root_der_certificates()
+
+    assert len(after) == len(before) + 1
+    assert wassima.trust_store_fingerprint() == fingerprint
+
+
+def test_daemon_change_ignored_when_not_cached(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr("wassima._refresh_trust_store_for", lambda *args: pytest.fail("must not refresh"))
+
+    wassima._on_daemon_change(True, "0" * 64)
+
+
+def test_fallback_without_daemon(monkeypatch, socket_path: str) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setenv(_daemon.DAEMON_SOCKET_ENV, socket_path)
+    sample = fallback_der_certificates()[:2]
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: sample)
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+
+    assert _daemon.fetch_snapshot(False) is None
+    assert root_der_certificates() == sorted(sample)
+
+
+def test_client_disabled(daemon: _daemon._Server, socket_path: str, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr(_daemon, "_CLIENT_ENABLED", False)
+
+    assert _daemon.fetch_snapshot(False, socket_path) is None
+
+
+def test_fingerprint_mismatch_rejected(daemon: _daemon._Server, socket_path: str) -> None:
+    daemon.snapshot = lambda hybrid_store: (fallback_der_certificates()[:3], "0" * 64)
+
+    assert _daemon.fetch_snapshot(False, socket_path) is None
+
+
+def _answer_once(path: str, payload: bytes) -> threading.Thread:
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(1)
+
+    def serve() -> None:
+        with listener:
+            connection, _ = listener.accept()
+            with connection:
+                connection.recv(64)
+                connection.sendall(payload)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+
+    return thread
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        b"OK abc 2\n\x00\x00\x00\x10\x30",
+        b"garbage\n",
+        b"\xff\xff\n",
+    ],
+)
+def test_invalid_answer_rejected(socket_path: str, payload: bytes) -> None:
+    thread = _answer_once(socket_path, payload)
+
+    assert _daemon.fetch_snapshot(False, socket_path) is None
+
+    thread.join()
+
+
+def test_unknown_request(daemon: _daemon._Server, socket_path: str) -> None:
+    with _daemon._connect(socket_path, 5) as sock, sock.makefile("rb") as reader:
+        sock.sendall(b"HELLO\n")
+
+        assert reader.readline() == b"ERROR unknown request\n"
+
+
+def test_client_socket_path(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    directory = tempfile.mkdtemp()
+    monkeypatch.delenv(_daemon.DAEMON_SOCKET_ENV, raising=False)
+    monkeypatch.setenv("WASSIMA_CACHE_DIR", directory)
+
+    try:
+        assert _daemon.default_socket_path() == os.path.join(directory, _daemon.DAEMON_SOCKET_NAME)
+        assert _daemon._client_socket_path() is None
+
+        open(_daemon.default_socket_path(), "w").close()
+
+        assert _daemon._client_socket_path() == _daemon.default_socket_path()
+
+        monkeypatch.setenv(_daemon.DAEMON_SOCKET_ENV, "/run/wassima.sock")
+
+        assert _daemon.default_socket_path() == "/run/wassima.sock"
+        assert _daemon._client_socket_path() == "/run/wassima.sock"
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_watch_without_daemon(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.delenv(_daemon.DAEMON_SOCKET_ENV, raising=False)
+    monkeypatch.setattr(_daemon, "_client_socket_path", lambda: None)
+    monkeypatch.setattr(_daemon, "_WATCHER", None)
+
+    _daemon.watch(lambda hybrid_store, fingerprint: None)
+
+    assert _daemon._WATCHER is None
+
+
+def test_watcher_stops_when_daemon_is_gone(socket_path: str, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr(_daemon, "_WATCHER", None)
+
+    _daemon.watch(lambda hybrid_store, fingerprint: None, socket_path)
+
+    assert _daemon._WATCHER is not None
+    _daemon._WATCHER.join(10)
+    assert not _daemon._WATCHER.is_alive()
+
+
+def test_create_server(monkeypatch, socket_path: str) -> None:  # type: ignore[no-untyped-def]
+    sample = fallback_der_certificates()[:2]
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: sample)
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+    monkeypatch.setattr(_daemon, "_CLIENT_ENABLED", True)
+
+    # Left over by a daemon that died.
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()
+
+    server = _daemon.create_server(socket_path, 3600)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        assert not _daemon._CLIENT_ENABLED
+        assert os.stat(socket_path).st_mode & 0o777 == 0o600
+        assert root_der_certificates.cache_peek((False,)) == sorted(sample)
+        assert root_der_certificates.cache_peek((True,)) is not None
+
+        monkeypatch.setattr(_daemon, "_CLIENT_ENABLED", True)
+
+        assert _daemon.fetch_snapshot(False, socket_path) == sorted(sample)
+
+        with pytest.raises(OSError, match="already listening"):
+            _daemon.create_server(socket_path, 3600)
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def test_create_server_binds_with_the_given_mode(monkeypatch, socket_path: str) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: fallback_der_certificates()[:2])
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+    monkeypatch.setattr(_daemon, "_CLIENT_ENABLED", True)
+
+    modes = []
+    server_bind = _daemon._Server.server_bind
+
+    def observing_server_bind(self: _daemon._Server) -> None:
+        server_bind(self)
+        # Right after bind(): no window with the default permissions.
+        modes.append(os.stat(socket_path).st_mode & 0o777)
+
+    monkeypatch.setattr(_daemon._Server, "server_bind", observing_server_bind)
+    umask = os.umask(0o022)
+
+    try:
+        server = _daemon.create_server(socket_path, 3600, 0o660)
+        server.server_close()
+    finally:
+        assert os.umask(umask) == 0o022
+
+    assert modes == [0o660]
+
+
+def test_main_serve(monkeypatch, socket_path: str, capsys) -> None:  # type: ignore[no-untyped-def]
+    calls: list[object] = []
+
+    class FakeServer:
+        def serve_forever(self) -> None:
+            # Simulate SIGTERM.
+            handler = signal.getsignal(signal.SIGTERM)
+            assert callable(handler)
+            handler(signal.SIGTERM, None)
+
+        def server_close(self) -> None:
+            calls.append("close")
+
+    def create_server(path: str, interval: float, mode: int) -> FakeServer:
+        calls.append((path, interval, mode))
+        open(path, "w").close()
+        return FakeServer()
+
+    monkeypatch.setattr(_daemon, "create_server", create_server)
+    previous_handler = signal.getsignal(signal.SIGTERM)
+
+    try:
+        assert main(["serve", "--socket", socket_path, "--interval", "60", "--mode", "660"]) == 0
+    finally:
+        signal.signal(signal.SIGTERM, previous_handler)
+
+    assert calls == [(socket_path, 60.0, 0o660), "close"]
+    assert not os.path.exists(socket_path)
+    assert socket_path in capsys.readouterr().err
+
+
+def test_main_serve_failure(monkeypatch, capsys) -> None:  # type: ignore[no-untyped-def]
+    def create_server(path: str, interval: float, mode: int) -> None:
+        raise OSError(f"a wassima daemon is already listening on {path}")
+
+    monkeypatch.setattr(_daemon, "create_server", create_server)
+    monkeypatch.setenv(_daemon.DAEMON_SOCKET_ENV, "/run/wassima.sock")
+
+    assert main(["serve"]) == 1
+    assert "already listening on /run/wassima.sock" in capsys.readouterr().err
+
+
+def test_main_requires_a_command(capsys) -> None:  # type: ignore[no-untyped-def]
+    with pytest.raises(SystemExit):
+        main([])
+
+    with pytest.raises(SystemExit):
+        main(["--version"])
+
+    assert wassima.__version__ in capsys.readouterr().out
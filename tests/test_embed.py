@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import os
+import struct
+import sys
+from types import ModuleType
+
+import pytest
+
+from wassima import embedded_roots
+from wassima._os import _embed
+
+UPDATE_SCRIPT = os.path.join(os.path.dirname(__file__), "..", "bin", "update.py")
+CCADB_REPORT = os.path.join(os.path.dirname(__file__), "fixtures", "ccadb.csv")
+
+
+@pytest.fixture(scope="module")
+def update() -> ModuleType:
+    if not os.path.exists(UPDATE_SCRIPT):
+        pytest.skip("bin/update.py is not shipped with the source distribution")
+
+    spec = importlib.util.spec_from_file_location("wassima_update", UPDATE_SCRIPT)
+    assert spec is not None and spec.loader is not None
+
+    module = importlib.util.module_from_spec(spec)
+    # Its dataclasses look their module up.
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def test_der_resource_matches_pem_bundle() -> None:
+    certificates = _embed._der_resource_certificates()
+
+    assert certificates == _embed._pem_bundle_certificates()
+    assert _embed.root_der_certificates() == certificates
+    assert [hashlib.sha256(der).hexdigest() for der in certificates] == [root.sha256_fingerprint for root in embedded_roots()]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        None,
+        b"not a resource",
+        _embed.CCADB_DER_MAGIC + b"\x00\x00",
+        _embed.CCADB_DER_MAGIC + struct.pack(">III", 1, 0, 4) + b"\x30\x02",
+        _embed.CCADB_DER_MAGIC + struct.pack(">IIII", 2, 0, 2, 1) + b"\x30\x00",
+    ],
+)
+def test_falls_back_to_pem_bundle(monkeypatch, tmp_path, content: bytes | None) -> None:  # type: ignore[no-untyped-def]
+    resource = tmp_path / "_embed.der"
+
+    if content is not None:
+        resource.write_bytes(content)
+
+    # An absolute path wins over the directory of the module.
+    monkeypatch.setattr(_embed, "CCADB_DER_RESOURCE", str(resource))
+
+    assert _embed.root_der_certificates() == _embed._pem_bundle_certificates()
+
+
+def _generate(update: ModuleType, directory: str) -> dict[str, bytes]:
+    assert update.main(["--csv", CCADB_REPORT, "--date", "2026-01-01", "--output", directory]) == 0
+
+    contents = {}
+
+    for name in ("_embed.py", "_embed.der", "_embed_index.py"):
+        with open(os.path.join(directory, name), "rb") as fp:
+            contents[name] = fp.read()
+
+    return contents
+
+
+def test_offline_update_is_reproducible(update: ModuleType, tmp_path) -> None:  # type: ignore[no-untyped-def]
+    first = _generate(update, str(tmp_path / "first"))
+    second = _generate(update, str(tmp_path / "second"))
+
+    assert first == second
+
+    # Not for websites, expired and distrusted CAs of the report are left out.
+    index = update._load_module(str(tmp_path / "first" / "_embed_index.py"))
+
+    assert [root.common_name for root in index.CCADB_INDEX] == ["ISRG Root X1", "ISRG Root X2"]
+    assert [root.public_key for root in index.CCADB_INDEX] == ["RSA 4096", "EC P-384"]
+    assert update.verify_artifacts(str(tmp_path / "first")) == 2
+
+
+@pytest.mark.parametrize("artifact", ["_embed.der", "_embed_index.py"])
+def test_verify_detects_disagreement(update: ModuleType, tmp_path, artifact: str) -> None:  # type: ignore[no-untyped-def]
+    directory = str(tmp_path)
+    _generate(update, directory)
+
+    embed = update._load_module(os.path.join(directory, "_embed.py"))
+    index = update._load_module(os.path.join(directory, "_embed_index.py"))
+    swapped = embed._pem_bundle_certificates()[::-1]
+
+    if artifact == "_embed.der":
+        update.write_der_resource(os.path.join(directory, artifact), swapped)
+    else:
+        update.write_embed_index(
+            os.path.join(directory, artifact),
+            [(root.owner, root.common_name, der) for root, der in zip(index.CCADB_INDEX, swapped)],
+        )
+
+    assert update.main(["--verify", "--output", directory]) == 1
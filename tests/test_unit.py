@@ -4,7 +4,7 @@ import os
 import ssl
 import sys
 import time
-from typing import Iterator
+from typing import Any, Iterator
 
 import pytest
 
@@ -19,6 +19,8 @@ from wassima import (
 )
 from wassima._os._embed import root_der_certificates as fallback_der_certificates
 
+from .conftest import fake_certificate, fake_name
+
 
 @pytest.fixture(autouse=True)
 def _reset_caches() -> Iterator[None]:
@@ -28,6 +30,16 @@ def _reset_caches() -> Iterator[None]:
     root_pem_certificates.cache_clear()
     # Restore the default TTL after each test in case one mutated it.
     yield
+    wassima.stop_background_refresh()
+    wassima.extract()
+    wassima.set_validity_filter(False)
+    wassima.set_reissued_roots_collapse(False)
+    for scan in wassima._PROGRESSIVE_SCANS.values():
+        scan.join(10)
+    wassima._PROGRESSIVE_SCANS.clear()
+    wassima._TRUST_STORE_LISTENERS.clear()
+    wassima._KNOWN_FINGERPRINTS.clear()
+    wassima._SHARED_SSL_CONTEXTS.clear()
     set_cache_ttl(DEFAULT_CACHE_TTL_SECONDS)
     wassima._MANUALLY_REGISTERED_CA.clear()
     root_der_certificates.cache_clear()
@@ -192,11 +204,12 @@ def test_linux_stale_trust_store_implicitly_merges(monkeypatch) -> None:  # type
         assert c in certs
 
 
-def test_is_trust_store_stale_helper(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+def test_is_trust_store_stale_helper(monkeypatch, tmp_path) -> None:  # type: ignore[no-untyped-def]
     from wassima._os import _linux as linux_mod
 
-    # When no mtime has been collected -> never considered stale.
+    # When no mtime can be collected -> never considered stale.
     monkeypatch.setattr(linux_mod, "_LAST_NEWEST_MTIME", None)
+    monkeypatch.setattr(linux_mod, "BUNDLE_TRUST_STORE_DIRECTORIES", [str(tmp_path)])
     assert linux_mod.is_trust_store_stale() is False
 
     # A mtime older than the threshold -> stale.
@@ -336,6 +349,34 @@ def test_windows_os_trusted_subset_matches_by_sha1(monkeypatch) -> None:  # type
     assert win_mod._os_trusted_subset([listed, not_listed]) == [listed]
 
 
+def test_windows_os_trusted_subset_hashes_once(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    import hashlib
+    import ssl as _ssl
+
+    if not hasattr(_ssl, "enum_certificates"):
+        monkeypatch.setattr(_ssl, "enum_certificates", lambda store: iter([]), raising=False)
+
+    from wassima._os import _windows as win_mod
+
+    candidates = fallback_der_certificates()
+    hashed: list[bytes] = []
+
+    def sha1(data: bytes) -> bytes:
+        hashed.append(data)
+        return hashlib.sha1(data).digest()
+
+    monkeypatch.setattr(win_mod, "_THUMBPRINTS", {})
+    monkeypatch.setattr(win_mod, "_sha1", sha1)
+    monkeypatch.setattr(win_mod, "_authroot_ctl_thumbprints", lambda: {hashlib.sha1(der).digest() for der in candidates[:2]})
+
+    assert win_mod._os_trusted_subset(candidates) == candidates[:2]
+    assert len(hashed) == len(candidates)
+
+    # A refresh, in whatever order: matched on the DER itself, never hashed again.
+    assert win_mod._os_trusted_subset(candidates[::-1]) == candidates[1::-1]
+    assert len(hashed) == len(candidates)
+
+
 def test_no_deadlock_between_register_ca_and_root_certs(monkeypatch) -> None:  # type: ignore[no-untyped-def]
     """Regression test: ``register_ca`` (acquires _USER_APPEND_CA_LOCK then
     cache lock via ``cache_clear``) must not deadlock with concurrent
@@ -400,8 +441,8 @@ def test_macos_fork_guard_falls_back_to_ccadb() -> None:
         try:
             certs = root_der_certificates()
             # In a forked child the native store is skipped, so the result is
-            # exactly the embedded CCADB bundle.
-            ok = certs == embed
+            # exactly the embedded CCADB bundle (in canonical order).
+            ok = certs == sorted(embed)
         except BaseException:
             os._exit(2)
         os._exit(0 if ok else 1)
@@ -412,3 +453,1430 @@ def test_macos_fork_guard_falls_back_to_ccadb() -> None:
         pytest.fail(f"child crashed with signal {os.WTERMSIG(status)} (fork guard did not prevent the native call)")
     assert os.WIFEXITED(status)
     assert os.WEXITSTATUS(status) == 0, "child did not return the embedded CCADB bundle after fork"
+
+
+def test_warm_read_does_not_wait_for_concurrent_refresh(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    """A warm cached read must never block behind a refresh happening for
+    another key (lock-free snapshot read path)."""
+    import threading
+
+    refresh_started = threading.Event()
+    release_refresh = threading.Event()
+
+    def os_certs() -> list[bytes]:
+        if refresh_started.is_set():
+            release_refresh.wait(timeout=5)
+        return [b"\xdd"]
+
+    monkeypatch.setattr("wassima._root_der_certificates", os_certs)
+    set_cache_ttl(60)
+
+    warm = root_der_certificates()  # warm the hybrid_store=False entry.
+
+    def cold_refresh() -> None:
+        refresh_started.set()
+        root_der_certificates(hybrid_store=True)
+
+    refresher = threading.Thread(target=cold_refresh)
+    refresher.start()
+
+    try:
+        refresh_started.wait(timeout=5)
+        time.sleep(0.05)  # let the refresher enter the critical section.
+
+        result: list[list[bytes]] = []
+        reader = threading.Thread(target=lambda: result.append(root_der_certificates()))
+        reader.start()
+        reader.join(timeout=2)
+
+        assert not reader.is_alive(), "warm read blocked behind a concurrent refresh"
+        assert result[0] is warm
+    finally:
+        release_refresh.set()
+        refresher.join()
+
+
+def test_concurrent_public_api_stays_consistent(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    """Hammer readers, writers and context factories from several threads at
+    once. Nothing may raise, and the final store must be duplicate-free and
+    contain every registered CA."""
+    import threading
+
+    embed = fallback_der_certificates()
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: embed[:5])
+
+    errors: list[BaseException] = []
+    barrier = threading.Barrier(8)
+
+    def worker(idx: int) -> None:
+        try:
+            barrier.wait()
+            for n in range(30):
+                certs = root_der_certificates()
+                assert len(certs) == len(set(certs))
+                if n % 3 == 0:
+                    register_ca(embed[10 + idx])
+                if n % 10 == 0:
+                    set_cache_ttl(60)
+                if n % 15 == 0:
+                    wassima.create_default_ssl_context()
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    certs = root_der_certificates()
+    assert len(certs) == len(set(certs))
+    for idx in range(8):
+        assert embed[10 + idx] in certs
+    assert root_pem_certificates() == [ssl.DER_cert_to_PEM_cert(c) for c in certs]
+
+
+def test_linux_stale_scan_does_not_overwrite_newer_observation(monkeypatch, tmp_path) -> None:  # type: ignore[no-untyped-def]
+    from wassima._os import _linux as linux_mod
+
+    (tmp_path / "ca.pem").write_text(ssl.DER_cert_to_PEM_cert(fallback_der_certificates()[0]))
+    monkeypatch.setattr(linux_mod, "BUNDLE_TRUST_STORE_DIRECTORIES", [str(tmp_path)])
+    monkeypatch.setattr(linux_mod, "_LAST_NEWEST_MTIME", None)
+
+    # Pretend a scan that started after ours already published its result.
+    monkeypatch.setattr(linux_mod, "_LAST_PUBLISHED_TICKET", 1 << 62)
+
+    assert linux_mod.root_der_certificates() == [fallback_der_certificates()[0]]
+    assert linux_mod._LAST_NEWEST_MTIME is None
+
+
+def test_shared_ssl_context_is_reused_until_content_changes(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    os_certs = {"value": embed[:3]}
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: list(os_certs["value"]))
+
+    ctx = wassima.shared_ssl_context()
+    assert wassima.shared_ssl_context() is ctx
+    assert ctx.cert_store_stats()["x509_ca"] == 3
+
+    # Same content, new snapshot (e.g. TTL expiry) -> context kept.
+    root_der_certificates.cache_clear()
+    assert wassima.shared_ssl_context() is ctx
+
+    # CAs added -> loaded into the live context.
+    os_certs["value"] = embed[:4]
+    root_der_certificates.cache_clear()
+    assert wassima.shared_ssl_context() is ctx
+    assert ctx.cert_store_stats()["x509_ca"] == 4
+
+    # CAs removed -> rebuilt, OpenSSL cannot unload them.
+    os_certs["value"] = embed[1:4]
+    root_der_certificates.cache_clear()
+    rebuilt = wassima.shared_ssl_context()
+    assert rebuilt is not ctx
+    assert rebuilt.cert_store_stats()["x509_ca"] == 3
+
+
+def test_refresh_trust_store_swaps_only_on_change(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    os_certs = {"value": embed[:3]}
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: list(os_certs["value"]))
+    monkeypatch.setattr("wassima._trust_store_metadata", lambda: ((len(os_certs["value"]),), None))
+
+    events: list[tuple[bool, str]] = []
+    wassima.add_trust_store_listener(lambda hybrid, fp: events.append((hybrid, fp)))
+
+    before = root_der_certificates()
+    pem_before = root_pem_certificates()
+    ctx = wassima.shared_ssl_context()
+
+    # Unchanged content: same objects stay published, nobody is notified.
+    assert wassima.refresh_trust_store() is False
+    assert root_der_certificates() is before
+    assert root_pem_certificates() is pem_before
+    assert wassima.shared_ssl_context() is ctx
+    assert events == []
+
+    os_certs["value"] = embed[:4]
+
+    assert wassima.refresh_trust_store() is True
+    after = root_der_certificates()
+    assert after == sorted(embed[:4])
+    assert root_pem_certificates() == [ssl.DER_cert_to_PEM_cert(c) for c in after]
+    # Additions only: the context is kept, with the new CA loaded in.
+    assert wassima.shared_ssl_context() is ctx
+    assert ctx.cert_store_stats()["x509_ca"] == 4
+    assert events == [(False, wassima._fingerprint(after))]
+
+    os_certs["value"] = embed[1:4]
+
+    assert wassima.refresh_trust_store() is True
+    assert wassima.shared_ssl_context() is not ctx
+    assert wassima.shared_ssl_context().cert_store_stats()["x509_ca"] == 3
+
+
+def test_trust_store_listener_errors_are_reported(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    os_certs = {"value": embed[:1]}
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: list(os_certs["value"]))
+
+    def broken(hybrid_store: bool, fingerprint: str) -> None:
+        raise RuntimeError("boom")
+
+    wassima.add_trust_store_listener(broken)
+    wassima.add_trust_store_listener(broken)  # no double registration
+    assert wassima._TRUST_STORE_LISTENERS == [broken]
+
+    wassima.refresh_trust_store()
+    os_certs["value"] = embed[:2]
+
+    with pytest.warns(RuntimeWarning, match="boom"):
+        assert wassima.refresh_trust_store(force=True) is True
+
+    wassima.remove_trust_store_listener(broken)
+    wassima.remove_trust_store_listener(broken)
+    assert wassima._TRUST_STORE_LISTENERS == []
+
+
+def test_background_refresh_takes_over_ttl(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    calls = {"n": 0}
+
+    def fake_os_certs() -> list[bytes]:
+        calls["n"] += 1
+        return [b"\xab"]
+
+    monkeypatch.setattr("wassima._root_der_certificates", fake_os_certs)
+
+    fake_now = {"t": 1000.0}
+    monkeypatch.setattr("wassima.time.monotonic", lambda: fake_now["t"])
+    set_cache_ttl(10)
+
+    root_der_certificates()
+
+    wassima.start_background_refresh(interval=3600)
+    # The refresher performs its first pass right away.
+    for _ in range(100):
+        if wassima._KNOWN_FINGERPRINTS:
+            break
+        time.sleep(0.01)
+    scans = calls["n"]
+
+    # Way past the TTL: the request path must not rescan anymore.
+    fake_now["t"] += 1000
+    root_der_certificates()
+    assert calls["n"] == scans
+
+    wassima.stop_background_refresh()
+    assert wassima._BACKGROUND_REFRESHER is None
+
+    # Back to the TTL lifecycle.
+    root_der_certificates()
+    assert calls["n"] == scans
+    fake_now["t"] += 100
+    root_der_certificates()
+    assert calls["n"] == scans + 1
+
+
+def test_background_refresh_invalid_interval() -> None:
+    with pytest.raises(TypeError):
+        wassima.start_background_refresh(True)
+    with pytest.raises(TypeError):
+        wassima.start_background_refresh("60")  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        wassima.start_background_refresh(0)
+
+
+def test_cache_publish_drops_outdated_value(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: [b"\x01"])
+
+    generation = root_der_certificates.cache_generation()
+    root_der_certificates.cache_clear()  # e.g. register_ca() while a refresh was in flight
+
+    assert root_der_certificates.cache_publish((False,), [b"\x02"], time.monotonic() + 60, generation) is False
+    assert root_der_certificates() == [b"\x01"]
+    # Positional, keyword and default invocations share the same entry.
+    assert root_der_certificates(False) is root_der_certificates(hybrid_store=False) is root_der_certificates()
+
+
+def test_forked_child_hands_cache_back_to_ttl(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: [b"\x01"])
+    monkeypatch.setattr("wassima._BACKGROUND_REFRESHER", object())
+
+    root_der_certificates()
+    assert root_der_certificates.cache_keys() == [(False,)]
+
+    wassima._after_fork_in_child()
+
+    assert wassima._BACKGROUND_REFRESHER is None
+    # The entry survived, and now expires with the regular TTL.
+    assert root_der_certificates.cache_peek((False,)) == [b"\x01"]
+
+
+def test_refresh_trust_store_skips_scan_when_token_unchanged(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    calls = {"n": 0}
+
+    def fake_os_certs() -> list[bytes]:
+        calls["n"] += 1
+        return [b"\x01"]
+
+    metadata = {"value": (("/etc/ssl/certs/a.pem", 1),)}
+    monkeypatch.setattr("wassima._root_der_certificates", fake_os_certs)
+    monkeypatch.setattr("wassima._trust_store_metadata", lambda: (metadata["value"], None))
+
+    root_der_certificates()
+    wassima.refresh_trust_store()  # first pass: scans, then remembers the token.
+    assert calls["n"] == 2
+
+    wassima.refresh_trust_store()
+    assert calls["n"] == 2
+
+    metadata["value"] = (("/etc/ssl/certs/a.pem", 2),)
+    wassima.refresh_trust_store()
+    assert calls["n"] == 3
+
+    wassima.refresh_trust_store(force=True)
+    assert calls["n"] == 4
+
+
+def test_trust_store_token_tracks_metadata_and_registrations(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    metadata = {"value": (("/etc/ssl/certs/a.pem", 1),)}
+    monkeypatch.setattr("wassima._trust_store_metadata", lambda: (metadata["value"], None))
+
+    token = wassima.trust_store_token()
+    assert wassima.trust_store_changed(token) is False
+
+    metadata["value"] = (("/etc/ssl/certs/a.pem", 2),)
+    assert wassima.trust_store_changed(token) is True
+
+    token = wassima.trust_store_token()
+    register_ca(fallback_der_certificates()[0])
+    assert wassima.trust_store_changed(token) is True
+
+
+def test_linux_trust_store_metadata_is_stat_only(monkeypatch, tmp_path_factory) -> None:  # type: ignore[no-untyped-def]
+    from wassima._os import _linux as linux_mod
+
+    # Not tmp_path: the test name contains a banned keyword ("trust").
+    tmp_path = tmp_path_factory.mktemp("certs")
+    sample = ssl.DER_cert_to_PEM_cert(fallback_der_certificates()[0])
+    (tmp_path / "a.pem").write_text(sample)
+    (tmp_path / "ignored.txt").write_text("not a trust store file")
+    monkeypatch.setattr(linux_mod, "BUNDLE_TRUST_STORE_DIRECTORIES", [str(tmp_path), str(tmp_path / "absent")])
+
+    def no_read(*args, **kwargs):  # type: ignore[no-untyped-def]
+        raise AssertionError("the probe must not read any file")
+
+    with monkeypatch.context() as m:
+        m.setattr("builtins.open", no_read)
+        metadata, newest_mtime = linux_mod.trust_store_metadata()
+
+    assert newest_mtime == (tmp_path / "a.pem").stat().st_mtime
+    assert [entry[0] for entry in metadata] == [str(tmp_path), str(tmp_path / "a.pem")]
+
+    # Modified in place, same size: still detected.
+    os.utime(tmp_path / "a.pem", ns=(0, 1))
+    assert linux_mod.trust_store_metadata()[0] != metadata
+
+
+def test_linux_staleness_computed_from_metadata_before_any_scan(monkeypatch, tmp_path) -> None:  # type: ignore[no-untyped-def]
+    from wassima._os import _linux as linux_mod
+
+    (tmp_path / "a.pem").write_text("")
+    monkeypatch.setattr(linux_mod, "BUNDLE_TRUST_STORE_DIRECTORIES", [str(tmp_path)])
+    monkeypatch.setattr(linux_mod, "_LAST_NEWEST_MTIME", None)
+
+    assert linux_mod.is_trust_store_stale() is False
+
+    ancient = time.time() - linux_mod.STALE_TRUST_STORE_THRESHOLD_SECONDS - 3600
+    os.utime(tmp_path / "a.pem", (ancient, ancient))
+    assert linux_mod.is_trust_store_stale() is True
+
+
+def test_windows_trust_store_metadata_reads_registry_keys_info(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    import ssl as _ssl
+    import types
+
+    if not hasattr(_ssl, "enum_certificates"):
+        monkeypatch.setattr(_ssl, "enum_certificates", lambda store: iter([]), raising=False)
+
+    from wassima._os import _windows as win_mod
+
+    # 2020-01-01T00:00:00Z expressed as a FILETIME.
+    last_write = (1577836800 + win_mod._FILETIME_EPOCH_OFFSET_SECONDS) * 10_000_000
+    opened: list[str] = []
+
+    def open_key(hive: str, location: str) -> str:
+        if "Policies" in location:
+            raise OSError("no such key")
+        opened.append(location)
+        return location
+
+    fake_winreg = types.SimpleNamespace(
+        HKEY_CURRENT_USER="HKCU",
+        HKEY_LOCAL_MACHINE="HKLM",
+        OpenKey=open_key,
+        QueryInfoKey=lambda key: (3, 0, last_write),
+        CloseKey=lambda key: None,
+    )
+
+    monkeypatch.setitem(sys.modules, "winreg", fake_winreg)
+    monkeypatch.setattr(sys, "platform", "win32")
+
+    metadata, newest_mtime = win_mod.trust_store_metadata()
+
+    assert newest_mtime == 1577836800
+    assert len(metadata) == len(opened) == len(win_mod._TRUST_STORE_REGISTRY_KEYS) - len(win_mod.WINDOWS_STORES)
+
+
+def test_root_der_certificates_canonical_order(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    """The same trust set must yield the same list, bundle and fingerprint,
+    whatever order the backend discovered the certificates in."""
+    embed = fallback_der_certificates()[:10]
+
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: list(embed))
+    register_ca(embed[0])
+    forward = (root_der_certificates(), generate_ca_bundle(), wassima.trust_store_fingerprint())
+
+    wassima._MANUALLY_REGISTERED_CA.clear()
+    root_der_certificates.cache_clear()
+    root_pem_certificates.cache_clear()
+
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: list(reversed(embed)))
+    backward = (root_der_certificates(), generate_ca_bundle(), wassima.trust_store_fingerprint())
+
+    assert forward == backward
+    assert forward[0] == sorted(embed)
+
+
+def test_trust_store_fingerprint(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    import hashlib
+
+    embed = fallback_der_certificates()
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: embed[:3])
+
+    fingerprint = wassima.trust_store_fingerprint()
+    assert fingerprint == hashlib.sha256(b"".join(sorted(embed[:3]))).hexdigest()
+    # Memoized for a given snapshot.
+    assert wassima.trust_store_fingerprint(hybrid_store=False) is fingerprint
+
+    assert wassima.trust_store_fingerprint(hybrid_store=True) != fingerprint
+
+    register_ca(embed[5])
+    assert wassima.trust_store_fingerprint() == hashlib.sha256(b"".join(sorted(embed[:3] + [embed[5]]))).hexdigest()
+
+
+def test_linux_scan_order_is_deterministic(monkeypatch, tmp_path) -> None:  # type: ignore[no-untyped-def]
+    from wassima._os import _linux as linux_mod
+
+    embed = fallback_der_certificates()
+
+    for idx, name in enumerate(("c.pem", "a.pem", "b.pem")):
+        (tmp_path / name).write_text(ssl.DER_cert_to_PEM_cert(embed[idx]))
+
+    monkeypatch.setattr(linux_mod, "BUNDLE_TRUST_STORE_DIRECTORIES", [str(tmp_path)])
+
+    assert linux_mod.root_der_certificates() == [embed[1], embed[2], embed[0]]
+
+
+def test_iter_der_certificates_streams_per_source(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    scanned = []
+
+    def fake_os_certs() -> list[bytes]:
+        scanned.append(True)
+        return [embed[2], embed[1]]
+
+    monkeypatch.setattr("wassima._root_der_certificates", fake_os_certs)
+    register_ca(embed[1])
+    register_ca(embed[3])
+
+    stream = wassima.iter_der_certificates()
+    assert not scanned
+    # Yielded as discovered, before the remaining sources are looked at.
+    assert next(stream) == embed[2]
+    assert root_der_certificates.cache_peek((False,)) is None
+    assert list(stream) == [embed[1], embed[3]]
+
+    # Fully consumed: cached, in the canonical order.
+    assert root_der_certificates.cache_peek((False,)) == sorted([embed[1], embed[2], embed[3]])
+    assert list(wassima.iter_der_certificates()) == root_der_certificates()
+    assert len(scanned) == 1
+
+
+def test_iter_pem_certificates_and_write_ca_bundle(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    import io
+
+    embed = fallback_der_certificates()
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: embed[:4])
+
+    assert list(wassima.iter_pem_certificates()) == [ssl.DER_cert_to_PEM_cert(c) for c in embed[:4]]
+
+    # Served from the cache once warm.
+    expected = root_pem_certificates()
+    assert list(wassima.iter_pem_certificates()) == expected
+
+    fileobj = io.StringIO()
+    assert wassima.write_ca_bundle(fileobj) == 4
+    assert fileobj.getvalue() == generate_ca_bundle()
+
+    # The hybrid flavor streams the CCADB bundle after the OS store.
+    assert len(list(wassima.iter_pem_certificates(hybrid_store=True))) == len(root_der_certificates(hybrid_store=True))
+
+
+def test_validity_filter_drops_expired_and_not_yet_valid(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+    embed = fallback_der_certificates()[:10]
+    validity = {der: (wassima.Certificate(der).not_before, wassima.Certificate(der).not_after) for der in embed}
+    now = sorted(not_after for _, not_after in validity.values())[5].timestamp() + 1
+
+    # The last one is unreadable: kept, OpenSSL will judge.
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: embed[:8] + [wassima._der._encode_tlv(0x30, b"")])
+    monkeypatch.setattr("wassima.time.time", lambda: now)
+
+    assert len(root_der_certificates()) == 9
+
+    wassima.set_validity_filter(True)
+
+    expected = sorted(der for der in embed[:8] if validity[der][0].timestamp() <= now <= validity[der][1].timestamp())
+    assert 0 < len(expected) < 8
+    assert root_der_certificates() == sorted(expected + [wassima._der._encode_tlv(0x30, b"")])
+    assert len(root_pem_certificates()) == len(expected) + 1
+
+    # Back in time, before any of them was issued.
+    now = min(not_before for not_before, _ in validity.values()).timestamp() - 1
+    wassima.set_validity_filter(True)
+    assert root_der_certificates() == [wassima._der._encode_tlv(0x30, b"")]
+
+    wassima.set_validity_filter(False)
+    assert len(root_der_certificates()) == 9
+
+    with pytest.raises(TypeError):
+        wassima.set_validity_filter(1)  # type: ignore[arg-type]
+
+
+def test_validity_filter_cache_expires_when_next_root_lapses(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+    embed = fallback_der_certificates()[:10]
+    not_before, not_after = wassima.Certificate(embed[0]).not_before, wassima.Certificate(embed[0]).not_after
+    fake = {"wall": not_after.timestamp() - 60, "mono": 1000.0}
+    calls = {"n": 0}
+
+    def fake_os_certs() -> list[bytes]:
+        calls["n"] += 1
+        return [embed[0]]
+
+    monkeypatch.setattr("wassima._root_der_certificates", fake_os_certs)
+    monkeypatch.setattr("wassima.time.time", lambda: fake["wall"])
+    monkeypatch.setattr("wassima.time.monotonic", lambda: fake["mono"])
+    wassima.set_validity_filter(True)
+
+    assert root_der_certificates() == [embed[0]]
+    # Well before the TTL, but past notAfter: refreshed, and the root is gone.
+    fake["wall"] += 30
+    fake["mono"] += 30
+    assert root_der_certificates() == [embed[0]]
+    assert calls["n"] == 1
+    fake["wall"] += 31
+    fake["mono"] += 31
+    assert root_der_certificates() == []
+    assert calls["n"] == 2
+
+    # Another flavor lapsing does not shorten our lifetime.
+    fake["wall"] = not_before.timestamp() + 1
+    monkeypatch.setattr("wassima._NEXT_VALIDITY_CHANGE", {**wassima._NEXT_VALIDITY_CHANGE, True: fake["wall"] - 1})
+    root_der_certificates.cache_clear()
+    root_der_certificates()
+    fake["mono"] += 3600
+    root_der_certificates()
+    assert calls["n"] == 3
+
+
+def test_validity_filter_next_change_is_copy_on_write(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: fallback_der_certificates()[:3])
+    wassima.set_validity_filter(True)
+
+    try:
+        root_der_certificates()
+        published = wassima._NEXT_VALIDITY_CHANGE
+        snapshot = dict(published)
+
+        # A concurrent scan (e.g. iter_der_certificates) publishes a new mapping, readers
+        # iterating the previous one never see it change size under them.
+        list(wassima.iter_der_certificates(hybrid_store=True))
+
+        assert published == snapshot
+        assert wassima._NEXT_VALIDITY_CHANGE is not published
+        assert set(wassima._NEXT_VALIDITY_CHANGE) == {False, True}
+    finally:
+        wassima.set_validity_filter(False)
+
+
+def test_no_deadlock_between_set_validity_filter_and_a_filtered_scan(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    """Regression test: a filtered scan publishes its next validity change while holding
+    the cache lock, ``set_validity_filter`` must not wait for that lock while holding
+    _NEXT_VALIDITY_CHANGE_LOCK."""
+    import threading
+
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+    scanning = threading.Event()
+
+    def slow_os_certs() -> list[bytes]:
+        scanning.set()
+        # Let set_validity_filter enter its critical section meanwhile.
+        time.sleep(0.2)
+        return fallback_der_certificates()[:3]
+
+    monkeypatch.setattr("wassima._root_der_certificates", slow_os_certs)
+    wassima.set_validity_filter(True)
+
+    scan = threading.Thread(target=root_der_certificates, daemon=True)
+    scan.start()
+    assert scanning.wait(10)
+
+    toggle = threading.Thread(target=wassima.set_validity_filter, args=(False,), daemon=True)
+    toggle.start()
+
+    scan.join(10)
+    toggle.join(10)
+    assert not scan.is_alive() and not toggle.is_alive(), "deadlock"
+    assert wassima._NEXT_VALIDITY_CHANGE == {}
+
+
+def test_refresh_trust_store_rescans_when_a_root_lapses(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+    embed = fallback_der_certificates()[:10]
+    not_after = wassima.Certificate(embed[0]).not_after.timestamp()
+    fake = {"wall": not_after - 60}
+    calls = {"n": 0}
+
+    def fake_os_certs() -> list[bytes]:
+        calls["n"] += 1
+        return [embed[0], embed[1]]
+
+    monkeypatch.setattr("wassima._root_der_certificates", fake_os_certs)
+    monkeypatch.setattr("wassima._trust_store_metadata", lambda: ((), None))
+    monkeypatch.setattr("wassima.time.time", lambda: fake["wall"])
+    wassima.set_validity_filter(True)
+
+    wassima.refresh_trust_store()
+    wassima.refresh_trust_store()
+    assert calls["n"] == 1
+
+    # Nothing moved on disk, but a root lapsed.
+    fake["wall"] = not_after + 1
+    wassima.refresh_trust_store()
+    assert calls["n"] == 2
+
+
+def test_issued_ssl_contexts_receive_added_cas(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    import gc
+
+    embed = fallback_der_certificates()
+    os_certs = {"value": embed[:3]}
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: list(os_certs["value"]))
+    monkeypatch.setattr("wassima._trust_store_metadata", lambda: ((len(os_certs["value"]),), None))
+
+    ctx = wassima.create_default_ssl_context()
+    hybrid_ctx = wassima.create_default_ssl_context(hybrid_store=True)
+    hybrid_count = hybrid_ctx.cert_store_stats()["x509_ca"]
+    assert ctx.cert_store_stats()["x509_ca"] == 3
+
+    # Registered CAs go to every issued context.
+    register_ca(embed[100])
+    assert ctx.cert_store_stats()["x509_ca"] == 4
+    # Already part of the CCADB bundle there.
+    assert hybrid_ctx.cert_store_stats()["x509_ca"] == hybrid_count
+
+    # Rescan: only the flavor that changed.
+    os_certs["value"] = embed[:3] + [embed[101]]
+    wassima.refresh_trust_store()
+    assert ctx.cert_store_stats()["x509_ca"] == 5
+
+    # Removals are not applied to live contexts.
+    os_certs["value"] = embed[:1]
+    wassima.refresh_trust_store()
+    assert ctx.cert_store_stats()["x509_ca"] == 5
+
+    # Tracking does not keep contexts alive.
+    del ctx, hybrid_ctx
+    gc.collect()
+    assert len(wassima._ISSUED_SSL_CONTEXTS) == 0
+
+
+def test_issued_ssl_contexts_receive_cas_found_by_a_ttl_rescan(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    os_certs = {"value": embed[:3]}
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: list(os_certs["value"]))
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+
+    ctx = wassima.create_default_ssl_context()
+    lazy_ctx = wassima.create_default_ssl_context(lazy=True)
+    assert ctx.cert_store_stats()["x509_ca"] == 3
+
+    # The cache expires, the next call rescans: no refresh_trust_store involved.
+    os_certs["value"] = embed[:3] + [embed[100]]
+    set_cache_ttl(0)
+    assert len(root_der_certificates()) == 4
+    assert ctx.cert_store_stats()["x509_ca"] == 4
+
+    # Not tracked: it keeps reading the CA directory it was created with.
+    assert lazy_ctx not in wassima._ISSUED_SSL_CONTEXTS
+
+
+def test_issued_ssl_contexts_skip_registered_ca_filtered_out(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: embed[:3])
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+
+    ctx = wassima.create_default_ssl_context()
+    wassima.set_validity_filter(True)
+
+    not_after = wassima.Certificate(embed[10]).not_after.timestamp()
+    monkeypatch.setattr("wassima.time.time", lambda: not_after + 1)
+    register_ca(embed[10])
+
+    assert ctx.cert_store_stats()["x509_ca"] == 3
+
+
+def test_register_ca_rejected_by_openssl_changes_nothing(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: embed[:3])
+
+    ctx = wassima.create_default_ssl_context()
+    cached = root_der_certificates()
+
+    with pytest.raises(ValueError):
+        register_ca(b"\x30\x00")
+
+    # Not even the valid ones of the batch.
+    with pytest.raises(ValueError):
+        wassima.register_cas([embed[100]], b"\x30\x00")
+
+    assert wassima._MANUALLY_REGISTERED_CA == []
+    assert root_der_certificates() is cached
+    assert ctx.cert_store_stats()["x509_ca"] == 3
+    assert wassima.create_default_ssl_context().cert_store_stats()["x509_ca"] == 3
+
+
+def test_issued_ssl_context_failing_to_load_is_reported(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: embed[:3])
+
+    class BrokenSSLContext(ssl.SSLContext):
+        def load_verify_locations(self, *args: Any, **kwargs: Any) -> None:
+            raise ssl.SSLError("nope")
+
+    broken = BrokenSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    wassima._track_ssl_context(broken, False, embed[:3])
+    ctx = wassima.create_default_ssl_context()
+
+    with pytest.warns(RuntimeWarning, match="could not load 1 new CA"):
+        register_ca(embed[100])
+
+    # The others still receive it, and it remains registered.
+    assert ctx.cert_store_stats()["x509_ca"] == 4
+    assert wassima._ISSUED_SSL_CONTEXTS[broken] == (False, frozenset(embed[:3]))
+    assert wassima._MANUALLY_REGISTERED_CA == [embed[100]]
+
+
+def test_cadata_falls_back_to_pem(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: embed[:3])
+
+    monkeypatch.setattr("wassima._DER_CADATA", None)
+    assert wassima._cadata(embed[:2]) == embed[0] + embed[1]
+    assert wassima._DER_CADATA is True
+
+    # e.g. Python 3.7 built against OpenSSL 3.
+    monkeypatch.setattr("wassima._DER_CADATA", False)
+    assert wassima._cadata(embed[:2]) == "\n".join(ssl.DER_cert_to_PEM_cert(der) for der in embed[:2])
+
+    ctx = wassima.create_default_ssl_context()
+    deferred = wassima.create_default_ssl_context(deferred=True)
+    register_ca(embed[100])
+
+    assert ctx.cert_store_stats()["x509_ca"] == 4
+    assert deferred.cert_store_stats()["x509_ca"] == 4
+
+
+def test_progressive_shared_ssl_context(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    import threading
+
+    embed = fallback_der_certificates()
+    scan_may_finish = threading.Event()
+
+    def slow_os_certs() -> list[bytes]:
+        scan_may_finish.wait(10)
+        return embed[:3]
+
+    monkeypatch.setattr("wassima._root_der_certificates", slow_os_certs)
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+    events: list[tuple[bool, str]] = []
+    wassima.add_trust_store_listener(lambda hybrid, fp: events.append((hybrid, fp)))
+
+    # Served at once from the embedded bundle, while the OS store is being scanned.
+    ctx = wassima.shared_ssl_context(progressive=True)
+    assert ctx.cert_store_stats()["x509_ca"] == len(embed)
+    assert wassima.shared_ssl_context(progressive=True) is ctx
+    scan = wassima._PROGRESSIVE_SCANS[False]
+    assert scan.is_alive()
+
+    scan_may_finish.set()
+    scan.join(10)
+
+    real = wassima.shared_ssl_context(progressive=True)
+    assert real is not ctx
+    assert real is wassima.shared_ssl_context()
+    assert real.cert_store_stats()["x509_ca"] == 3
+    assert events == [(False, wassima.trust_store_fingerprint())]
+    assert len(wassima._PROGRESSIVE_SCANS) == 1
+
+
+def test_progressive_embedded_context_is_memoized(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    reads = []
+
+    def embedded_certificates() -> list[bytes]:
+        reads.append(1)
+        return list(embed)
+
+    monkeypatch.setattr("wassima.fallback_der_certificates", embedded_certificates)
+    monkeypatch.setattr("wassima._EMBEDDED_SSL_CONTEXT", None)
+
+    # Cold start calls are served without reading the embedded bundle again.
+    ctx = wassima._embedded_ssl_context()
+    assert wassima._embedded_ssl_context() is ctx
+    assert len(reads) == 1
+
+    # Until the registered CAs change.
+    register_ca(embed[0])
+    reads.clear()
+    rebuilt = wassima._embedded_ssl_context()
+    assert rebuilt is not ctx
+    assert wassima._embedded_ssl_context() is rebuilt
+    assert len(reads) == 1
+
+
+def test_progressive_shared_ssl_context_across_expiry(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    import threading
+
+    embed = fallback_der_certificates()
+    clock = {"mono": 1000.0}
+    os_certs = {"value": embed[:3]}
+    scan_may_finish = threading.Event()
+    scan_may_finish.set()
+
+    def os_certificates() -> list[bytes]:
+        scan_may_finish.wait(10)
+        return list(os_certs["value"])
+
+    monkeypatch.setattr("wassima._root_der_certificates", os_certificates)
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+    monkeypatch.setattr("wassima.time.monotonic", lambda: clock["mono"])
+    set_cache_ttl(1)
+    events: list[tuple[bool, str]] = []
+    wassima.add_trust_store_listener(lambda hybrid, fp: events.append((hybrid, fp)))
+
+    ctx = wassima.shared_ssl_context()
+    assert ctx.cert_store_stats()["x509_ca"] == 3
+
+    # Expired: the rescan goes on in the background, the current context is kept meanwhile.
+    clock["mono"] += 2
+    scan_may_finish.clear()
+    assert wassima.shared_ssl_context(progressive=True) is ctx
+    scan = wassima._PROGRESSIVE_SCANS[False]
+    assert scan.is_alive()
+    scan_may_finish.set()
+    scan.join(10)
+
+    # Nothing changed, nobody is told otherwise.
+    assert wassima.shared_ssl_context(progressive=True) is ctx
+    assert events == []
+
+    # Expired again, and a CA was added meanwhile: loaded into the very same context.
+    clock["mono"] += 2
+    os_certs["value"] = embed[:4]
+    assert wassima.shared_ssl_context(progressive=True) is ctx
+    wassima._PROGRESSIVE_SCANS[False].join(10)
+
+    assert ctx.cert_store_stats()["x509_ca"] == 4
+    assert events == [(False, wassima.trust_store_fingerprint())]
+
+
+def test_progressive_scan_failure_is_reported(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    def broken_os_certs() -> list[bytes]:
+        raise OSError("boom")
+
+    monkeypatch.setattr("wassima._root_der_certificates", broken_os_certs)
+
+    with pytest.warns(RuntimeWarning, match="boom"):
+        wassima.shared_ssl_context(progressive=True)
+        wassima._PROGRESSIVE_SCANS[False].join(10)
+
+
+def test_inject_loads_the_cached_snapshot(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    scans = []
+
+    def os_certs() -> list[bytes]:
+        scans.append(1)
+        return embed[:3]
+
+    monkeypatch.setattr("wassima._root_der_certificates", os_certs)
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+    original = ssl.SSLContext.load_default_certs
+
+    wassima.inject()
+    wassima.inject()  # Idempotent, never wraps itself.
+
+    contexts = [ssl.create_default_context() for _ in range(5)]
+
+    assert len(scans) == 1
+    for ctx in contexts:
+        assert sorted(ctx.get_ca_certs(binary_form=True)) == sorted(embed[:3])
+
+    # Injected contexts receive the CAs added later on.
+    register_ca(embed[100])
+    assert contexts[0].cert_store_stats()["x509_ca"] == 4
+
+    # Server side contexts are left alone.
+    server_ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    server_ctx.load_default_certs(ssl.Purpose.CLIENT_AUTH)
+    assert server_ctx not in wassima._ISSUED_SSL_CONTEXTS
+
+    wassima.extract()
+    wassima.extract()
+
+    assert ssl.SSLContext.load_default_certs is original
+    assert ssl.create_default_context() not in wassima._ISSUED_SSL_CONTEXTS
+
+
+def test_inject_hybrid_store(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: embed[:3])
+
+    wassima.inject(hybrid_store=True)
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    ctx.load_default_certs()
+
+    assert ctx.cert_store_stats()["x509_ca"] == len(root_der_certificates(hybrid_store=True))
+    assert wassima._ISSUED_SSL_CONTEXTS[ctx][0] is True
+
+
+def test_deferred_ssl_context_loads_on_first_use(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    import socket
+    import threading
+
+    embed = fallback_der_certificates()
+    scans = []
+
+    def os_certs() -> list[bytes]:
+        scans.append(1)
+        return embed[:3]
+
+    monkeypatch.setattr("wassima._root_der_certificates", os_certs)
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+
+    ctx = wassima.create_default_ssl_context(deferred=True)
+
+    # Configured at once, nothing scanned nor loaded.
+    assert ctx.verify_mode == ssl.CERT_REQUIRED
+    assert ctx.check_hostname
+    assert ctx.minimum_version == ssl.TLSVersion.TLSv1_2
+    assert scans == []
+    assert ctx not in wassima._ISSUED_SSL_CONTEXTS
+
+    barrier = threading.Barrier(8)
+
+    def handshake() -> None:
+        barrier.wait()
+        ctx.wrap_bio(ssl.MemoryBIO(), ssl.MemoryBIO(), server_hostname="example.com")
+
+    threads = [threading.Thread(target=handshake) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert scans == [1]
+    assert ctx.cert_store_stats()["x509_ca"] == 3
+    assert sorted(ctx.get_ca_certs(binary_form=True)) == sorted(embed[:3])
+
+    with socket.socket() as sock, ctx.wrap_socket(sock, server_hostname="example.com", do_handshake_on_connect=False):
+        pass
+
+    # Then it behaves like any other issued context.
+    register_ca(embed[100])
+    assert ctx.cert_store_stats()["x509_ca"] == 4
+
+
+def test_deferred_and_lazy_are_exclusive() -> None:
+    with pytest.raises(ValueError, match="mutually exclusive"):
+        wassima.create_default_ssl_context(lazy=True, deferred=True)
+
+
+def test_register_cas_sources(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    pem_bundle = "# Corporate bundle\r\n" + "\r\n".join(
+        ssl.DER_cert_to_PEM_cert(der).replace("\n", "\r\n") for der in embed[:3]
+    )
+
+    assert wassima.register_cas(pem_bundle) == 3
+    assert wassima.register_cas(pem_bundle.encode(), b"".join(embed[2:5])) == 2
+    assert wassima.register_cas(embed[4:6]) == 1
+
+    (tmp_path / "bundle.pem").write_text(ssl.DER_cert_to_PEM_cert(embed[6]) + ssl.DER_cert_to_PEM_cert(embed[7]))
+    (tmp_path / "root.der").write_bytes(embed[8])
+    (tmp_path / "README").write_text("Nothing to see here.")
+    # Framed like a DER certificate, e.g. a private key: OpenSSL cannot load it.
+    (tmp_path / "key.der").write_bytes(wassima._der._encode_tlv(0x30, wassima._der._encode_tlv(0x02, b"\x00")))
+    (tmp_path / "nested").mkdir()
+
+    assert wassima.register_cas(tmp_path / "root.der") == 1
+    assert wassima.register_cas(str(tmp_path)) == 2
+
+    # Named explicitly: not skipped.
+    with pytest.raises(ValueError):
+        wassima.register_cas(tmp_path / "key.der")
+
+    assert wassima._MANUALLY_REGISTERED_CA == embed[:6] + [embed[8], embed[6], embed[7]]
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "-----BEGIN CERTIFICATE-----\n!!!!\n-----END CERTIFICATE-----\n",
+        "-----BEGIN CERTIFICATE-----\nMAMCA\n-----END CERTIFICATE-----\n",
+        b"-----BEGIN CERTIFICATE-----\nMAMCAQ==\nMAMCAQ==\n-----END CERTIFICATE-----\n",
+        b"\x02\x01\x00",
+        b"\x30\x05\x00",
+        "",
+        "not a pem nor a path",
+    ],
+)
+def test_register_cas_rejects_invalid_sources(source: bytes | str) -> None:
+    with pytest.raises(ValueError):
+        wassima.register_cas(fallback_der_certificates()[0], source)
+
+    assert wassima._MANUALLY_REGISTERED_CA == []
+
+
+def test_register_cas_updates_cached_snapshots_without_rescan(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    scans = []
+
+    def os_certs() -> list[bytes]:
+        scans.append(1)
+        return embed[:3]
+
+    monkeypatch.setattr("wassima._root_der_certificates", os_certs)
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+
+    root_pem_certificates()
+    hybrid = root_der_certificates(hybrid_store=True)
+    ctx = wassima.create_default_ssl_context()
+    assert len(scans) == 2
+
+    # One already part of the OS trust store, both already part of the CCADB bundle.
+    assert wassima.register_cas([embed[0], embed[100]]) == 2
+
+    assert len(scans) == 2
+    assert root_der_certificates() == sorted(embed[:3] + [embed[100]])
+    assert root_pem_certificates() == [ssl.DER_cert_to_PEM_cert(der) for der in root_der_certificates()]
+    assert root_der_certificates(hybrid_store=True) is hybrid
+    assert ctx.cert_store_stats()["x509_ca"] == 4
+
+    # Nothing new: nothing moves.
+    der_certificates = root_der_certificates()
+    assert wassima.register_cas([embed[100]]) == 0
+    assert root_der_certificates() is der_certificates
+
+    # Same outcome as a rescan.
+    root_der_certificates.cache_clear()
+    root_pem_certificates.cache_clear()
+    assert root_der_certificates() == der_certificates
+    assert len(scans) == 3
+
+
+def test_register_cas_keeps_pem_consistent_with_der(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: embed[:3])
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+
+    root_pem_certificates()
+    root_der_certificates.cache_clear()
+
+    # Only PEM is cached: it cannot be updated alone.
+    wassima.register_cas([embed[100]])
+    assert root_pem_certificates.cache_peek((False,)) is None
+
+    # PEM derived from the merged DER already.
+    root_pem_certificates.cache_clear()
+    wassima.register_cas([embed[101]])
+    assert root_pem_certificates.cache_peek((False,)) is None
+    root_pem_certificates()
+    root_der_certificates.cache_transform(lambda key, value: value[:-1])
+    wassima.register_cas([embed[102]])
+    assert root_pem_certificates.cache_peek((False,)) is None
+
+
+def test_register_cas_with_validity_filter_rescans(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    scans = []
+
+    def os_certs() -> list[bytes]:
+        scans.append(1)
+        return embed[:3]
+
+    monkeypatch.setattr("wassima._root_der_certificates", os_certs)
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+    wassima.set_validity_filter(True)
+
+    root_der_certificates()
+    wassima.register_cas([embed[100]])
+    root_der_certificates()
+
+    assert len(scans) == 2
+
+
+def test_trust_overlay(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: embed[:3])
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+    monkeypatch.setattr(wassima, "_SUBSET_SSL_CONTEXTS", {})
+
+    base = root_der_certificates()
+    der_generation = root_der_certificates.cache_generation()
+
+    overlay = wassima.TrustOverlay(ssl.DER_cert_to_PEM_cert(embed[100]), [embed[0], embed[100]])
+    assert overlay.extra_certificates == (embed[100], embed[0])
+    assert "+2 CA(s)" in repr(overlay)
+
+    assert overlay.der_certificates() == sorted(embed[:3] + [embed[100]])
+    assert overlay.pem_certificates() == [ssl.DER_cert_to_PEM_cert(der) for der in overlay.der_certificates()]
+    assert overlay.fingerprint() == wassima._fingerprint(overlay.der_certificates())
+
+    ctx = overlay.ssl_context()
+    assert ctx.cert_store_stats()["x509_ca"] == 4
+    # Shared between overlays trusting the same CAs.
+    assert wassima.TrustOverlay([embed[100]]).ssl_context() is ctx
+
+    # The global trust store is left alone.
+    assert root_der_certificates() is base
+    assert root_der_certificates.cache_generation() == der_generation
+    assert wassima._MANUALLY_REGISTERED_CA == []
+
+    # Follows the trust store.
+    register_ca(embed[101])
+    assert embed[101] in overlay.der_certificates()
+    assert overlay.ssl_context() is not ctx
+
+
+def test_trust_overlay_without_anything_new(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: embed[:3])
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+
+    overlay = wassima.TrustOverlay(embed[:2])
+
+    assert overlay.der_certificates() == root_der_certificates()
+    assert overlay.fingerprint() == wassima.trust_store_fingerprint()
+    assert overlay.ssl_context() is wassima.shared_ssl_context()
+
+
+def test_trust_overlay_validity_filter(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: embed[:3])
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+    wassima.set_validity_filter(True)
+
+    not_after = wassima.Certificate(embed[100]).not_after.timestamp()
+    monkeypatch.setattr("wassima.time.time", lambda: not_after + 1)
+
+    assert embed[100] not in wassima.TrustOverlay([embed[100]]).der_certificates()
+
+
+def test_trust_store_instances_are_independent(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    scans = []
+
+    def os_certs() -> list[bytes]:
+        scans.append(1)
+        return embed[:3]
+
+    monkeypatch.setattr("wassima._root_der_certificates", os_certs)
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+
+    # Its own scan, by default.
+    own = wassima.TrustStore()
+    # Sharing the process-wide scan, and its cache, is explicit.
+    shared = wassima.TrustStore(root_der_certificates)
+    tenant = wassima.TrustStore(lambda: embed[10:12], lambda: embed[11:13], cache_ttl=0)
+
+    assert own.der_certificates() == sorted(embed[:3])
+    assert len(scans) == 1
+    assert shared.der_certificates() == root_der_certificates()
+    assert len(scans) == 2
+    assert tenant.der_certificates() == sorted(embed[10:13])
+    assert "3 source(s)" not in repr(tenant) and "2 source(s)" in repr(tenant)
+    assert wassima.TrustStore(hybrid_store=True).der_certificates() == root_der_certificates(hybrid_store=True)
+
+    der_generation = root_der_certificates.cache_generation()
+
+    assert tenant.register_cas([embed[100], embed[10]]) == 2
+    tenant.register_ca(ssl.DER_cert_to_PEM_cert(embed[100]))
+    own.register_ca(embed[101])
+
+    assert tenant.der_certificates() == sorted(embed[10:13] + [embed[100]])
+    assert own.der_certificates() == sorted(embed[:3] + [embed[101]])
+    # Nobody else is affected.
+    assert root_der_certificates() == sorted(embed[:3])
+    assert root_der_certificates.cache_generation() == der_generation
+    assert wassima._MANUALLY_REGISTERED_CA == []
+
+    # Nor the other way around.
+    register_ca(embed[102])
+    assert own.refresh() is False
+    assert own.der_certificates() == sorted(embed[:3] + [embed[101]])
+
+    assert own.pem_certificates() == [ssl.DER_cert_to_PEM_cert(der) for der in own.der_certificates()]
+    assert own.pem_certificates() is own.pem_certificates()
+    assert own.generate_ca_bundle() == "\n\n".join(own.pem_certificates())
+    assert own.fingerprint() == wassima._fingerprint(own.der_certificates())
+
+
+def test_trust_store_sees_os_changes_on_its_own_lifecycle(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    os_certs = {"value": embed[:3]}
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: list(os_certs["value"]))
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+
+    assert root_der_certificates() == sorted(embed[:3])
+    store = wassima.TrustStore(cache_ttl=0)
+    assert store.der_certificates() == sorted(embed[:3])
+
+    # The process-wide cache is still warm, this instance does not depend on it.
+    os_certs["value"] = embed[:4]
+    assert store.refresh() is True
+    assert store.der_certificates() == sorted(embed[:4])
+    assert root_der_certificates() == sorted(embed[:3])
+
+
+def test_trust_store_cache_lifecycle(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    source = [embed[:3]]
+    loads = []
+    clock = {"now": 1000.0}
+
+    def load() -> list[bytes]:
+        loads.append(1)
+        return source[0]
+
+    monkeypatch.setattr("wassima.time.monotonic", lambda: clock["now"])
+
+    store = wassima.TrustStore(load, cache_ttl=60)
+    before = store.der_certificates()
+    store.register_ca(embed[0])  # Already there: nothing moves.
+    assert store.der_certificates() is before
+
+    source[0] = embed[:4]
+    clock["now"] += 30
+    assert store.der_certificates() is before
+    clock["now"] += 31
+    assert store.der_certificates() == sorted(embed[:4])
+    assert len(loads) == 2
+
+    assert store.refresh() is False
+    source[0] = embed[:5]
+    assert store.refresh() is True
+    assert len(loads) == 4
+
+    store.cache_clear()
+    store.der_certificates()
+    assert len(loads) == 5
+
+    store.set_cache_ttl(0)
+    store.der_certificates()
+    store.der_certificates()
+    assert len(loads) == 7
+
+    with pytest.raises(TypeError):
+        store.set_cache_ttl(True)
+    with pytest.raises(ValueError):
+        wassima.TrustStore(load, cache_ttl=-1)
+
+    # Dropped, yet unchanged.
+    store.cache_clear()
+    assert store.refresh() is False
+    assert wassima.TrustStore(load).refresh() is True
+
+
+def test_trust_store_ssl_contexts() -> None:
+    embed = fallback_der_certificates()
+    store = wassima.TrustStore(lambda: embed[:3])
+
+    ctx = store.create_default_ssl_context()
+    assert ctx.cert_store_stats()["x509_ca"] == 3
+    assert ctx.verify_mode == ssl.CERT_REQUIRED
+    assert store.create_default_ssl_context() is not ctx
+
+    shared = store.shared_ssl_context()
+    assert shared is store.shared_ssl_context()
+    assert shared is not wassima.TrustStore(lambda: embed[:3]).shared_ssl_context()
+
+    store.register_ca(embed[100])
+    assert store.shared_ssl_context() is not shared
+    assert store.shared_ssl_context().cert_store_stats()["x509_ca"] == 4
+
+
+def test_trust_store_loads_once_under_contention() -> None:
+    import threading
+
+    embed = fallback_der_certificates()
+    loads = []
+
+    def slow_source() -> list[bytes]:
+        loads.append(1)
+        time.sleep(0.1)
+        return embed[:3]
+
+    store = wassima.TrustStore(slow_source)
+    threads = [threading.Thread(target=store.der_certificates) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loads == [1]
+
+
+def _reissued_root(common_name: bytes, key: bytes, not_before: str, not_after: str, serial: int = 1) -> bytes:
+    encode = wassima._der._encode_tlv
+    return fake_certificate(
+        subject=fake_name((0x0C, common_name)),
+        validity=encode(0x30, encode(0x18, not_before.encode()) + encode(0x18, not_after.encode())),
+        algorithm=b"\x06\x03\x2b\x65\x70",
+        public_key=key,
+        serial=serial,
+    )
+
+
+def test_collapse_reissued_roots(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr("wassima.time.time", lambda: 1893456000.0)  # 2030-01-01
+
+    expired = _reissued_root(b"Root", b"k1", "20000101000000Z", "20200101000000Z", 1)
+    valid = _reissued_root(b"Root", b"k1", "20100101000000Z", "20350101000000Z", 2)
+    longest = _reissued_root(b"Root", b"k1", "20200101000000Z", "20450101000000Z", 3)
+    not_yet_valid = _reissued_root(b"Root", b"k1", "20400101000000Z", "20600101000000Z", 4)
+    other_key = _reissued_root(b"Root", b"k2", "20000101000000Z", "20200101000000Z", 5)
+    unreadable = wassima._der._encode_tlv(0x30, b"")
+
+    collapse = wassima._collapse_reissued_roots
+
+    assert collapse([expired, valid, longest, not_yet_valid, other_key, unreadable, unreadable]) == [
+        longest,
+        other_key,
+        unreadable,
+    ]
+    assert collapse([longest, valid]) == collapse([valid, longest]) == [longest]
+    # Nothing valid now: the latest expiry wins.
+    assert collapse([expired, not_yet_valid]) == [not_yet_valid]
+
+
+def test_reissued_roots_collapse_setting(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr("wassima.time.time", lambda: 1893456000.0)  # 2030-01-01
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+
+    valid = _reissued_root(b"Root", b"k1", "20100101000000Z", "20350101000000Z", 2)
+    longest = _reissued_root(b"Root", b"k1", "20200101000000Z", "20450101000000Z", 3)
+    reissued_again = _reissued_root(b"Root", b"k1", "20250101000000Z", "20550101000000Z", 6)
+    other = _reissued_root(b"Other", b"k1", "20100101000000Z", "20350101000000Z", 7)
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: [valid, longest, other])
+
+    assert len(root_der_certificates()) == 3
+
+    wassima.set_reissued_roots_collapse(True)
+    assert root_der_certificates() == sorted([longest, other])
+    root_der_certificates.cache_clear()
+    assert list(wassima.iter_der_certificates()) == sorted([longest, other])
+
+    # Registered CAs compete with the other variants. OpenSSL would refuse these stripped down ones.
+    monkeypatch.setattr("wassima._ensure_loadable", lambda certificates: None)
+    wassima.register_cas([reissued_again])
+    assert root_der_certificates() == sorted([reissued_again, other])
+
+    wassima.set_reissued_roots_collapse(False)
+    assert len(root_der_certificates()) == 4
+
+    with pytest.raises(TypeError):
+        wassima.set_reissued_roots_collapse("yes")  # type: ignore[arg-type]
+
+
+def test_warm_up(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    embed = fallback_der_certificates()
+    monkeypatch.setattr("wassima._root_der_certificates", lambda: embed[:3])
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+
+    timings = wassima.warm_up(contexts=False)
+
+    assert list(timings) == ["trust_store", "pem_certificates", "total"]
+    assert all(seconds >= 0 for seconds in timings.values())
+    assert root_der_certificates.cache_peek((False,)) == sorted(embed[:3])
+    assert root_pem_certificates.cache_peek((False,)) is not None
+    assert False not in wassima._SHARED_SSL_CONTEXTS
+
+    wassima.inject(hybrid_store=True)
+    timings = wassima.warm_up()
+
+    assert list(timings) == ["trust_store", "pem_certificates", "ssl_context", "injected_cadata", "total"]
+    assert timings["total"] == pytest.approx(sum(seconds for stage, seconds in timings.items() if stage != "total"))
+    assert wassima._SHARED_SSL_CONTEXTS[False][0] is root_der_certificates()
+    assert wassima._SNAPSHOT_CADATA[True][0] is root_der_certificates(True)
+
+
+def test_warm_up_in_background(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    import asyncio
+    import threading
+
+    embed = fallback_der_certificates()
+    release = threading.Event()
+
+    def slow_scan() -> list[bytes]:
+        release.wait(10)
+        return embed[:3]
+
+    monkeypatch.setattr("wassima._root_der_certificates", slow_scan)
+    monkeypatch.setattr("wassima._os._linux.is_trust_store_stale", lambda: False)
+
+    handle = wassima.warm_up(background=True)
+
+    assert not handle.done()
+
+    release.set()
+    timings = handle.join(10)
+
+    assert handle.done()
+    assert list(timings) == ["trust_store", "pem_certificates", "ssl_context", "total"]
+    assert wassima._SHARED_SSL_CONTEXTS[False][0] is root_der_certificates()
+
+    async def wait_for_trust() -> dict[str, float]:
+        return await wassima.warm_up(True, background=True)
+
+    assert "ssl_context" in asyncio.run(wait_for_trust())
+    assert True in wassima._SHARED_SSL_CONTEXTS
+
+
+def test_warm_up_in_background_failure(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    def broken_scan() -> list[bytes]:
+        raise PermissionError("trust store unreadable")
+
+    monkeypatch.setattr("wassima._root_der_certificates", broken_scan)
+
+    handle = wassima.warm_up(background=True)
+
+    with pytest.raises(PermissionError, match="unreadable"):
+        handle.join(10)
+
+    assert handle.done()